@@ -3,17 +3,31 @@ Gradio OCRアプリケーション
 画像からテキストを抽出し、バウンディングボックス付きで結果を表示するWebインターフェース
 """
 
+from typing import Iterator
+
 import gradio as gr
 from PIL import Image
 import pandas as pd
 import pytesseract
 
-from config import LANGUAGES, PSM_MODES
-from image_preprocessor import preprocess_image
-from ocr_engine import process_image_with_ocr
+from config import (
+    LANGUAGES, PSM_MODES, AUTO_LANGUAGE, AUTO_LANGUAGE_DEFAULT, SCRIPT_LANGUAGES, TESSDATA_TIER_CHOICES,
+    OMP_THREAD_MODE
+)
+from image_preprocessor import is_blank_page, preprocess_image
+from ocr_backend import resolve_tessdata_dir
+from ocr_capabilities import get_available_languages
+from ocr_engine import calibrate_thread_mode, draw_bounding_boxes, process_image_with_ocr, stream_ocr
+from ocr_parallel import OCR_DATA_COLUMNS
+from ocr_result import OCRResult
 from utils import create_results_dataframe, format_confidence
 
 
+# 白紙ページとしてOCRを省略した場合の表示
+BLANK_PAGE_MESSAGE = "（白紙ページのためOCRを省略しました）"
+BLANK_PAGE_INFO = "**スキップ:** 白紙ページ"
+
+
 def ocr_interface(
     image: Image.Image,
     language: str,
@@ -21,11 +35,18 @@ def ocr_interface(
     apply_grayscale: bool,
     apply_contrast: bool,
     apply_sharpness: bool,
-    apply_denoise: bool
-) -> tuple:
+    apply_denoise: bool,
+    stream_results: bool = False,
+    tier: str = "標準（standard）",
+    refine_words: bool = False,
+    skip_blank: bool = False,
+    text_regions: bool = False
+) -> Iterator[tuple]:
     """
     OCR処理のメイン関数（Gradioインターフェース用）
     
+    途中経過を表示できるようジェネレーターとして結果を返します。
+    
     Args:
         image: 入力画像
         language: 選択された言語（日本語表記）
@@ -34,21 +55,32 @@ def ocr_interface(
         apply_contrast: コントラスト調整を適用するか
         apply_sharpness: シャープネス調整を適用するか
         apply_denoise: ノイズ除去を適用するか
+        stream_results: 認識できた行から順にテキストを表示するか
+        tier: 選択された学習データの種類（説明付き）
+        refine_words: 信頼度の低い単語を再認識するか（逐次表示では使用しません）
+        skip_blank: 白紙ページのOCRを省略するか
+        text_regions: 文字領域を検出し、その範囲だけをOCRするか（逐次表示では使用しません）
     
-    Returns:
+    Yields:
         (バウンディングボックス付き画像, 抽出テキスト, 信頼度情報, 詳細データテーブル)
     """
     if image is None:
-        return None, "画像をアップロードしてください。", "", None
+        yield None, "画像をアップロードしてください。", "", None
+        return
     
     try:
         # 言語コードとPSMモードを取得
         lang_code = LANGUAGES[language]
         psm_code = PSM_MODES[psm_mode]
+        tier_code = TESSDATA_TIER_CHOICES[tier]
         
-        # 言語データの確認
-        available_langs = pytesseract.get_languages()
-        required_langs = lang_code.split('+')
+        # 言語データの確認（選択した学習データのディレクトリ。既定のディレクトリは起動時に取得した情報を再利用）
+        available_langs = get_available_languages(resolve_tessdata_dir(tier_code))
+        if lang_code == AUTO_LANGUAGE:
+            # 振り分け先となる全ての言語が必要
+            required_langs = sorted(set(SCRIPT_LANGUAGES.values()) | {AUTO_LANGUAGE_DEFAULT})
+        else:
+            required_langs = lang_code.split('+')
         missing_langs = [lang for lang in required_langs if lang not in available_langs]
         
         if missing_langs:
@@ -70,7 +102,8 @@ sudo apt-get install tesseract-ocr-{missing_langs[0]}
 
 英語（eng）であれば通常デフォルトでインストールされています。
 """
-            return None, error_msg, "", None
+            yield None, error_msg, "", None
+            return
         
         # 画像の前処理
         processed_image = preprocess_image(
@@ -81,29 +114,77 @@ sudo apt-get install tesseract-ocr-{missing_langs[0]}
             apply_denoise=apply_denoise
         )
         
-        # OCR処理を実行
-        bbox_image, extracted_text, ocr_data, avg_confidence = process_image_with_ocr(
+        if stream_results:
+            # 白紙ページはOCRを行わない
+            if skip_blank and is_blank_page(processed_image):
+                yield processed_image, BLANK_PAGE_MESSAGE, BLANK_PAGE_INFO, None
+                return
+            yield from _stream_interface(processed_image, lang_code, psm_code, tier_code)
+            return
+        
+        # OCR処理を実行（白紙ページはOCRを行わない）
+        bbox_image, extracted_text, ocr_data, avg_confidence, status = process_image_with_ocr(
             processed_image,
             lang=lang_code,
             psm_mode=psm_code,
-            show_confidence=True
+            show_confidence=True,
+            tier=tier_code,
+            refine=refine_words,
+            text_regions=text_regions,
+            skip_blank=skip_blank,
+            return_status=True,
+            cache_params={
+                'grayscale': apply_grayscale,
+                'contrast': apply_contrast,
+                'sharpness': apply_sharpness,
+                'denoise': apply_denoise,
+            }
         )
         
+        if status['skipped']:
+            yield processed_image, BLANK_PAGE_MESSAGE, BLANK_PAGE_INFO, None
+            return
+        
         # テキストが抽出されなかった場合
         if not extracted_text:
             extracted_text = "（テキストが検出されませんでした）"
         
         # 信頼度情報を整形
-        confidence_info = f"**平均信頼度:** {format_confidence(avg_confidence)}"
+        confidence_info = f"**平均信頼度:** {format_confidence(avg_confidence)}　**モデル:** {status['tier']}"
         
         # 詳細データのDataFrameを作成
         details_df = create_results_dataframe(ocr_data)
         
-        return bbox_image, extracted_text, confidence_info, details_df
-        
+        yield bbox_image, extracted_text, confidence_info, details_df
+    
     except Exception as e:
         error_msg = f"エラーが発生しました: {str(e)}"
-        return None, error_msg, "", None
+        yield None, error_msg, "", None
+
+
+def _stream_interface(image: Image.Image, lang_code: str, psm_code: str, tier_code: str) -> Iterator[tuple]:
+    """
+    行単位でOCRを行い、認識できた行から順にテキストを表示します。
+    
+    全ての行の認識が終わった時点でバウンディングボックスと詳細データを表示します。
+    """
+    texts = []
+    chunks = []
+    for chunk in stream_ocr(image, lang=lang_code, psm_mode=psm_code, line_parallel=True, tier=tier_code):
+        texts.append(chunk['text'])
+        chunks.append(chunk['ocr_data'])
+        yield None, '\n'.join(texts), "**処理中...**", None
+    
+    # 部分ごとの単語をまとめて描画・集計
+    ocr_data = {
+        column: [value for chunk in chunks for value in chunk[column]]
+        for column in OCR_DATA_COLUMNS
+    }
+    result = OCRResult.from_dict(ocr_data)
+    bbox_image = draw_bounding_boxes(image, result)
+    extracted_text = '\n'.join(texts) or "（テキストが検出されませんでした）"
+    confidence_info = f"**平均信頼度:** {format_confidence(result.average_confidence())}　**モデル:** {tier_code}"
+    yield bbox_image, extracted_text, confidence_info, create_results_dataframe(result)
 
 
 def create_gradio_interface():
@@ -152,6 +233,13 @@ def create_gradio_interface():
                     info="ページセグメンテーションモードを選択してください"
                 )
                 
+                tier_dropdown = gr.Dropdown(
+                    choices=list(TESSDATA_TIER_CHOICES.keys()),
+                    value="標準（standard）",
+                    label="認識モデル",
+                    info="高速モデルは精度が下がり、高精度モデルは処理に時間がかかります"
+                )
+                
                 gr.Markdown("### ⚙️ 画像前処理オプション")
                 
                 grayscale_checkbox = gr.Checkbox(
@@ -178,6 +266,30 @@ def create_gradio_interface():
                     info="画像のノイズを除去します（処理に時間がかかります）"
                 )
                 
+                refine_checkbox = gr.Checkbox(
+                    label="低信頼度の単語を再認識",
+                    value=False,
+                    info="信頼度の低い単語だけを別の前処理で読み直します"
+                )
+                
+                regions_checkbox = gr.Checkbox(
+                    label="文字領域のみ認識",
+                    value=False,
+                    info="写真などで文字のある範囲だけを切り出してOCRします"
+                )
+                
+                skip_blank_checkbox = gr.Checkbox(
+                    label="白紙ページをスキップ",
+                    value=False,
+                    info="白紙・区切り用紙と判定したページはOCRを行いません"
+                )
+                
+                stream_checkbox = gr.Checkbox(
+                    label="逐次表示",
+                    value=False,
+                    info="認識できた行から順にテキストを表示します"
+                )
+                
                 process_btn = gr.Button(
                     "🚀 OCR処理を実行",
                     variant="primary",
@@ -237,7 +349,12 @@ def create_gradio_interface():
                 grayscale_checkbox,
                 contrast_checkbox,
                 sharpness_checkbox,
-                denoise_checkbox
+                denoise_checkbox,
+                stream_checkbox,
+                tier_dropdown,
+                refine_checkbox,
+                skip_blank_checkbox,
+                regions_checkbox
             ],
             outputs=[
                 bbox_image_output,
@@ -261,6 +378,14 @@ def create_gradio_interface():
 
 
 if __name__ == "__main__":
+    # Tesseractの機能情報を起動時に取得しておく
+    try:
+        get_available_languages()
+        if OMP_THREAD_MODE == "auto":
+            # 同時実行時のスレッド配分を計測して選択
+            calibrate_thread_mode()
+    except pytesseract.TesseractNotFoundError as e:
+        print(f"警告: {e}")
     demo = create_gradio_interface()
     demo.launch(
         server_name="0.0.0.0",
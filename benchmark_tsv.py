@@ -0,0 +1,64 @@
+"""
+TSV解析のベンチマーク
+pytesseractのOutput.DICT形式への変換と、ocr_result.parse_tsvによる一括変換の速度を比較します。
+"""
+
+import random
+import timeit
+
+import pytesseract
+
+from ocr_backend import TSV_HEADER
+from ocr_result import parse_tsv
+
+
+def generate_tsv(word_count: int, seed: int = 0) -> str:
+    """
+    新聞紙面程度の密度を想定した合成TSVを生成します。
+    
+    Args:
+        word_count: 単語数
+        seed: 乱数のシード
+    
+    Returns:
+        TSV文字列（ヘッダー付き）
+    """
+    rng = random.Random(seed)
+    rows = [TSV_HEADER, "1\t1\t0\t0\t0\t0\t0\t0\t5000\t7000\t-1\t"]
+    words_per_line = 12
+    for index in range(word_count):
+        line_num, word_num = divmod(index, words_per_line)
+        if word_num == 0:
+            rows.append(f"4\t1\t1\t1\t{line_num + 1}\t0\t100\t{40 * line_num}\t4800\t32\t-1\t")
+        word = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(2, 10)))
+        rows.append(
+            f"5\t1\t1\t1\t{line_num + 1}\t{word_num + 1}\t{100 + 400 * word_num}\t{40 * line_num}\t"
+            f"{rng.randint(30, 380)}\t32\t{rng.uniform(30, 97):.6f}\t{word}"
+        )
+    return '\n'.join(rows)
+
+
+def main():
+    """ベンチマークを実行します。"""
+    print("=" * 60)
+    print("TSV Parse Benchmark")
+    print("=" * 60)
+    
+    for word_count in (500, 5000, 20000):
+        tsv = generate_tsv(word_count)
+        assert parse_tsv(tsv).to_dict() == pytesseract.pytesseract.file_to_dict(tsv, '\t', -1)
+        
+        repeat = max(1, 50000 // word_count)
+        dict_time = min(timeit.repeat(
+            lambda: pytesseract.pytesseract.file_to_dict(tsv, '\t', -1), number=repeat, repeat=3
+        )) / repeat
+        array_time = min(timeit.repeat(lambda: parse_tsv(tsv), number=repeat, repeat=3)) / repeat
+        
+        print(f"{word_count:>6} words: "
+              f"Output.DICT {dict_time * 1000:8.2f} ms, "
+              f"parse_tsv {array_time * 1000:8.2f} ms "
+              f"({dict_time / array_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,28 @@
 OCRエンジンの言語、PSMモード、その他の設定を定義します。
 """
 
+import os
+
 # 利用可能な言語
 LANGUAGES = {
     "日本語": "jpn",
     "英語": "eng",
     "英語+日本語": "eng+jpn",
+    "自動（英語/日本語を判定）": "auto",
+}
+
+# 文字種に応じて言語を振り分ける設定
+AUTO_LANGUAGE = "auto"  # 自動判定を表す言語コード
+AUTO_LANGUAGE_DEFAULT = "eng"  # 文字種を判定できない場合の言語
+SCRIPT_LANGUAGES = {  # OSDの文字種 -> 言語コード
+    "Latin": "eng",
+    "Japanese": "jpn",
+    "Han": "jpn",
+    "Hiragana": "jpn",
+    "Katakana": "jpn",
 }
+AUTO_LANGUAGE_BLOCK_PSM_MODE = "6"  # ブロック画像の認識に使用するPSMモード
+AUTO_LANGUAGE_MIN_OSD_LINES = 2  # ブロック単位で文字種を判定する最小行数（未満はページの判定結果を使用）
 
 # PSMモード（Page Segmentation Mode）
 PSM_MODES = {
@@ -24,6 +40,101 @@ DEFAULT_LANGUAGE = "eng"  # English is typically pre-installed
 DEFAULT_PSM_MODE = "3"
 DEFAULT_OEM_MODE = "3"  # OCR Engine Mode (3 = Default, based on what is available)
 
+# 学習データ（tessdata）の種類ごとのディレクトリ（None = tesseractの既定のディレクトリ）
+TESSDATA_TIERS = {
+    "fast": os.environ.get("TESSDATA_FAST_DIR", "/usr/share/tesseract-ocr/tessdata_fast"),  # 高速・低精度
+    "standard": None,  # 標準（インストール済みの学習データ）
+    "best": os.environ.get("TESSDATA_BEST_DIR", "/usr/share/tesseract-ocr/tessdata_best"),  # 低速・高精度
+}
+DEFAULT_TESSDATA_TIER = "standard"
+
+# 画面に表示する学習データの種類
+TESSDATA_TIER_CHOICES = {
+    "高速（fast）": "fast",
+    "標準（standard）": "standard",
+    "高精度（best）": "best",
+}
+
+# OCRバックエンド（"subprocess" = tesseractコマンドを起動, "libtesseract" = C APIを常駐利用）
+DEFAULT_OCR_BACKEND = "subprocess"
+
+# バッチOCRで1回のtesseract実行にまとめる画像数
+OCR_BATCH_SIZE = 100
+
+# タイル分割による並列OCRの設定
+TILE_SIZE = 2000  # タイルの一辺の長さ（ピクセル）
+TILE_OVERLAP = 200  # 隣接タイルとの重なり幅（最大の文字サイズより大きくする）
+PARALLEL_OCR_WORKERS = None  # 並列OCRのプロセス数（None = CPUコア数）
+
+# 行単位の並列OCRの設定
+LINE_PSM_MODE = "7"  # 行画像の認識に使用するPSMモード（単一のテキスト行）
+LINE_CROP_PADDING = 4  # 行画像を切り出す際の余白（ピクセル）
+LINE_STREAM_CHUNK_SIZE = 4  # 逐次出力時に1タスクにまとめる行数（小さいほど最初の行が早く返る）
+LINE_STREAM_FALLBACK_TILE_SIZE = 1000  # レイアウト解析ができない場合に逐次出力に使うタイルの一辺（ピクセル）
+
+# ワーカープール設定
+WORKER_POOL_SIZE = 2  # 言語ごとのワーカープロセス数
+WORKER_MAX_TASKS = 500  # ワーカーを再起動するまでに処理するタスク数
+WORKER_BACKEND = "libtesseract"  # ワーカー内で使用するバックエンド（利用できない場合はsubprocess）
+
+# 非同期APIの設定
+ASYNC_MAX_PROCESSES = None  # 同時に起動するtesseractプロセス数の上限（None = スレッド配分のモードから決定）
+ASYNC_CPU_WORKERS = 2  # 画像のエンコードや結果の解析などをイベントループの外で実行するスレッド数
+
+# OpenMPスレッド数の配分設定（TesseractのLSTMはプロセスごとにスレッドを起動するため、合計がCPUコア数を超えないよう配分）
+OCR_CPU_BUDGET = None  # OCRに使用するCPUコア数（None = このプロセスが使用できるコア数）
+OMP_THREAD_MODE = "auto"  # "single" = 単一スレッドのプロセスを多数, "multi" = 複数スレッドのプロセスを少数, "auto" = 計測して選択
+OMP_MULTI_THREADS = 4  # "multi"での1プロセスあたりのスレッド数
+
+# 解像度の正規化の設定
+TARGET_TEXT_HEIGHT = 32  # 文字（連結成分）の高さの中央値の目標値（ピクセル）。Tesseractの認識精度・速度が良い範囲
+TEXT_HEIGHT_TOLERANCE = 1.25  # 目標値との比がこの範囲内なら拡縮しない
+RESOLUTION_SCALE_LIMITS = (0.25, 4.0)  # 拡縮率の下限・上限
+TEXT_HEIGHT_ESTIMATE_SIZE = 1024  # 文字の高さを推定する縮小画像の長辺（ピクセル）
+
+# 文字領域の検出（前処理として画像を文字のある範囲に切り詰める）の設定
+REGION_DETECT_SIZE = 1024  # 検出に使用する縮小画像の長辺（ピクセル）
+REGION_CLOSE_KERNEL = (9, 3)  # 文字をつなげて行にまとめるクロージングのカーネルの最小値（幅, 高さ。元画像のピクセル）
+REGION_CLOSE_SCALE = (1.0, 0.33)  # 文字の高さ（中央値）に対するクロージングのカーネルの大きさ（幅, 高さ）
+REGION_MIN_SIZE = (8, 4)  # 文字領域とみなす最小の大きさ（幅, 高さ。縮小画像上）
+REGION_MIN_FILL = 0.4  # 外接矩形に占める前景（クロージング後）の割合の下限
+REGION_PADDING = 8  # 文字領域の余白（元画像のピクセル）
+REGION_MAX_AREA_RATIO = 0.8  # 文字領域の合計がページに対してこの割合以上なら切り詰めない
+REGION_MAX_COUNT = 50  # 領域ごとに認識する場合の領域数の上限（超える場合は全領域の外接矩形で認識）
+
+# 白紙ページの判定設定（Tesseractを実行せずに空の結果を返す）
+BLANK_PAGE_IMAGE_SIZE = 512  # 判定に使用する縮小画像の長辺（ピクセル）
+BLANK_PAGE_INK_CONTRAST = 60  # 背景（画素値の中央値）よりこの値以上暗い画素をインクとみなす
+BLANK_PAGE_MAX_INK_RATIO = 0.0002  # インクの画素の割合の上限
+BLANK_PAGE_MAX_EDGE_DENSITY = 0.0005  # エッジ（Canny）の画素の割合の上限
+BLANK_PAGE_MIN_STD = 1.0  # 画素値の標準偏差がこれ未満なら均一な（白紙の）ページ
+
+# 向き検出（OSD）の設定
+OSD_IMAGE_SIZE = 1600  # 向きの検出に使用する縮小画像の長辺（ピクセル）
+OSD_MIN_CONFIDENCE = 2.0  # 回転を適用する向きの信頼度の下限
+OSD_CACHE_SIZE = 1000  # 向きを保持する文書数
+
+# OCR結果キャッシュの設定
+OCR_CACHE_MAX_BYTES = 256 * 1024 * 1024  # メモリキャッシュの上限サイズ（バイト）
+OCR_STORE_PATH = None  # 永続ストア（SQLite）のパス（None = 永続化しない）
+OCR_STORE_MAX_BYTES = 2 * 1024 * 1024 * 1024  # 永続ストアの上限サイズ（バイト）
+NEAR_DUPLICATE_MAX_DISTANCE = 12  # 近似重複の候補とする知覚ハッシュのハミング距離（256ビット中）
+NEAR_DUPLICATE_VERIFY_SIZE = 256  # 候補を照合する縮小画像の一辺（ピクセル）
+NEAR_DUPLICATE_MAX_PIXEL_DIFF = 64  # 照合で許容する縮小画像の画素値の差の最大値
+NEAR_DUPLICATE_MAX_ASPECT_DIFF = 0.01  # 照合で許容する縦横比の差（比率）
+NEAR_DUPLICATE_MAX_BYTES = 64 * 1024 * 1024  # 近似重複インデックスが保持する縮小画像の上限サイズ（バイト）
+
+# 低信頼度の単語の再認識の設定
+REFINE_CROP_PADDING = 6  # 単語画像を切り出す際の余白（ピクセル）
+REFINE_UPSCALE = 2.0  # 単語画像の拡大率
+REFINE_VARIANTS = (  # 再認識に使用する前処理とPSMモードの組（前処理ごとに1回のバッチで認識）
+    ("contrast", "8"),  # コントラスト強調 + 単一の単語
+    ("binarize", "7"),  # 大津の二値化 + 単一のテキスト行
+)
+
+# 帳票の領域指定OCRの設定
+FORM_FIELD_PSM_MODE = "7"  # 項目ごとのPSMモードの既定値（単一のテキスト行）
+
 # バウンディングボックスの色設定（BGR形式）
 BBOX_COLOR_HIGH_CONF = (0, 255, 0)  # 緑色 - 高信頼度（80%以上）
 BBOX_COLOR_MEDIUM_CONF = (0, 165, 255)  # オレンジ色 - 中信頼度（50-80%）
@@ -0,0 +1,87 @@
+"""
+帳票OCRモジュール
+定型帳票の指定領域（項目）のみを切り出してOCRする機能を提供します。
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from PIL import Image
+
+from config import DEFAULT_OEM_MODE, FORM_FIELD_PSM_MODE
+from ocr_backend import get_backend
+from ocr_engine import ocr_data_to_text
+from utils import calculate_average_confidence
+
+
+def clip_box(box: Sequence[int], image_size: Tuple[int, int]) -> Tuple[int, int, int, int]:
+    """
+    矩形を画像の範囲内に収めます。
+    
+    Args:
+        box: 矩形 (left, top, width, height)
+        image_size: 画像サイズ (width, height)
+    
+    Returns:
+        画像内に収めた矩形 (left, top, width, height)
+    """
+    left, top, width, height = (int(value) for value in box)
+    image_width, image_height = image_size
+    right = min(left + width, image_width)
+    bottom = min(top + height, image_height)
+    left = max(left, 0)
+    top = max(top, 0)
+    return left, top, max(right - left, 0), max(bottom - top, 0)
+
+
+def ocr_form_fields(
+    image: Image.Image,
+    fields: Sequence[Dict[str, Any]],
+    lang: str = 'eng',
+    oem_mode: str = DEFAULT_OEM_MODE
+) -> Dict[str, Dict[str, Any]]:
+    """
+    帳票の指定領域のみを切り出してOCRを実行します。
+    
+    PSMモードと許可文字が同じ項目をまとめ、グループごとに1回のバッチ処理で認識します。
+    
+    Args:
+        image: 入力画像（帳票全体）
+        fields: 項目定義のリスト。各項目は以下のキーを持つ辞書
+            - name: 項目名
+            - box: 矩形 (left, top, width, height)
+            - psm: PSMモード（省略時はFORM_FIELD_PSM_MODE）
+            - whitelist: 認識を許可する文字（省略時は制限なし）
+        lang: 言語コード
+        oem_mode: OCR Engine Mode
+    
+    Returns:
+        項目名ごとの結果 {name: {'text': テキスト, 'conf': 平均信頼度, 'bbox': 矩形}}
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    groups: Dict[Tuple[str, Optional[str]], List[Tuple[str, Tuple[int, int, int, int]]]] = {}
+    
+    for field in fields:
+        name = field['name']
+        if name in results:
+            raise ValueError(f"項目名が重複しています: {name}")
+        bbox = clip_box(field['box'], image.size)
+        results[name] = {'text': '', 'conf': 0.0, 'bbox': bbox}
+        if bbox[2] == 0 or bbox[3] == 0:
+            # 画像外の領域は認識しない
+            continue
+        key = (str(field.get('psm', FORM_FIELD_PSM_MODE)), field.get('whitelist'))
+        groups.setdefault(key, []).append((name, bbox))
+    
+    backend = get_backend()
+    for (psm_mode, whitelist), members in groups.items():
+        crops = [
+            image.crop((left, top, left + width, top + height))
+            for _, (left, top, width, height) in members
+        ]
+        variables = {'tessedit_char_whitelist': whitelist} if whitelist else None
+        data_list = backend.image_to_data_batch(crops, lang, psm_mode, oem_mode, variables)
+        for (name, _), ocr_data in zip(members, data_list):
+            results[name]['text'] = ocr_data_to_text(ocr_data)
+            results[name]['conf'] = calculate_average_confidence(ocr_data)
+    
+    return results
@@ -9,6 +9,8 @@ import pytesseract
 from PIL import Image, ImageDraw, ImageFont
 import sys
 
+from ocr_engine import ocr_data_to_text
+
 
 def test_basic_ocr():
     """Test basic OCR functionality with a test image."""
@@ -108,6 +110,36 @@ def test_create_and_read_image():
         return False
 
 
+def test_single_pass_parity():
+    """Check that text rebuilt from image_to_data matches image_to_string."""
+    print("=" * 60)
+    print("Test 5: Single-pass Text Reconstruction Parity")
+    print("=" * 60)
+    
+    try:
+        image = Image.open('test_image.png')
+        
+        # Reference text from a dedicated image_to_string run
+        expected = pytesseract.image_to_string(image, lang='eng').strip()
+        
+        # Text rebuilt from the TSV word data of a single run
+        data = pytesseract.image_to_data(image, lang='eng', output_type=pytesseract.Output.DICT)
+        rebuilt = ocr_data_to_text(data)
+        
+        print(f"image_to_string:\n{expected}")
+        print(f"Rebuilt from image_to_data:\n{rebuilt}")
+        
+        if rebuilt != expected:
+            print("✗ Test failed: reconstructed text differs\n")
+            return False
+        
+        print("✓ Test passed\n")
+        return True
+    except Exception as e:
+        print(f"✗ Test failed: {e}\n")
+        return False
+
+
 def test_version_info():
     """Display pytesseract and Tesseract version information."""
     print("=" * 60)
@@ -150,6 +182,7 @@ def main():
         results.append(("OCR with Config", test_ocr_with_config()))
         results.append(("Detailed Data", test_get_data()))
         results.append(("Create & Read", test_create_and_read_image()))
+        results.append(("Single-pass Parity", test_single_pass_parity()))
     
     # Summary
     print("=" * 60)
@@ -6,7 +6,22 @@ OCR精度を向上させるための画像前処理機能を提供します。
 from PIL import Image, ImageEnhance, ImageFilter
 import cv2
 import numpy as np
-from typing import Tuple
+from typing import Dict, Optional, Tuple
+
+from config import (
+    TARGET_TEXT_HEIGHT,
+    TEXT_HEIGHT_TOLERANCE,
+    RESOLUTION_SCALE_LIMITS,
+    TEXT_HEIGHT_ESTIMATE_SIZE,
+    BLANK_PAGE_IMAGE_SIZE,
+    BLANK_PAGE_INK_CONTRAST,
+    BLANK_PAGE_MAX_INK_RATIO,
+    BLANK_PAGE_MAX_EDGE_DENSITY,
+    BLANK_PAGE_MIN_STD,
+)
+
+# 文字の高さの推定に必要な連結成分の最小数
+MIN_TEXT_COMPONENTS = 10
 
 
 def pil_to_cv2(pil_image: Image.Image) -> np.ndarray:
@@ -105,6 +120,142 @@ def denoise_image(image: Image.Image) -> Image.Image:
     return cv2_to_pil(denoised)
 
 
+def binarize_image(image: Image.Image) -> Image.Image:
+    """
+    大津の二値化で画像を白黒にします。
+    
+    Args:
+        image: 入力画像
+    
+    Returns:
+        二値化後の画像（モード'L'、画素値は0または255）
+    """
+    gray = np.asarray(image.convert('L'))
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return Image.fromarray(binary)
+
+
+def analyse_page_content(image: Image.Image) -> Dict[str, float]:
+    """
+    縮小したグレースケール画像から、ページの情報量の指標を計算します。
+    
+    Args:
+        image: 入力画像
+    
+    Returns:
+        {'ink_ratio': インクの画素の割合, 'edge_density': エッジの画素の割合, 'std': 画素値の標準偏差}
+    """
+    gray = np.array(image.convert('L'))
+    height, width = gray.shape
+    factor = min(1.0, BLANK_PAGE_IMAGE_SIZE / max(height, width, 1))
+    if factor < 1.0:
+        # 面積平均で縮小し、スキャン時の細かなノイズを均す
+        gray = cv2.resize(gray, None, fx=factor, fy=factor, interpolation=cv2.INTER_AREA)
+    
+    # 背景の明るさを基準にし、色付きの紙や裏写りをインクとみなさない
+    background = float(np.median(gray))
+    ink_ratio = float(np.count_nonzero(gray < background - BLANK_PAGE_INK_CONTRAST)) / gray.size
+    edge_density = float(np.count_nonzero(cv2.Canny(gray, 50, 150))) / gray.size
+    return {'ink_ratio': ink_ratio, 'edge_density': edge_density, 'std': float(gray.std())}
+
+
+def is_blank_page(image: Image.Image) -> bool:
+    """
+    白紙・情報量の少ないページ（区切り用紙や裏面など）かを判定します。
+    
+    Args:
+        image: 入力画像
+    
+    Returns:
+        白紙とみなせる場合はTrue
+    """
+    content = analyse_page_content(image)
+    if content['std'] < BLANK_PAGE_MIN_STD:
+        return True
+    return (
+        content['ink_ratio'] < BLANK_PAGE_MAX_INK_RATIO
+        and content['edge_density'] < BLANK_PAGE_MAX_EDGE_DENSITY
+    )
+
+
+def estimate_text_height(image: Image.Image) -> Optional[float]:
+    """
+    画像内の文字の代表的な高さを推定します。
+    
+    縮小した2値画像の連結成分のうち、文字らしい大きさ・形の成分の高さの中央値を使います。
+    
+    Args:
+        image: 入力画像
+    
+    Returns:
+        元画像での文字の高さ（ピクセル）。推定できない場合はNone
+    """
+    gray = np.array(image.convert('L'))
+    height, width = gray.shape
+    factor = min(1.0, TEXT_HEIGHT_ESTIMATE_SIZE / max(height, width))
+    if factor < 1.0:
+        gray = cv2.resize(gray, None, fx=factor, fy=factor, interpolation=cv2.INTER_AREA)
+    
+    # 文字を前景（白）にした2値画像
+    _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    _, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    
+    small_height, small_width = binary.shape
+    w = stats[1:, cv2.CC_STAT_WIDTH]
+    h = stats[1:, cv2.CC_STAT_HEIGHT]
+    area = stats[1:, cv2.CC_STAT_AREA]
+    # ノイズ・罫線・図版を除外
+    is_text = (
+        (h >= 2)
+        & (h < small_height / 4)
+        & (w < small_width / 4)
+        & (w <= h * 5)
+        & (h <= w * 10)
+        & (area >= 0.1 * w * h)
+    )
+    if np.count_nonzero(is_text) < MIN_TEXT_COMPONENTS:
+        return None
+    
+    return float(np.median(h[is_text])) / factor
+
+
+def normalize_resolution(
+    image: Image.Image,
+    target_height: int = TARGET_TEXT_HEIGHT
+) -> Tuple[Image.Image, float]:
+    """
+    文字の高さが目標値に近づくよう画像を拡縮します。
+    
+    文字が大きすぎる画像（スマートフォンの写真など）は縮小して処理量を減らし、
+    小さすぎる画像（低解像度のFAXなど）は拡大して認識精度を上げます。
+    
+    Args:
+        image: 入力画像
+        target_height: 文字の高さの目標値（ピクセル）
+    
+    Returns:
+        (拡縮後の画像, 拡縮率)。拡縮しない場合は (元の画像, 1.0)
+    """
+    text_height = estimate_text_height(image)
+    if text_height is None or text_height <= 0:
+        return image, 1.0
+    
+    scale = target_height / text_height
+    if 1 / TEXT_HEIGHT_TOLERANCE <= scale <= TEXT_HEIGHT_TOLERANCE:
+        return image, 1.0
+    
+    scale = min(max(scale, RESOLUTION_SCALE_LIMITS[0]), RESOLUTION_SCALE_LIMITS[1])
+    new_size = (max(int(round(image.width * scale)), 1), max(int(round(image.height * scale)), 1))
+    resample = Image.Resampling.LANCZOS if scale < 1 else Image.Resampling.BICUBIC
+    resized = image.resize(new_size, resample)
+    
+    # 解像度情報も拡縮に合わせて更新
+    dpi = image.info.get('dpi')
+    if dpi and dpi[0]:
+        resized.info['dpi'] = (dpi[0] * scale, dpi[1] * scale)
+    return resized, scale
+
+
 def preprocess_image(
     image: Image.Image,
     apply_grayscale: bool = False,
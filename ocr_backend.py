@@ -0,0 +1,1190 @@
+"""
+OCRバックエンドモジュール
+Tesseractの呼び出し方法を抽象化し、サブプロセス版とlibtesseract（C API）版のバックエンドを提供します。
+"""
+
+import asyncio
+import contextlib
+import ctypes
+import ctypes.util
+import io
+import os
+import shlex
+import subprocess
+import tempfile
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pytesseract
+from PIL import Image
+
+from config import (
+    DEFAULT_OCR_BACKEND,
+    DEFAULT_OEM_MODE,
+    OCR_BATCH_SIZE,
+    TESSDATA_TIERS,
+    DEFAULT_TESSDATA_TIER,
+    ASYNC_MAX_PROCESSES,
+    ASYNC_CPU_WORKERS,
+)
+from ocr_threads import invocation_threads, thread_limit_env, worker_layout
+
+
+# TSV出力のヘッダー（TessBaseAPIGetTsvTextはヘッダーを含まない）
+TSV_HEADER = (
+    "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\t"
+    "left\ttop\twidth\theight\tconf\ttext"
+)
+
+# 出力形式ごとにTesseractへ渡す設定変数
+OUTPUT_FORMAT_CONFIGS = {
+    "txt": "tessedit_create_txt=1",
+    "tsv": "tessedit_create_tsv=1",
+    "hocr": "tessedit_create_hocr=1",
+    "pdf": "tessedit_create_pdf=1",
+}
+
+# PageIteratorLevel（TessPageIteratorの反復単位）
+RIL_BLOCK = 0
+RIL_PARA = 1
+RIL_TEXTLINE = 2
+
+# libtesseractの探索候補（find_libraryで見つからない場合）
+LIBTESSERACT_CANDIDATES = (
+    "libtesseract.so.5",
+    "libtesseract.so.4",
+    "libtesseract.dylib",
+    "libtesseract-5.dll",
+)
+
+
+def build_tesseract_config(psm_mode: str, oem_mode: str = DEFAULT_OEM_MODE) -> str:
+    """
+    Tesseractのコマンドライン設定文字列を作成します。
+    
+    Args:
+        psm_mode: Page Segmentation Mode
+        oem_mode: OCR Engine Mode
+    
+    Returns:
+        設定文字列（例: '--oem 3 --psm 3'）
+    """
+    return f'--oem {oem_mode} --psm {psm_mode}'
+
+
+def prepare_image(image: Image.Image) -> Image.Image:
+    """
+    Tesseractに渡せる形式（1 / L / RGB）に画像を変換します。
+    
+    アルファチャンネルはpytesseractと同様に白背景へ合成します。
+    16ビット・32ビットのグレースケール画像は値を切り詰めずに8ビットへ縮めます（_to_8bit）。
+    
+    Args:
+        image: 入力画像
+    
+    Returns:
+        変換後の画像
+    """
+    if 'A' in image.getbands():
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, (0, 0), image.getchannel('A'))
+        image = background
+    
+    if image.mode in ('1', 'L', 'RGB'):
+        return image
+    if image.mode.startswith('I') or image.mode == 'F':
+        return _to_8bit(image)
+    return image.convert('RGB')
+
+
+def _to_8bit(image: Image.Image) -> Image.Image:
+    """
+    16ビット（I;16）・整数（I）・浮動小数点（F）のグレースケール画像を8ビット（L）に変換します。
+    
+    I;16は上位8ビットを取り出し、I / Fは最小値〜最大値を0〜255に割り当てます
+    （convert('L')は255を超える値を切り詰めるため、16ビットのスキャン画像が真っ白になる）。
+    """
+    pixels = np.asarray(image)
+    if image.mode.startswith('I;16'):
+        return Image.fromarray((pixels.astype(np.uint16) >> 8).astype(np.uint8), 'L')
+    
+    pixels = pixels.astype(np.float64)
+    low, high = (float(pixels.min()), float(pixels.max())) if pixels.size else (0.0, 0.0)
+    if high <= low:
+        # 一様な画像は値をそのまま（0〜255の範囲で）使用する
+        return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8), 'L')
+    scaled = (pixels - low) * (255.0 / (high - low))
+    return Image.fromarray(np.round(scaled).astype(np.uint8), 'L')
+
+
+def build_tesseract_command(
+    input_name: str,
+    output_base: str,
+    lang: str,
+    psm_mode: str,
+    oem_mode: str = DEFAULT_OEM_MODE,
+    output_formats: Sequence[str] = ("txt",),
+    dpi: Optional[int] = None,
+    variables: Optional[Dict[str, str]] = None,
+    tessdata_dir: Optional[str] = None
+) -> List[str]:
+    """
+    tesseractコマンドの引数リストを作成します。
+    
+    Args:
+        input_name: 入力画像（または画像リストファイル）のパス、'stdin'
+        output_base: 出力ファイルのベース名、'stdout'
+        lang: 言語コード
+        psm_mode: Page Segmentation Mode
+        oem_mode: OCR Engine Mode
+        output_formats: 出力形式（'txt', 'tsv', 'hocr', 'pdf'）
+        dpi: 入力画像の解像度（PNMなど解像度情報を持たない形式で指定）
+        variables: 追加のTesseract設定変数（例: {'tessedit_char_whitelist': '0123456789'}）
+        tessdata_dir: 学習データのディレクトリ（省略時はtesseractの既定）
+    
+    Returns:
+        コマンドの引数リスト
+    """
+    command = [pytesseract.pytesseract.tesseract_cmd, input_name, output_base]
+    if tessdata_dir:
+        command += ['--tessdata-dir', tessdata_dir]
+    command += ['-l', lang]
+    command += shlex.split(build_tesseract_config(psm_mode, oem_mode))
+    if dpi:
+        command += ['--dpi', str(dpi)]
+    for key, value in (variables or {}).items():
+        command += ['-c', f'{key}={value}']
+    for output_format in output_formats:
+        command += ['-c', OUTPUT_FORMAT_CONFIGS[output_format]]
+    return command
+
+
+def run_tesseract(command: List[str], input_bytes: Optional[bytes] = None) -> bytes:
+    """
+    tesseractコマンドを実行し、標準出力を返します。
+    
+    ワーカープロセスでは、OpenMPのスレッド数をそのプロセスに割り当てられた持ち分に制限します。
+    
+    Args:
+        command: コマンドの引数リスト
+        input_bytes: 標準入力に渡すデータ
+    
+    Returns:
+        標準出力の内容
+    """
+    try:
+        proc = subprocess.run(
+            command,
+            input=input_bytes,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=thread_limit_env(invocation_threads()),
+        )
+    except FileNotFoundError:
+        raise pytesseract.TesseractNotFoundError() from None
+    
+    if proc.returncode:
+        raise pytesseract.TesseractError(
+            proc.returncode, pytesseract.pytesseract.get_errors(proc.stderr)
+        )
+    return proc.stdout
+
+
+# イベントループごとの、同時に起動するtesseractプロセス数を制限するセマフォ
+_async_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_async_semaphore() -> asyncio.Semaphore:
+    """
+    実行中のイベントループのセマフォを取得します（未作成なら作成）。
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = _async_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(worker_layout(ASYNC_MAX_PROCESSES)[0])
+        _async_semaphores[loop] = semaphore
+    return semaphore
+
+
+# 非同期APIのCPU処理を実行するスレッドプール（プロセス内で共有）
+_async_cpu_executor: Optional[ThreadPoolExecutor] = None
+_async_cpu_executor_lock = threading.Lock()
+
+
+def _get_async_cpu_executor() -> ThreadPoolExecutor:
+    """
+    非同期APIのCPU処理用のスレッドプールを取得します（初回呼び出し時に生成）。
+    """
+    global _async_cpu_executor
+    with _async_cpu_executor_lock:
+        if _async_cpu_executor is None:
+            _async_cpu_executor = ThreadPoolExecutor(
+                max_workers=ASYNC_CPU_WORKERS, thread_name_prefix='ocr-async-cpu'
+            )
+        return _async_cpu_executor
+
+
+async def run_in_cpu_executor(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    CPU処理（画像のエンコード・結果の解析など）をイベントループの外で実行します。
+    
+    同時に実行する数はASYNC_CPU_WORKERSまでに制限します。
+    
+    Args:
+        func: 実行する関数
+        *args: 関数に渡す引数
+    
+    Returns:
+        関数の戻り値
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_async_cpu_executor(), func, *args)
+
+
+async def run_tesseract_async(command: List[str], input_bytes: Optional[bytes] = None) -> bytes:
+    """
+    tesseractコマンドを非同期に実行し、標準出力を返します。
+    
+    同時に起動するプロセス数はASYNC_MAX_PROCESSESまでに制限して、OpenMPのスレッド数を
+    その同時実行数での持ち分に制限し、待機中のタスクがキャンセルされた場合は子プロセスを終了させます。
+    
+    Args:
+        command: コマンドの引数リスト
+        input_bytes: 標準入力に渡すデータ
+    
+    Returns:
+        標準出力の内容
+    """
+    async with _get_async_semaphore():
+        spawn = asyncio.ensure_future(asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.PIPE if input_bytes is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=thread_limit_env(invocation_threads(worker_layout(ASYNC_MAX_PROCESSES)[0])),
+        ))
+        proc = None
+        try:
+            # 起動中にキャンセルされても起動自体は中断させず、下で確実に終了させる
+            proc = await asyncio.shield(spawn)
+            stdout, stderr = await proc.communicate(input_bytes)
+        except FileNotFoundError:
+            raise pytesseract.TesseractNotFoundError() from None
+        finally:
+            # キャンセルや例外で中断した場合も子プロセスを残さない
+            if proc is None:
+                with contextlib.suppress(Exception):
+                    proc = await spawn
+            if proc is not None and proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+    
+    if proc.returncode:
+        raise pytesseract.TesseractError(proc.returncode, pytesseract.pytesseract.get_errors(stderr))
+    return stdout
+
+
+def split_ocr_data_by_page(ocr_data: Dict[str, List], page_count: int) -> List[Dict[str, List]]:
+    """
+    複数ページ分のOCRデータをページごとに分割します。
+    
+    各ページのpage_numは単一画像の結果と同じく1に振り直します。
+    
+    Args:
+        ocr_data: 複数ページ分のOCRデータ
+        page_count: ページ数
+    
+    Returns:
+        ページごとのOCRデータのリスト
+    """
+    columns = list(ocr_data.keys()) or TSV_HEADER.split('\t')
+    pages: List[Dict[str, List]] = [
+        {column: [] for column in columns} for _ in range(page_count)
+    ]
+    
+    for i in range(len(ocr_data.get('page_num', []))):
+        page_index = int(ocr_data['page_num'][i]) - 1
+        if not 0 <= page_index < page_count:
+            continue
+        page = pages[page_index]
+        for column in columns:
+            page[column].append(1 if column == 'page_num' else ocr_data[column][i])
+    
+    return pages
+
+
+def encode_pnm(image: Image.Image) -> bytes:
+    """
+    画像を無圧縮のPNM形式にエンコードします。
+    
+    2値画像はPBM（1ビット）、グレースケールはPGM（8ビット）、
+    それ以外はPPM（24ビット）になります。
+    
+    Args:
+        image: 入力画像
+    
+    Returns:
+        PNM形式のバイト列
+    """
+    buffer = io.BytesIO()
+    prepare_image(image).save(buffer, format='PPM')
+    return buffer.getvalue()
+
+
+def get_image_dpi(image: Image.Image) -> Optional[int]:
+    """
+    画像に記録された解像度（DPI）を取得します。
+    
+    Args:
+        image: 入力画像
+    
+    Returns:
+        解像度（記録されていない場合はNone）
+    """
+    dpi = image.info.get('dpi')
+    if not dpi or not dpi[0]:
+        return None
+    return int(round(float(dpi[0])))
+
+
+class OCRBackend:
+    """
+    OCRバックエンドの基底クラス
+    
+    画像を受け取り、テキストまたはOCRデータ（pytesseractのOutput.DICT形式）を返します。
+    """
+    
+    name = "base"
+    
+    def image_to_string(
+        self,
+        image: Image.Image,
+        lang: str,
+        psm_mode: str,
+        oem_mode: str = DEFAULT_OEM_MODE
+    ) -> str:
+        """
+        画像からテキストを抽出します。
+        
+        Args:
+            image: 入力画像
+            lang: 言語コード
+            psm_mode: Page Segmentation Mode
+            oem_mode: OCR Engine Mode
+        
+        Returns:
+            抽出されたテキスト
+        """
+        raise NotImplementedError
+    
+    def image_to_data(
+        self,
+        image: Image.Image,
+        lang: str,
+        psm_mode: str,
+        oem_mode: str = DEFAULT_OEM_MODE,
+        variables: Optional[Dict[str, str]] = None
+    ) -> Dict[str, List]:
+        """
+        画像からOCRの詳細データを取得します。
+        
+        Args:
+            image: 入力画像
+            lang: 言語コード
+            psm_mode: Page Segmentation Mode
+            oem_mode: OCR Engine Mode
+            variables: 追加のTesseract設定変数
+        
+        Returns:
+            OCRデータ（単語、座標、信頼度など）
+        """
+        raise NotImplementedError
+    
+    def image_to_tsv(
+        self,
+        image: Image.Image,
+        lang: str,
+        psm_mode: str,
+        oem_mode: str = DEFAULT_OEM_MODE
+    ) -> str:
+        """
+        画像からTSV形式（ヘッダー付き）のOCRデータを取得します。
+        
+        既定の実装はimage_to_dataの結果をTSVに戻します。
+        
+        Args:
+            image: 入力画像
+            lang: 言語コード
+            psm_mode: Page Segmentation Mode
+            oem_mode: OCR Engine Mode
+        
+        Returns:
+            TSV文字列
+        """
+        ocr_data = self.image_to_data(image, lang, psm_mode, oem_mode)
+        columns = TSV_HEADER.split('\t')
+        rows = zip(*(ocr_data.get(column, []) for column in columns))
+        return '\n'.join([TSV_HEADER] + ['\t'.join(str(value) for value in row) for row in rows])
+    
+    def image_to_string_batch(
+        self,
+        images: Sequence[Image.Image],
+        lang: str,
+        psm_mode: str,
+        oem_mode: str = DEFAULT_OEM_MODE
+    ) -> List[str]:
+        """
+        複数の画像からテキストを抽出します（既定では1枚ずつ処理します）。
+        
+        Args:
+            images: 入力画像のリスト
+            lang: 言語コード
+            psm_mode: Page Segmentation Mode
+            oem_mode: OCR Engine Mode
+        
+        Returns:
+            画像ごとの抽出テキスト
+        """
+        return [self.image_to_string(image, lang, psm_mode, oem_mode) for image in images]
+    
+    def image_to_data_batch(
+        self,
+        images: Sequence[Image.Image],
+        lang: str,
+        psm_mode: str,
+        oem_mode: str = DEFAULT_OEM_MODE,
+        variables: Optional[Dict[str, str]] = None
+    ) -> List[Dict[str, List]]:
+        """
+        複数の画像からOCRの詳細データを取得します（既定では1枚ずつ処理します）。
+        
+        Args:
+            images: 入力画像のリスト
+            lang: 言語コード
+            psm_mode: Page Segmentation Mode
+            oem_mode: OCR Engine Mode
+            variables: 追加のTesseract設定変数
+        
+        Returns:
+            画像ごとのOCRデータ
+        """
+        return [self.image_to_data(image, lang, psm_mode, oem_mode, variables) for image in images]
+    
+    def image_to_outputs(
+        self,
+        image: Image.Image,
+        lang: str,
+        psm_mode: str,
+        oem_mode: str = DEFAULT_OEM_MODE,
+        output_formats: Sequence[str] = ("txt", "tsv")
+    ) -> Dict[str, Any]:
+        """
+        1回の認識で複数形式の結果を取得します。
+        
+        既定の実装はtxt / tsvのみに対応し、形式ごとに認識を行います。
+        
+        Args:
+            image: 入力画像
+            lang: 言語コード
+            psm_mode: Page Segmentation Mode
+            oem_mode: OCR Engine Mode
+            output_formats: 出力形式（'txt', 'tsv', 'hocr', 'pdf'）
+        
+        Returns:
+            形式ごとの結果（txt / hocr: 文字列, tsv: OCRデータ, pdf: バイト列）
+        """
+        outputs: Dict[str, Any] = {}
+        for output_format in output_formats:
+            if output_format == 'txt':
+                outputs['txt'] = self.image_to_string(image, lang, psm_mode, oem_mode)
+            elif output_format == 'tsv':
+                outputs['tsv'] = self.image_to_data(image, lang, psm_mode, oem_mode)
+            else:
+                raise ValueError(f"{self.name}バックエンドは出力形式 {output_format} に対応していません")
+        return outputs
+    
+    def analyse_layout(
+        self,
+        image: Image.Image,
+        lang: str,
+        psm_mode: str,
+        oem_mode: str = DEFAULT_OEM_MODE
+    ) -> List[Dict[str, int]]:
+        """
+        文字認識を行わず、レイアウト解析のみで行の矩形を取得します。
+        
+        Args:
+            image: 入力画像
+            lang: 言語コード
+            psm_mode: Page Segmentation Mode
+            oem_mode: OCR Engine Mode
+        
+        Returns:
+            行ごとの情報（block_num, par_num, line_num, left, top, width, height）のリスト
+        """
+        raise NotImplementedError(f"{self.name}バックエンドはレイアウト解析のみの実行に対応していません")
+    
+    def detect_orientation(self, image: Image.Image) -> Dict[str, Any]:
+        """
+        ページの向きと文字種を検出します（PSM 0 / OSD）。
+        
+        Args:
+            image: 入力画像
+        
+        Returns:
+            検出結果
+                - orientation: ページの向き（度, 0 / 90 / 180 / 270）
+                - rotate: 正立させるために時計回りに回転する角度（度）
+                - orientation_conf: 向きの信頼度
+                - script: 文字種（'Latin', 'Japanese' など）
+                - script_conf: 文字種の信頼度
+        """
+        raise NotImplementedError(f"{self.name}バックエンドは向きの検出に対応していません")
+    
+    def warm_up(self, lang: str, oem_mode: str = DEFAULT_OEM_MODE) -> None:
+        """
+        指定した言語のエンジンを事前に準備します（既定では何もしません）。
+        
+        Args:
+            lang: 言語コード
+            oem_mode: OCR Engine Mode
+        """
+    
+    def close(self) -> None:
+        """
+        バックエンドが保持するリソースを解放します。
+        """
+
+
+class SubprocessBackend(OCRBackend):
+    """
+    tesseractコマンドを起動するバックエンド（デフォルト）
+    
+    単一画像は一時ファイルを作らず、無圧縮のPNM形式で標準入力へ渡し、
+    結果を標準出力から受け取ります。
+    """
+    
+    name = "subprocess"
+    
+    def __init__(self, tessdata_dir: Optional[str] = None):
+        self.tessdata_dir = tessdata_dir
+    
+    def _run_stdin(
+        self,
+        image: Image.Image,
+        lang: str,
+        psm_mode: str,
+        oem_mode: str,
+        output_format: str,
+        variables: Optional[Dict[str, str]] = None
+    ) -> str:
+        """
+        画像を標準入力に流してtesseractを実行し、標準出力の結果を返します。
+        """
+        command = build_tesseract_command(
+            'stdin', 'stdout', lang, psm_mode, oem_mode, (output_format,), get_image_dpi(image),
+            variables, self.tessdata_dir
+        )
+        return run_tesseract(command, encode_pnm(image)).decode('utf-8')
+    
+    def image_to_string(
+        self,
+        image: Image.Image,
+        lang: str,
+        psm_mode: str,
+        oem_mode: str = DEFAULT_OEM_MODE
+    ) -> str:
+        return self._run_stdin(image, lang, psm_mode, oem_mode, 'txt')
+    
+    def image_to_data(
+        self,
+        image: Image.Image,
+        lang: str,
+        psm_mode: str,
+        oem_mode: str = DEFAULT_OEM_MODE,
+        variables: Optional[Dict[str, str]] = None
+    ) -> Dict[str, List]:
+        tsv = self._run_stdin(image, lang, psm_mode, oem_mode, 'tsv', variables)
+        return pytesseract.pytesseract.file_to_dict(tsv, '\t', -1)
+    
+    def image_to_tsv(
+        self,
+        image: Image.Image,
+        lang: str,
+        psm_mode: str,
+        oem_mode: str = DEFAULT_OEM_MODE
+    ) -> str:
+        return self._run_stdin(image, lang, psm_mode, oem_mode, 'tsv')
+    
+    def detect_orientation(self, image: Image.Image) -> Dict[str, Any]:
+        # PSM 0ではOSDの結果が標準出力に書き出される
+        command = build_tesseract_command(
+            'stdin', 'stdout', 'osd', '0', DEFAULT_OEM_MODE, (), get_image_dpi(image),
+            tessdata_dir=self.tessdata_dir
+        )
+        return parse_osd(run_tesseract(command, encode_pnm(image)).decode('utf-8'))
+    
+    def _run_batch(
+        self,
+        images: Sequence[Image.Image],
+        lang: str,
+        psm_mode: str,
+        oem_mode: str,
+        output_format: str,
+        variables: Optional[Dict[str, str]] = None
+    ) -> str:
+        """
+        画像リストファイルを使い、1回のtesseract実行で複数画像を処理します。
+        """
+        with tempfile.TemporaryDirectory(prefix='tess_batch_') as temp_dir:
+            # 画像リストはファイルで渡す必要があるため、圧縮不要なPNMで書き出す
+            image_paths = []
+            for index, image in enumerate(images):
+                image_path = os.path.join(temp_dir, f'{index:06d}.pnm')
+                with open(image_path, 'wb') as f:
+                    f.write(encode_pnm(image))
+                image_paths.append(image_path)
+            
+            list_path = os.path.join(temp_dir, 'images.txt')
+            with open(list_path, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(image_paths) + '\n')
+            
+            output_base = os.path.join(temp_dir, 'output')
+            run_tesseract(build_tesseract_command(
+                list_path, output_base, lang, psm_mode, oem_mode, (output_format,),
+                variables=variables, tessdata_dir=self.tessdata_dir
+            ))
+            with open(f'{output_base}.{output_format}', 'rb') as f:
+                return f.read().decode('utf-8')
+    
+    def image_to_string_batch(
+        self,
+        images: Sequence[Image.Image],
+        lang: str,
+        psm_mode: str,
+        oem_mode: str = DEFAULT_OEM_MODE
+    ) -> List[str]:
+        texts: List[str] = []
+        for start in range(0, len(images), OCR_BATCH_SIZE):
+            chunk = images[start:start + OCR_BATCH_SIZE]
+            output = self._run_batch(chunk, lang, psm_mode, oem_mode, 'txt')
+            # ページごとに改ページ文字（page_separator）が付与される
+            pages = output.split('\f')
+            pages += [''] * (len(chunk) - len(pages))
+            texts.extend(pages[:len(chunk)])
+        return texts
+    
+    def image_to_data_batch(
+        self,
+        images: Sequence[Image.Image],
+        lang: str,
+        psm_mode: str,
+        oem_mode: str = DEFAULT_OEM_MODE,
+        variables: Optional[Dict[str, str]] = None
+    ) -> List[Dict[str, List]]:
+        results: List[Dict[str, List]] = []
+        for start in range(0, len(images), OCR_BATCH_SIZE):
+            chunk = images[start:start + OCR_BATCH_SIZE]
+            output = self._run_batch(chunk, lang, psm_mode, oem_mode, 'tsv', variables)
+            # TSVのpage_numでページ（画像）を区切る
+            data = pytesseract.pytesseract.file_to_dict(output, '\t', -1)
+            results.extend(split_ocr_data_by_page(data, len(chunk)))
+        return results
+    
+    def image_to_outputs(
+        self,
+        image: Image.Image,
+        lang: str,
+        psm_mode: str,
+        oem_mode: str = DEFAULT_OEM_MODE,
+        output_formats: Sequence[str] = ("txt", "tsv")
+    ) -> Dict[str, Any]:
+        with tempfile.TemporaryDirectory(prefix='tess_multi_') as temp_dir:
+            input_name, input_bytes = 'stdin', encode_pnm(image)
+            if 'pdf' in output_formats:
+                # PDFレンダラーは入力画像ファイルを読み込むためファイルで渡す
+                input_name, input_bytes = os.path.join(temp_dir, 'input.png'), None
+                prepare_image(image).save(input_name, format='PNG')
+            
+            # 要求された全形式のレンダラーを1回の実行で有効にする
+            output_base = os.path.join(temp_dir, 'output')
+            run_tesseract(build_tesseract_command(
+                input_name, output_base, lang, psm_mode, oem_mode, output_formats,
+                get_image_dpi(image), tessdata_dir=self.tessdata_dir
+            ), input_bytes)
+            
+            outputs: Dict[str, Any] = {}
+            for output_format in output_formats:
+                with open(f'{output_base}.{output_format}', 'rb') as f:
+                    content = f.read()
+                if output_format == 'pdf':
+                    outputs['pdf'] = content
+                elif output_format == 'tsv':
+                    outputs['tsv'] = pytesseract.pytesseract.file_to_dict(
+                        content.decode('utf-8'), '\t', -1
+                    )
+                else:
+                    outputs[output_format] = content.decode('utf-8')
+            return outputs
+
+
+def parse_osd(osd_text: str) -> Dict[str, Any]:
+    """
+    tesseractのOSD出力（PSM 0）を解析します。
+    
+    Args:
+        osd_text: OSD出力（'Orientation in degrees: 90' などの行）
+    
+    Returns:
+        検出結果（OCRBackend.detect_orientationと同じ形式）
+    """
+    fields = {}
+    for line in osd_text.splitlines():
+        key, separator, value = line.partition(':')
+        if separator:
+            fields[key.strip()] = value.strip()
+    
+    orientation = int(fields.get('Orientation in degrees', 0))
+    return {
+        'orientation': orientation,
+        'rotate': int(fields.get('Rotate', (360 - orientation) % 360)),
+        'orientation_conf': float(fields.get('Orientation confidence', 0.0)),
+        'script': fields.get('Script', ''),
+        'script_conf': float(fields.get('Script confidence', 0.0)),
+    }
+
+
+def load_libtesseract(library_path: Optional[str] = None) -> ctypes.CDLL:
+    """
+    libtesseractを読み込み、使用するC API関数の型を設定します。
+    
+    Args:
+        library_path: ライブラリのパス（省略時は自動検出）
+    
+    Returns:
+        読み込まれたライブラリ
+    """
+    candidates = [library_path] if library_path else [
+        ctypes.util.find_library('tesseract'),
+        *LIBTESSERACT_CANDIDATES,
+    ]
+    
+    lib = None
+    for candidate in candidates:
+        if not candidate:
+            continue
+        try:
+            lib = ctypes.CDLL(candidate)
+            break
+        except OSError:
+            continue
+    
+    if lib is None:
+        raise OSError("libtesseractが見つかりません。tesseract-ocrのライブラリをインストールしてください。")
+    
+    handle = ctypes.c_void_p
+    
+    lib.TessVersion.restype = ctypes.c_char_p
+    lib.TessVersion.argtypes = []
+    lib.TessBaseAPICreate.restype = handle
+    lib.TessBaseAPICreate.argtypes = []
+    lib.TessBaseAPIInit2.restype = ctypes.c_int
+    lib.TessBaseAPIInit2.argtypes = [handle, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_int]
+    lib.TessBaseAPISetVariable.restype = ctypes.c_int
+    lib.TessBaseAPISetVariable.argtypes = [handle, ctypes.c_char_p, ctypes.c_char_p]
+    lib.TessBaseAPISetPageSegMode.restype = None
+    lib.TessBaseAPISetPageSegMode.argtypes = [handle, ctypes.c_int]
+    lib.TessBaseAPISetImage.restype = None
+    lib.TessBaseAPISetImage.argtypes = [
+        handle, ctypes.c_char_p, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int
+    ]
+    lib.TessBaseAPISetSourceResolution.restype = None
+    lib.TessBaseAPISetSourceResolution.argtypes = [handle, ctypes.c_int]
+    lib.TessBaseAPIRecognize.restype = ctypes.c_int
+    lib.TessBaseAPIRecognize.argtypes = [handle, ctypes.c_void_p]
+    lib.TessBaseAPIGetUTF8Text.restype = ctypes.c_void_p
+    lib.TessBaseAPIGetUTF8Text.argtypes = [handle]
+    lib.TessBaseAPIGetTsvText.restype = ctypes.c_void_p
+    lib.TessBaseAPIGetTsvText.argtypes = [handle, ctypes.c_int]
+    lib.TessBaseAPIGetHOCRText.restype = ctypes.c_void_p
+    lib.TessBaseAPIGetHOCRText.argtypes = [handle, ctypes.c_int]
+    lib.TessBaseAPIDetectOrientationScript.restype = ctypes.c_int
+    lib.TessBaseAPIDetectOrientationScript.argtypes = [
+        handle, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_float),
+        ctypes.POINTER(ctypes.c_char_p), ctypes.POINTER(ctypes.c_float)
+    ]
+    lib.TessBaseAPIAnalyseLayout.restype = ctypes.c_void_p
+    lib.TessBaseAPIAnalyseLayout.argtypes = [handle]
+    lib.TessPageIteratorDelete.restype = None
+    lib.TessPageIteratorDelete.argtypes = [ctypes.c_void_p]
+    lib.TessPageIteratorNext.restype = ctypes.c_int
+    lib.TessPageIteratorNext.argtypes = [ctypes.c_void_p, ctypes.c_int]
+    lib.TessPageIteratorIsAtBeginningOf.restype = ctypes.c_int
+    lib.TessPageIteratorIsAtBeginningOf.argtypes = [ctypes.c_void_p, ctypes.c_int]
+    lib.TessPageIteratorBoundingBox.restype = ctypes.c_int
+    lib.TessPageIteratorBoundingBox.argtypes = [ctypes.c_void_p, ctypes.c_int] + [ctypes.POINTER(ctypes.c_int)] * 4
+    lib.TessDeleteText.restype = None
+    lib.TessDeleteText.argtypes = [ctypes.c_void_p]
+    lib.TessBaseAPIClear.restype = None
+    lib.TessBaseAPIClear.argtypes = [handle]
+    lib.TessBaseAPIEnd.restype = None
+    lib.TessBaseAPIEnd.argtypes = [handle]
+    lib.TessBaseAPIDelete.restype = None
+    lib.TessBaseAPIDelete.argtypes = [handle]
+    
+    return lib
+
+
+class LibTesseractBackend(OCRBackend):
+    """
+    libtesseractのC API（TessBaseAPI）をctypesで直接呼び出すバックエンド
+    
+    (言語, OEM, 設定変数) ごとに初期化済みのTessBaseAPIハンドルを保持し、
+    呼び出しのたびに学習データを読み込み直すコストを省きます。
+    TessBaseAPIはスレッドセーフではないため、ハンドルごとにロックで保護します。
+    """
+    
+    name = "libtesseract"
+    
+    def __init__(
+        self,
+        library_path: Optional[str] = None,
+        tessdata_dir: Optional[str] = None
+    ):
+        self._lib = load_libtesseract(library_path)
+        self._tessdata_dir = tessdata_dir
+        self._handles: Dict[Tuple[str, str, Tuple], Tuple[int, threading.Lock]] = {}
+        self._handles_lock = threading.Lock()
+    
+    @property
+    def version(self) -> str:
+        """libtesseractのバージョン文字列"""
+        return self._lib.TessVersion().decode('utf-8')
+    
+    def _get_handle(
+        self,
+        lang: str,
+        oem_mode: str,
+        variables: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, threading.Lock]:
+        """
+        (言語, OEM, 設定変数) に対応する初期化済みハンドルを取得します（未作成なら作成）。
+        """
+        key = (lang, str(oem_mode), tuple(sorted((variables or {}).items())))
+        with self._handles_lock:
+            if key in self._handles:
+                return self._handles[key]
+            
+            api = self._lib.TessBaseAPICreate()
+            datapath = self._tessdata_dir.encode('utf-8') if self._tessdata_dir else None
+            status = self._lib.TessBaseAPIInit2(api, datapath, lang.encode('utf-8'), int(oem_mode))
+            if status != 0:
+                self._lib.TessBaseAPIDelete(api)
+                raise RuntimeError(f"libtesseractの初期化に失敗しました（言語: {lang}, OEM: {oem_mode}）")
+            for name, value in key[2]:
+                if not self._lib.TessBaseAPISetVariable(api, name.encode('utf-8'), str(value).encode('utf-8')):
+                    self._lib.TessBaseAPIEnd(api)
+                    self._lib.TessBaseAPIDelete(api)
+                    raise ValueError(f"未知のTesseract設定変数です: {name}")
+            
+            self._handles[key] = (api, threading.Lock())
+            return self._handles[key]
+    
+    def warm_up(self, lang: str, oem_mode: str = DEFAULT_OEM_MODE) -> None:
+        self._get_handle(lang, oem_mode)
+    
+    def _recognize(
+        self,
+        image: Image.Image,
+        lang: str,
+        psm_mode: str,
+        oem_mode: str,
+        read_result: Callable[[int], Any],
+        recognize: bool = True,
+        variables: Optional[Dict[str, str]] = None
+    ) -> Any:
+        """
+        画像を認識し、read_resultで取り出した結果を返します。
+        
+        recognize=Falseの場合は文字認識を行わず、画像の設定のみ行います。
+        """
+        api, lock = self._get_handle(lang, oem_mode, variables)
+        image = prepare_image(image)
+        if image.mode == '1':
+            image = image.convert('L')
+        bytes_per_pixel = 1 if image.mode == 'L' else 3
+        width, height = image.size
+        pixels = image.tobytes()
+        
+        with lock:
+            try:
+                self._lib.TessBaseAPISetPageSegMode(api, int(psm_mode))
+                self._lib.TessBaseAPISetImage(
+                    api, pixels, width, height, bytes_per_pixel, width * bytes_per_pixel
+                )
+                dpi = get_image_dpi(image)
+                if dpi:
+                    self._lib.TessBaseAPISetSourceResolution(api, dpi)
+                if recognize and self._lib.TessBaseAPIRecognize(api, None) != 0:
+                    raise RuntimeError("libtesseractでの認識に失敗しました")
+                return read_result(api)
+            finally:
+                self._lib.TessBaseAPIClear(api)
+    
+    def _read_text(self, text_ptr: Optional[int]) -> str:
+        """
+        C APIが返した文字列を取り出し、メモリを解放します。
+        """
+        if not text_ptr:
+            return ''
+        try:
+            return ctypes.string_at(text_ptr).decode('utf-8')
+        finally:
+            self._lib.TessDeleteText(text_ptr)
+    
+    def image_to_string(
+        self,
+        image: Image.Image,
+        lang: str,
+        psm_mode: str,
+        oem_mode: str = DEFAULT_OEM_MODE
+    ) -> str:
+        return self._recognize(
+            image, lang, psm_mode, oem_mode,
+            lambda api: self._read_text(self._lib.TessBaseAPIGetUTF8Text(api))
+        )
+    
+    def image_to_data(
+        self,
+        image: Image.Image,
+        lang: str,
+        psm_mode: str,
+        oem_mode: str = DEFAULT_OEM_MODE,
+        variables: Optional[Dict[str, str]] = None
+    ) -> Dict[str, List]:
+        tsv = self._recognize(
+            image, lang, psm_mode, oem_mode,
+            lambda api: self._read_text(self._lib.TessBaseAPIGetTsvText(api, 0)),
+            variables=variables
+        )
+        return pytesseract.pytesseract.file_to_dict(f"{TSV_HEADER}\n{tsv}", '\t', -1)
+    
+    def image_to_tsv(
+        self,
+        image: Image.Image,
+        lang: str,
+        psm_mode: str,
+        oem_mode: str = DEFAULT_OEM_MODE
+    ) -> str:
+        tsv = self._recognize(
+            image, lang, psm_mode, oem_mode,
+            lambda api: self._read_text(self._lib.TessBaseAPIGetTsvText(api, 0))
+        )
+        return f"{TSV_HEADER}\n{tsv}"
+    
+    def image_to_outputs(
+        self,
+        image: Image.Image,
+        lang: str,
+        psm_mode: str,
+        oem_mode: str = DEFAULT_OEM_MODE,
+        output_formats: Sequence[str] = ("txt", "tsv")
+    ) -> Dict[str, Any]:
+        if 'pdf' in output_formats:
+            # PDFレンダラーは入力画像ファイルを埋め込むため、tesseractコマンドで一括生成する
+            return SubprocessBackend(self._tessdata_dir).image_to_outputs(
+                image, lang, psm_mode, oem_mode, output_formats
+            )
+        
+        def read_outputs(api: int) -> Dict[str, Any]:
+            outputs: Dict[str, Any] = {}
+            for output_format in output_formats:
+                if output_format == 'txt':
+                    outputs['txt'] = self._read_text(self._lib.TessBaseAPIGetUTF8Text(api))
+                elif output_format == 'tsv':
+                    tsv = self._read_text(self._lib.TessBaseAPIGetTsvText(api, 0))
+                    outputs['tsv'] = pytesseract.pytesseract.file_to_dict(
+                        f"{TSV_HEADER}\n{tsv}", '\t', -1
+                    )
+                elif output_format == 'hocr':
+                    outputs['hocr'] = self._read_text(self._lib.TessBaseAPIGetHOCRText(api, 0))
+            return outputs
+        
+        return self._recognize(image, lang, psm_mode, oem_mode, read_outputs)
+    
+    def analyse_layout(
+        self,
+        image: Image.Image,
+        lang: str,
+        psm_mode: str,
+        oem_mode: str = DEFAULT_OEM_MODE
+    ) -> List[Dict[str, int]]:
+        def read_lines(api: int) -> List[Dict[str, int]]:
+            iterator = self._lib.TessBaseAPIAnalyseLayout(api)
+            if not iterator:
+                return []
+            
+            lines: List[Dict[str, int]] = []
+            block_num = par_num = line_num = 0
+            box = [ctypes.c_int() for _ in range(4)]
+            try:
+                while True:
+                    if self._lib.TessPageIteratorIsAtBeginningOf(iterator, RIL_BLOCK):
+                        block_num, par_num = block_num + 1, 0
+                    if self._lib.TessPageIteratorIsAtBeginningOf(iterator, RIL_PARA):
+                        par_num, line_num = par_num + 1, 0
+                    line_num += 1
+                    if self._lib.TessPageIteratorBoundingBox(
+                        iterator, RIL_TEXTLINE, *(ctypes.byref(value) for value in box)
+                    ):
+                        left, top, right, bottom = (value.value for value in box)
+                        lines.append({
+                            'block_num': block_num,
+                            'par_num': par_num,
+                            'line_num': line_num,
+                            'left': left,
+                            'top': top,
+                            'width': right - left,
+                            'height': bottom - top,
+                        })
+                    if not self._lib.TessPageIteratorNext(iterator, RIL_TEXTLINE):
+                        break
+            finally:
+                self._lib.TessPageIteratorDelete(iterator)
+            return lines
+        
+        return self._recognize(image, lang, psm_mode, oem_mode, read_lines, recognize=False)
+    
+    def detect_orientation(self, image: Image.Image) -> Dict[str, Any]:
+        def read_osd(api: int) -> Dict[str, Any]:
+            orientation = ctypes.c_int()
+            orientation_conf = ctypes.c_float()
+            script = ctypes.c_char_p()
+            script_conf = ctypes.c_float()
+            if not self._lib.TessBaseAPIDetectOrientationScript(
+                api, ctypes.byref(orientation), ctypes.byref(orientation_conf),
+                ctypes.byref(script), ctypes.byref(script_conf)
+            ):
+                raise RuntimeError("libtesseractでの向きの検出に失敗しました")
+            return {
+                'orientation': orientation.value,
+                'rotate': (360 - orientation.value) % 360,
+                'orientation_conf': orientation_conf.value,
+                'script': script.value.decode('utf-8') if script.value else '',
+                'script_conf': script_conf.value,
+            }
+        
+        return self._recognize(image, 'osd', '0', DEFAULT_OEM_MODE, read_osd, recognize=False)
+    
+    def close(self) -> None:
+        with self._handles_lock:
+            for api, lock in self._handles.values():
+                with lock:
+                    self._lib.TessBaseAPIEnd(api)
+                    self._lib.TessBaseAPIDelete(api)
+            self._handles.clear()
+
+
+def resolve_tessdata_dir(tier: Optional[str] = None) -> Optional[str]:
+    """
+    学習データの種類（tier）に対応するディレクトリを取得します。
+    
+    Args:
+        tier: 学習データの種類（'fast', 'standard', 'best'。省略時はDEFAULT_TESSDATA_TIER）
+    
+    Returns:
+        ディレクトリのパス（tesseractの既定のディレクトリを使う場合はNone）
+    """
+    tier = tier or DEFAULT_TESSDATA_TIER
+    if tier not in TESSDATA_TIERS:
+        raise ValueError(f"未知の学習データの種類です: {tier}")
+    tessdata_dir = TESSDATA_TIERS[tier]
+    if tessdata_dir and not os.path.isdir(tessdata_dir):
+        raise ValueError(f"学習データ（{tier}）のディレクトリが見つかりません: {tessdata_dir}")
+    return tessdata_dir
+
+
+# 利用可能なバックエンド（名前 -> 生成関数。生成関数は学習データのディレクトリを引数に取る）
+_BACKEND_FACTORIES: Dict[str, Callable[..., OCRBackend]] = {
+    SubprocessBackend.name: SubprocessBackend,
+    LibTesseractBackend.name: LibTesseractBackend,
+}
+
+# 生成済みのバックエンド（(名前, 学習データのディレクトリ) -> バックエンド、プロセス内で共有）
+_backends: Dict[Tuple[str, Optional[str]], OCRBackend] = {}
+_backends_lock = threading.Lock()
+_default_backend_name = DEFAULT_OCR_BACKEND
+
+
+def register_backend(name: str, factory: Callable[..., OCRBackend]) -> None:
+    """
+    バックエンドを登録します。
+    
+    Args:
+        name: バックエンド名
+        factory: バックエンドを生成する関数（tessdata_dirを省略可能な引数として受け取る）
+    """
+    with _backends_lock:
+        _BACKEND_FACTORIES[name] = factory
+        old_backends = [_backends.pop(key) for key in list(_backends) if key[0] == name]
+    for old_backend in old_backends:
+        old_backend.close()
+
+
+def get_backend(
+    name: Optional[str] = None,
+    tier: Optional[str] = None,
+    tessdata_dir: Optional[str] = None
+) -> OCRBackend:
+    """
+    バックエンドを取得します（初回呼び出し時に生成）。
+    
+    学習データのディレクトリごとに別のバックエンドを生成します。
+    
+    Args:
+        name: バックエンド名（省略時はデフォルトのバックエンド）
+        tier: 学習データの種類（'fast', 'standard', 'best'。省略時はDEFAULT_TESSDATA_TIER）
+        tessdata_dir: 学習データのディレクトリ（指定時はtierより優先）
+    
+    Returns:
+        OCRバックエンド
+    """
+    name = name or _default_backend_name
+    if tessdata_dir is None:
+        tessdata_dir = resolve_tessdata_dir(tier)
+    key = (name, tessdata_dir)
+    with _backends_lock:
+        if key not in _backends:
+            if name not in _BACKEND_FACTORIES:
+                raise ValueError(f"未知のOCRバックエンドです: {name}")
+            factory = _BACKEND_FACTORIES[name]
+            _backends[key] = factory(tessdata_dir=tessdata_dir) if tessdata_dir else factory()
+        return _backends[key]
+
+
+def get_default_backend_name() -> str:
+    """
+    デフォルトのバックエンド名を取得します。
+    
+    Returns:
+        バックエンド名
+    """
+    return _default_backend_name
+
+
+def set_default_backend(name: str) -> None:
+    """
+    デフォルトのバックエンドを切り替えます。
+    
+    Args:
+        name: バックエンド名
+    """
+    global _default_backend_name
+    if name not in _BACKEND_FACTORIES:
+        raise ValueError(f"未知のOCRバックエンドです: {name}")
+    _default_backend_name = name
@@ -0,0 +1,189 @@
+"""
+OCR結果キャッシュモジュール
+画像の画素データとOCRパラメータをキーに、OCR結果をメモリ上にキャッシュします。
+"""
+
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from config import OCR_CACHE_MAX_BYTES
+
+
+# キャッシュする結果（テキスト, OCRデータ, 平均信頼度）
+CachedResult = Tuple[str, Dict[str, List], float]
+
+
+def compute_image_hash(image: Image.Image) -> str:
+    """
+    画像の画素データからハッシュ値を計算します。
+    
+    ファイル形式やメタデータに関係なく、モード・サイズ・画素が同じ画像は同じ値になります。
+    
+    Args:
+        image: 入力画像
+    
+    Returns:
+        ハッシュ値（16進文字列）
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{image.mode}:{image.size[0]}x{image.size[1]}:".encode('utf-8'))
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def make_cache_key(image_hash: str, lang: str, psm_mode: str, oem_mode: str, **params: Any) -> str:
+    """
+    画像ハッシュとOCRパラメータからキャッシュキーを作成します。
+    
+    Args:
+        image_hash: 画像のハッシュ値
+        lang: 言語コード
+        psm_mode: Page Segmentation Mode
+        oem_mode: OCR Engine Mode
+        **params: 結果に影響するその他のパラメータ（前処理の設定など）
+    
+    Returns:
+        キャッシュキー
+    """
+    extra = ','.join(f"{name}={params[name]!r}" for name in sorted(params))
+    return f"{image_hash}|{lang}|{psm_mode}|{oem_mode}|{extra}"
+
+
+def copy_ocr_data(ocr_data: Dict[str, List]) -> Dict[str, List]:
+    """
+    OCRデータを列単位で複製します（キャッシュ内の値を呼び出し側から保護するため）。
+    
+    Args:
+        ocr_data: OCRデータ
+    
+    Returns:
+        複製されたOCRデータ
+    """
+    return {column: list(values) for column, values in ocr_data.items()}
+
+
+def estimate_result_size(result: CachedResult) -> int:
+    """
+    キャッシュする結果のおおよそのメモリ使用量を見積もります。
+    
+    Args:
+        result: (テキスト, OCRデータ, 平均信頼度)
+    
+    Returns:
+        見積もりサイズ（バイト）
+    """
+    text, ocr_data, _ = result
+    size = sys.getsizeof(text) + sys.getsizeof(ocr_data)
+    for column, values in ocr_data.items():
+        size += sys.getsizeof(column) + sys.getsizeof(values)
+        size += sum(sys.getsizeof(value) for value in values)
+    return size
+
+
+class OCRResultCache:
+    """
+    使用バイト数の上限を持つLRU方式のOCR結果キャッシュ
+    
+    上限を超えた場合は最も長く参照されていない結果から削除します。
+    複数スレッドから同時に利用できます。
+    """
+    
+    def __init__(self, max_bytes: int = OCR_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[CachedResult, int]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: str) -> Optional[CachedResult]:
+        """
+        キャッシュから結果を取得します。
+        
+        Args:
+            key: キャッシュキー
+        
+        Returns:
+            (テキスト, OCRデータ, 平均信頼度)、存在しない場合はNone
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        text, ocr_data, avg_confidence = entry[0]
+        return text, copy_ocr_data(ocr_data), avg_confidence
+    
+    def put(self, key: str, result: CachedResult) -> None:
+        """
+        結果をキャッシュに保存します。
+        
+        Args:
+            key: キャッシュキー
+            result: (テキスト, OCRデータ, 平均信頼度)
+        """
+        text, ocr_data, avg_confidence = result
+        result = (text, copy_ocr_data(ocr_data), avg_confidence)
+        size = estimate_result_size(result)
+        if size > self.max_bytes:
+            # 上限を超える結果は保存しない
+            return
+        
+        with self._lock:
+            old_entry = self._entries.pop(key, None)
+            if old_entry is not None:
+                self._total_bytes -= old_entry[1]
+            self._entries[key] = (result, size)
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+    
+    def clear(self) -> None:
+        """
+        キャッシュを空にし、統計情報をリセットします。
+        """
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        キャッシュの統計情報を取得します。
+        
+        Returns:
+            ヒット数、ミス数、件数、使用バイト数
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+            }
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# プロセス内で共有するデフォルトのキャッシュ
+_default_cache = OCRResultCache()
+
+
+def get_result_cache() -> OCRResultCache:
+    """
+    共有のOCR結果キャッシュを取得します。
+    
+    Returns:
+        OCR結果キャッシュ
+    """
+    return _default_cache
@@ -0,0 +1,225 @@
+"""
+Tesseract機能情報モジュール
+インストールされているTesseractの言語・バージョン・OEM・tessdataの場所を一度だけ調べてキャッシュします。
+"""
+
+import os
+import re
+import struct
+import subprocess
+import threading
+from typing import Any, Dict, List, Optional
+
+import pytesseract
+
+
+# --list-langsの出力からtessdataディレクトリを取り出す正規表現
+TESSDATA_DIR_PATTERN = re.compile(r'"(.+?)"')
+
+# --versionの出力からバージョンを取り出す正規表現
+VERSION_PATTERN = re.compile(r'tesseract\s+v?(\S+)', re.IGNORECASE)
+
+# traineddataの構成要素の番号（TessdataType）
+TESSDATA_INTTEMP = 3  # レガシーエンジンのテンプレート
+TESSDATA_LSTM = 17  # LSTMモデル
+
+
+def _run_tesseract_info(option: str) -> str:
+    """
+    tesseractを情報表示オプション付きで実行し、出力を返します。
+    """
+    try:
+        proc = subprocess.run(
+            [pytesseract.pytesseract.tesseract_cmd, option],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+    except OSError:
+        raise pytesseract.TesseractNotFoundError() from None
+    # tesseract 3.xは情報表示でも終了コード1を返す
+    if proc.returncode not in (0, 1):
+        raise pytesseract.TesseractNotFoundError()
+    return proc.stdout.decode('utf-8', errors='replace')
+
+
+def get_traineddata_oem_modes(path: str) -> List[str]:
+    """
+    traineddataに含まれる構成要素から、利用可能なOCR Engine Modeを判定します。
+    
+    Args:
+        path: traineddataファイルのパス
+    
+    Returns:
+        利用可能なOEMの一覧（'0' = レガシー, '1' = LSTM, '2' = 両方, '3' = 既定）
+    """
+    try:
+        with open(path, 'rb') as f:
+            # 先頭は構成要素数（int32）と各要素のオフセット（int64、無い要素は-1）
+            (count,) = struct.unpack('<i', f.read(4))
+            offsets = struct.unpack(f'<{count}q', f.read(8 * count))
+    except (OSError, struct.error):
+        return ['3']
+    
+    def has(component: int) -> bool:
+        return component < len(offsets) and offsets[component] != -1
+    
+    legacy, lstm = has(TESSDATA_INTTEMP), has(TESSDATA_LSTM)
+    modes = []
+    if legacy:
+        modes.append('0')
+    if lstm:
+        modes.append('1')
+    if legacy and lstm:
+        modes.append('2')
+    modes.append('3')
+    return modes
+
+
+def probe_capabilities() -> Dict[str, Any]:
+    """
+    tesseractを実行して機能情報を調べます。
+    
+    Returns:
+        機能情報
+            - languages: 利用可能な言語コードの一覧
+            - version: tesseractのバージョン
+            - tessdata_dir: tessdataディレクトリのパス（不明な場合はNone）
+            - oem_modes: 言語ごとの利用可能なOEMの一覧
+    """
+    version_output = _run_tesseract_info('--version')
+    version_match = VERSION_PATTERN.search(version_output)
+    
+    langs_output = _run_tesseract_info('--list-langs')
+    lines = langs_output.splitlines()
+    tessdata_dir = None
+    languages: List[str] = []
+    for index, line in enumerate(lines):
+        if line.startswith('List of available languages'):
+            dir_match = TESSDATA_DIR_PATTERN.search(line)
+            if dir_match:
+                tessdata_dir = os.path.normpath(dir_match.group(1))
+            languages = [
+                lang.strip() for lang in lines[index + 1:]
+                if pytesseract.pytesseract.LANG_PATTERN.match(lang.strip())
+            ]
+            break
+    
+    oem_modes = {
+        lang: get_traineddata_oem_modes(os.path.join(tessdata_dir, f'{lang}.traineddata'))
+        if tessdata_dir else ['3']
+        for lang in languages
+    }
+    
+    return {
+        'languages': languages,
+        'version': version_match.group(1) if version_match else '',
+        'tessdata_dir': tessdata_dir,
+        'oem_modes': oem_modes,
+    }
+
+
+def _get_mtime(path: Optional[str]) -> Optional[float]:
+    """
+    ディレクトリの更新日時を取得します（存在しない場合はNone）。
+    """
+    if not path:
+        return None
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+class CapabilityRegistry:
+    """
+    Tesseractの機能情報のキャッシュ
+    
+    初回参照時に調べた結果を保持し、tessdataディレクトリの更新日時が
+    変わった場合（言語データの追加・削除）のみ調べ直します。
+    """
+    
+    def __init__(self):
+        self._capabilities: Optional[Dict[str, Any]] = None
+        self._tessdata_mtime: Optional[float] = None
+        self._lock = threading.Lock()
+    
+    def get(self) -> Dict[str, Any]:
+        """
+        機能情報を取得します。
+        
+        Returns:
+            機能情報（probe_capabilitiesと同じ形式）
+        """
+        with self._lock:
+            if self._capabilities is not None:
+                if _get_mtime(self._capabilities['tessdata_dir']) == self._tessdata_mtime:
+                    return self._capabilities
+            capabilities = probe_capabilities()
+            self._capabilities = capabilities
+            self._tessdata_mtime = _get_mtime(capabilities['tessdata_dir'])
+            return capabilities
+    
+    def invalidate(self) -> None:
+        """
+        キャッシュを破棄し、次回参照時に調べ直させます。
+        """
+        with self._lock:
+            self._capabilities = None
+            self._tessdata_mtime = None
+
+
+# プロセス内で共有するレジストリ
+_registry = CapabilityRegistry()
+
+
+def get_capabilities() -> Dict[str, Any]:
+    """
+    Tesseractの機能情報を取得します（キャッシュ済みの場合はtesseractを実行しません）。
+    
+    Returns:
+        機能情報
+    """
+    return _registry.get()
+
+
+def get_available_languages(tessdata_dir: Optional[str] = None) -> List[str]:
+    """
+    利用可能な言語コードの一覧を取得します。
+    
+    Args:
+        tessdata_dir: 学習データのディレクトリ（省略時はtesseractの既定のディレクトリ）
+    
+    Returns:
+        言語コードの一覧
+    """
+    if tessdata_dir is None:
+        return get_capabilities()['languages']
+    return list_tessdata_languages(tessdata_dir)
+
+
+def list_tessdata_languages(tessdata_dir: str) -> List[str]:
+    """
+    学習データのディレクトリにある言語コード（*.traineddata）の一覧を取得します。
+    
+    Args:
+        tessdata_dir: 学習データのディレクトリ
+    
+    Returns:
+        言語コードの一覧（ディレクトリが読めない場合は空）
+    """
+    try:
+        names = os.listdir(tessdata_dir)
+    except OSError:
+        return []
+    suffix = '.traineddata'
+    return sorted(
+        name[:-len(suffix)] for name in names
+        if name.endswith(suffix) and pytesseract.pytesseract.LANG_PATTERN.match(name[:-len(suffix)])
+    )
+
+
+def invalidate_capabilities() -> None:
+    """
+    機能情報のキャッシュを破棄します。
+    """
+    _registry.invalidate()
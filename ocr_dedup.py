@@ -0,0 +1,378 @@
+"""
+近似重複検出モジュール
+知覚ハッシュ（dHash）とBK木で候補を絞り、縮小画像の照合で過去にOCRした画像とほぼ同じ画像を検索します。
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from config import (
+    NEAR_DUPLICATE_MAX_DISTANCE,
+    NEAR_DUPLICATE_MAX_BYTES,
+    NEAR_DUPLICATE_VERIFY_SIZE,
+    NEAR_DUPLICATE_MAX_PIXEL_DIFF,
+    NEAR_DUPLICATE_MAX_ASPECT_DIFF,
+)
+
+
+# dHashの一辺のサイズ（hash_size * hash_size ビット）
+DHASH_SIZE = 16
+
+# 座標として拡縮するOCRデータの列
+COORDINATE_COLUMNS = ('left', 'top', 'width', 'height')
+
+
+def compute_dhash(image: Image.Image, hash_size: int = DHASH_SIZE) -> int:
+    """
+    画像の差分ハッシュ（dHash）を計算します。
+    
+    縮小したグレースケール画像で横方向に隣接する画素の明暗を比較するため、
+    再圧縮や軽微なノイズ・解像度の違いではほとんど変化しません。
+    
+    Args:
+        image: 入力画像
+        hash_size: ハッシュの一辺のサイズ
+    
+    Returns:
+        hash_size * hash_size ビットの整数
+    """
+    small = image.convert('L').resize((hash_size + 1, hash_size), Image.Resampling.LANCZOS)
+    pixels = np.asarray(small, dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+def compute_thumbnail(image: Image.Image, size: int = NEAR_DUPLICATE_VERIFY_SIZE) -> np.ndarray:
+    """
+    候補の照合に使用する縮小画像（グレースケール、size * size）を作成します。
+    
+    Args:
+        image: 入力画像
+        size: 縮小画像の一辺
+    
+    Returns:
+        縮小画像の画素値（uint8）
+    """
+    return np.asarray(image.convert('L').resize((size, size), Image.Resampling.BOX), dtype=np.uint8)
+
+
+def images_match(
+    thumbnail: np.ndarray,
+    image_size: Tuple[int, int],
+    other_thumbnail: np.ndarray,
+    other_size: Tuple[int, int],
+    max_pixel_diff: int = NEAR_DUPLICATE_MAX_PIXEL_DIFF,
+    max_aspect_diff: float = NEAR_DUPLICATE_MAX_ASPECT_DIFF
+) -> bool:
+    """
+    縦横比と縮小画像を比較し、2つの画像が同じ内容かを判定します。
+    
+    レイアウトが同じで一部の文字だけが異なるページは知覚ハッシュでは区別できないため、
+    縮小画像の画素値の差の最大値で判定します（再圧縮やノイズによる差は小さい）。
+    
+    Args:
+        thumbnail: 画像の縮小画像（compute_thumbnail）
+        image_size: 画像サイズ (width, height)
+        other_thumbnail: 比較する画像の縮小画像
+        other_size: 比較する画像のサイズ (width, height)
+        max_pixel_diff: 許容する画素値の差の最大値
+        max_aspect_diff: 許容する縦横比の差（比率）
+    
+    Returns:
+        同じ内容とみなせる場合はTrue
+    """
+    if not all(image_size) or not all(other_size):
+        return False
+    aspect = image_size[0] / image_size[1]
+    other_aspect = other_size[0] / other_size[1]
+    if abs(aspect - other_aspect) > max_aspect_diff * max(aspect, other_aspect):
+        return False
+    if thumbnail.shape != other_thumbnail.shape:
+        return False
+    difference = np.abs(thumbnail.astype(np.int16) - other_thumbnail.astype(np.int16))
+    return int(difference.max(initial=0)) <= max_pixel_diff
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """
+    2つのハッシュのハミング距離を計算します。
+    """
+    return bin(a ^ b).count('1')
+
+
+class BKTree:
+    """
+    ハミング距離によるBK木
+    
+    三角不等式で枝を刈り、指定距離以内のハッシュを全件比較せずに検索します。
+    """
+    
+    def __init__(self):
+        # ノード: (ハッシュ, 値, {距離: 子ノード})
+        self._root: Optional[Tuple[int, Any, Dict[int, tuple]]] = None
+        self._size = 0
+    
+    def add(self, hash_value: int, value: Any) -> None:
+        """
+        ハッシュと値を追加します（同じハッシュが既にあれば値を置き換えます）。
+        
+        Args:
+            hash_value: 知覚ハッシュ
+            value: 関連付ける値
+        """
+        if self._root is None:
+            self._root = (hash_value, value, {})
+            self._size = 1
+            return
+        
+        node = self._root
+        parent, parent_distance = None, 0
+        while True:
+            distance = hamming_distance(hash_value, node[0])
+            if distance == 0:
+                replaced = (hash_value, value, node[2])
+                if parent is None:
+                    self._root = replaced
+                else:
+                    parent[2][parent_distance] = replaced
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = (hash_value, value, {})
+                self._size += 1
+                return
+            parent, parent_distance, node = node, distance, child
+    
+    def find(self, hash_value: int, max_distance: int) -> Optional[Tuple[int, Any]]:
+        """
+        指定距離以内で最も近いハッシュを検索します。
+        
+        Args:
+            hash_value: 知覚ハッシュ
+            max_distance: 許容するハミング距離
+        
+        Returns:
+            (距離, 値)、見つからない場合はNone
+        """
+        best: Optional[Tuple[int, Any]] = None
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = hamming_distance(hash_value, node[0])
+            if distance <= max_distance and (best is None or distance < best[0]):
+                best = (distance, node[1])
+                if distance == 0:
+                    break
+            for child_distance, child in node[2].items():
+                if abs(child_distance - distance) <= max_distance:
+                    stack.append(child)
+        return best
+    
+    def find_all(self, hash_value: int, max_distance: int) -> List[Tuple[int, Any]]:
+        """
+        指定距離以内のハッシュを全て検索します。
+        
+        Args:
+            hash_value: 知覚ハッシュ
+            max_distance: 許容するハミング距離
+        
+        Returns:
+            (距離, 値) のリスト（距離の近い順）
+        """
+        found: List[Tuple[int, Any]] = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = hamming_distance(hash_value, node[0])
+            if distance <= max_distance:
+                found.append((distance, node[1]))
+            for child_distance, child in node[2].items():
+                if abs(child_distance - distance) <= max_distance:
+                    stack.append(child)
+        found.sort(key=lambda item: item[0])
+        return found
+    
+    def __len__(self) -> int:
+        return self._size
+
+
+class NearDuplicateIndex:
+    """
+    OCRパラメータごとに知覚ハッシュのBK木を持つ近似重複インデックス
+    
+    値にはOCR結果キャッシュのキー・画像サイズ・照合用の縮小画像を保持し、結果自体はキャッシュ・ストアから取得します。
+    ハッシュの近い候補は縮小画像の照合（images_match）に通ったものだけを返します。
+    
+    - 縮小画像の合計がmax_bytesを超えた場合、最も長く参照されていない画像から削除します。
+    - 結果がキャッシュ・ストアから削除された画像は、検索で見つかった時点でremoveで削除します。
+    - BK木は削除に対応しないため、削除済みの画像が生きている画像より多くなった時点で木を作り直します。
+    """
+    
+    def __init__(self, max_distance: int = NEAR_DUPLICATE_MAX_DISTANCE, max_bytes: int = NEAR_DUPLICATE_MAX_BYTES):
+        self.max_distance = max_distance
+        self.max_bytes = max_bytes
+        # (OCRパラメータのキー, キャッシュキー) -> (ハッシュ, 画像サイズ, 縮小画像)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[int, Tuple[int, int], np.ndarray]]" = OrderedDict()
+        self._total_bytes = 0
+        self._trees: Dict[str, BKTree] = {}
+        # OCRパラメータのキーごとの、BK木に残っている削除済みの画像の数
+        self._stale: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    def add(
+        self,
+        params_key: str,
+        hash_value: int,
+        cache_key: str,
+        image_size: Tuple[int, int],
+        thumbnail: np.ndarray
+    ) -> None:
+        """
+        OCR済みの画像を登録します。
+        
+        Args:
+            params_key: OCRパラメータを表すキー
+            hash_value: 画像の知覚ハッシュ
+            cache_key: 結果のキャッシュキー
+            image_size: 画像サイズ (width, height)
+            thumbnail: 照合用の縮小画像（compute_thumbnail）
+        """
+        if thumbnail.nbytes > self.max_bytes:
+            return
+        
+        with self._lock:
+            self._discard((params_key, cache_key))
+            self._entries[(params_key, cache_key)] = (hash_value, tuple(image_size), thumbnail)
+            self._total_bytes += thumbnail.nbytes
+            self._trees.setdefault(params_key, BKTree()).add(hash_value, cache_key)
+            while self._total_bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+    
+    def find(
+        self,
+        params_key: str,
+        hash_value: int,
+        thumbnail: np.ndarray,
+        image_size: Tuple[int, int]
+    ) -> Optional[Tuple[str, Tuple[int, int]]]:
+        """
+        同じOCRパラメータで処理した近似重複画像を検索します。
+        
+        Args:
+            params_key: OCRパラメータを表すキー
+            hash_value: 画像の知覚ハッシュ
+            thumbnail: 画像の照合用の縮小画像（compute_thumbnail）
+            image_size: 画像サイズ (width, height)
+        
+        Returns:
+            見つかった画像の (キャッシュキー, 画像サイズ)（見つからない場合はNone）
+        """
+        with self._lock:
+            tree = self._trees.get(params_key)
+            found = tree.find_all(hash_value, self.max_distance) if tree is not None else []
+            candidates = [
+                (cache_key, self._entries[(params_key, cache_key)])
+                for _, cache_key in found if (params_key, cache_key) in self._entries
+            ]
+        for cache_key, (_, candidate_size, candidate_thumbnail) in candidates:
+            if images_match(thumbnail, image_size, candidate_thumbnail, candidate_size):
+                with self._lock:
+                    if (params_key, cache_key) in self._entries:
+                        self._entries.move_to_end((params_key, cache_key))
+                return cache_key, candidate_size
+        return None
+    
+    def remove(self, params_key: str, cache_key: str) -> None:
+        """
+        登録済みの画像を削除します（結果がキャッシュ・ストアから削除されていた場合など）。
+        
+        Args:
+            params_key: OCRパラメータを表すキー
+            cache_key: 結果のキャッシュキー
+        """
+        with self._lock:
+            self._discard((params_key, cache_key))
+    
+    def _discard(self, entry_key: Tuple[str, str]) -> None:
+        """
+        画像を削除し、必要ならBK木を作り直します（ロックを取得した状態で呼び出します）。
+        """
+        entry = self._entries.pop(entry_key, None)
+        if entry is None:
+            return
+        self._total_bytes -= entry[2].nbytes
+        
+        params_key = entry_key[0]
+        self._stale[params_key] = self._stale.get(params_key, 0) + 1
+        tree = self._trees.get(params_key)
+        if tree is not None and self._stale[params_key] * 2 > len(tree):
+            rebuilt = BKTree()
+            for (entry_params_key, cache_key), (hash_value, _, _) in self._entries.items():
+                if entry_params_key == params_key:
+                    rebuilt.add(hash_value, cache_key)
+            if len(rebuilt):
+                self._trees[params_key] = rebuilt
+            else:
+                del self._trees[params_key]
+            self._stale[params_key] = 0
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+    
+    def clear(self) -> None:
+        """
+        登録済みの画像を全て削除します。
+        """
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            self._trees.clear()
+            self._stale.clear()
+
+
+def scale_ocr_data(
+    ocr_data: Dict[str, List],
+    source_size: Tuple[int, int],
+    target_size: Tuple[int, int]
+) -> Dict[str, List]:
+    """
+    OCRデータの座標を別の画像サイズに合わせて拡縮します。
+    
+    Args:
+        ocr_data: OCRデータ
+        source_size: OCRデータの元画像のサイズ (width, height)
+        target_size: 合わせる画像のサイズ (width, height)
+    
+    Returns:
+        座標を拡縮したOCRデータ
+    """
+    if source_size == target_size or not source_size[0] or not source_size[1]:
+        return ocr_data
+    
+    scale_x = target_size[0] / source_size[0]
+    scale_y = target_size[1] / source_size[1]
+    scales = {'left': scale_x, 'width': scale_x, 'top': scale_y, 'height': scale_y}
+    scaled = dict(ocr_data)
+    for column in COORDINATE_COLUMNS:
+        if column in ocr_data:
+            scaled[column] = [int(round(value * scales[column])) for value in ocr_data[column]]
+    return scaled
+
+
+# プロセス内で共有するデフォルトのインデックス
+_default_index = NearDuplicateIndex()
+
+
+def get_near_duplicate_index() -> NearDuplicateIndex:
+    """
+    共有の近似重複インデックスを取得します。
+    
+    Returns:
+        近似重複インデックス
+    """
+    return _default_index
@@ -1,17 +1,22 @@
 """
 OCRエンジンモジュール
-pytesseractを使用したOCR処理とバウンディングボックスの描画機能を提供します。
+OCRバックエンド（pytesseract / libtesseract）を使用したOCR処理とバウンディングボックスの描画機能を提供します。
 """
 
-import pytesseract
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw, ImageFont, ImageSequence
 import cv2
 import numpy as np
-from typing import Dict, List, Tuple, Any
+import time
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union, Any
 
 from config import (
+    AUTO_LANGUAGE,
+    SCRIPT_LANGUAGES,
     DEFAULT_PSM_MODE,
     DEFAULT_OEM_MODE,
+    DEFAULT_TESSDATA_TIER,
+    OMP_MULTI_THREADS,
     BBOX_COLOR_HIGH_CONF,
     BBOX_COLOR_MEDIUM_CONF,
     BBOX_COLOR_LOW_CONF,
@@ -19,12 +24,47 @@ from config import (
     CONFIDENCE_THRESHOLD_HIGH,
     CONFIDENCE_THRESHOLD_MEDIUM,
 )
+from ocr_backend import (
+    OUTPUT_FORMAT_CONFIGS,
+    OCRBackend,
+    SubprocessBackend,
+    LibTesseractBackend,
+    build_tesseract_command,
+    encode_pnm,
+    get_backend,
+    get_image_dpi,
+    register_backend,
+    resolve_tessdata_dir,
+    run_in_cpu_executor,
+    run_tesseract_async,
+    set_default_backend,
+)
+from ocr_worker_pool import OCRWorkerPool, get_worker_pool, shutdown_worker_pool
+from ocr_parallel import (
+    get_ocr_data_tiled,
+    get_ocr_data_by_lines,
+    iter_ocr_data_tiled,
+    iter_ocr_data_by_lines,
+    empty_ocr_data,
+    shutdown_executor,
+)
+from ocr_cache import OCRResultCache, compute_image_hash, make_cache_key, get_result_cache
+from ocr_store import OCRResultStore, get_result_store, open_result_store
+from ocr_dedup import NearDuplicateIndex, compute_dhash, compute_thumbnail, get_near_duplicate_index, scale_ocr_data
+from ocr_result import OCRResult, parse_tsv
+from image_preprocessor import is_blank_page, normalize_resolution
+from ocr_orientation import auto_orient, detect_orientation, get_orientation_cache
+from ocr_language import detect_language, get_ocr_data_auto_language
+from ocr_refine import refine_low_confidence_words
+from ocr_regions import detect_text_regions, get_ocr_data_by_regions
+from ocr_threads import fixed_threads, get_cpu_budget, get_thread_mode, set_thread_mode
 
 
 def perform_ocr(
     image: Image.Image,
     lang: str = 'eng',
-    psm_mode: str = DEFAULT_PSM_MODE
+    psm_mode: str = DEFAULT_PSM_MODE,
+    tier: Optional[str] = None
 ) -> str:
     """
     画像からテキストを抽出します。
@@ -33,19 +73,20 @@ def perform_ocr(
         image: 入力画像
         lang: 言語コード（例: 'eng', 'jpn', 'eng+jpn'）
         psm_mode: Page Segmentation Mode
+        tier: 学習データの種類（'fast', 'standard', 'best'。省略時はDEFAULT_TESSDATA_TIER）
     
     Returns:
         抽出されたテキスト
     """
-    custom_config = f'--oem {DEFAULT_OEM_MODE} --psm {psm_mode}'
-    text = pytesseract.image_to_string(image, lang=lang, config=custom_config)
+    text = get_backend(tier=tier).image_to_string(image, lang, psm_mode)
     return text.strip()
 
 
 def get_ocr_data(
     image: Image.Image,
     lang: str = 'eng',
-    psm_mode: str = DEFAULT_PSM_MODE
+    psm_mode: str = DEFAULT_PSM_MODE,
+    tier: Optional[str] = None
 ) -> Dict[str, List]:
     """
     画像からOCRの詳細データを取得します。
@@ -54,20 +95,359 @@ def get_ocr_data(
         image: 入力画像
         lang: 言語コード
         psm_mode: Page Segmentation Mode
+        tier: 学習データの種類（'fast', 'standard', 'best'。省略時はDEFAULT_TESSDATA_TIER）
     
     Returns:
         OCRデータ（単語、座標、信頼度など）
     """
-    custom_config = f'--oem {DEFAULT_OEM_MODE} --psm {psm_mode}'
-    data = pytesseract.image_to_data(
-        image,
-        lang=lang,
-        config=custom_config,
-        output_type=pytesseract.Output.DICT
-    )
+    data = get_backend(tier=tier).image_to_data(image, lang, psm_mode)
     return data
 
 
+def get_ocr_result(
+    image: Image.Image,
+    lang: str = 'eng',
+    psm_mode: str = DEFAULT_PSM_MODE,
+    tier: Optional[str] = None
+) -> OCRResult:
+    """
+    画像から列指向のOCR結果を取得します。
+    
+    TSV出力をpytesseractを介さずに一括で型付き配列へ変換します。
+    
+    Args:
+        image: 入力画像
+        lang: 言語コード
+        psm_mode: Page Segmentation Mode
+        tier: 学習データの種類（'fast', 'standard', 'best'。省略時はDEFAULT_TESSDATA_TIER）
+    
+    Returns:
+        OCR結果
+    """
+    return parse_tsv(get_backend(tier=tier).image_to_tsv(image, lang, psm_mode))
+
+
+def run_ocr(
+    image: Image.Image,
+    lang: str = 'eng',
+    psm_mode: str = DEFAULT_PSM_MODE,
+    outputs: Iterable[str] = ("txt", "tsv"),
+    tier: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    1回の認識で複数形式のOCR結果を取得します。
+    
+    Args:
+        image: 入力画像
+        lang: 言語コード
+        psm_mode: Page Segmentation Mode
+        outputs: 出力形式の集合（'txt', 'tsv', 'hocr', 'pdf'）
+        tier: 学習データの種類（'fast', 'standard', 'best'。省略時はDEFAULT_TESSDATA_TIER）
+    
+    Returns:
+        形式ごとの結果
+        （txt: 抽出テキスト, tsv: OCRデータ, hocr: hOCR文字列, pdf: 検索可能PDFのバイト列）
+    """
+    requested = set(outputs)
+    unknown_formats = requested - set(OUTPUT_FORMAT_CONFIGS)
+    if unknown_formats:
+        raise ValueError(f"未対応の出力形式です: {', '.join(sorted(unknown_formats))}")
+    
+    # 出力順を固定してバックエンドに渡す
+    output_formats = [fmt for fmt in OUTPUT_FORMAT_CONFIGS if fmt in requested]
+    results = get_backend(tier=tier).image_to_outputs(image, lang, psm_mode, output_formats=output_formats)
+    if 'txt' in results:
+        results['txt'] = results['txt'].strip()
+    return results
+
+
+def _non_blank_indices(images: Sequence[Image.Image]) -> List[int]:
+    """
+    白紙でない画像の位置を取得します。
+    """
+    return [index for index, image in enumerate(images) if not is_blank_page(image)]
+
+
+def perform_ocr_batch(
+    images: Sequence[Image.Image],
+    lang: str = 'eng',
+    psm_mode: str = DEFAULT_PSM_MODE,
+    tier: Optional[str] = None,
+    skip_blank: bool = False
+) -> List[str]:
+    """
+    複数の画像からテキストを抽出します。
+    
+    サブプロセスバックエンドでは画像リストファイルを使い、
+    OCR_BATCH_SIZE枚ごとに1回のtesseract実行でまとめて処理します。
+    
+    Args:
+        images: 入力画像のリスト
+        lang: 言語コード
+        psm_mode: Page Segmentation Mode
+        tier: 学習データの種類（'fast', 'standard', 'best'。省略時はDEFAULT_TESSDATA_TIER）
+        skip_blank: 白紙ページをOCRせずに空文字列とするか
+    
+    Returns:
+        画像ごとの抽出テキスト
+    """
+    images = list(images)
+    indices = _non_blank_indices(images) if skip_blank else list(range(len(images)))
+    texts = [''] * len(images)
+    if indices:
+        recognized = get_backend(tier=tier).image_to_string_batch([images[i] for i in indices], lang, psm_mode)
+        for index, text in zip(indices, recognized):
+            texts[index] = text.strip()
+    return texts
+
+
+def get_ocr_data_batch(
+    images: Sequence[Image.Image],
+    lang: str = 'eng',
+    psm_mode: str = DEFAULT_PSM_MODE,
+    tier: Optional[str] = None,
+    skip_blank: bool = False
+) -> List[Dict[str, List]]:
+    """
+    複数の画像からOCRの詳細データを取得します。
+    
+    Args:
+        images: 入力画像のリスト
+        lang: 言語コード
+        psm_mode: Page Segmentation Mode
+        tier: 学習データの種類（'fast', 'standard', 'best'。省略時はDEFAULT_TESSDATA_TIER）
+        skip_blank: 白紙ページをOCRせずに空のOCRデータとするか
+    
+    Returns:
+        画像ごとのOCRデータ
+    """
+    images = list(images)
+    if not skip_blank:
+        return get_backend(tier=tier).image_to_data_batch(images, lang, psm_mode)
+    
+    indices = _non_blank_indices(images)
+    results = [empty_ocr_data() for _ in images]
+    if indices:
+        recognized = get_backend(tier=tier).image_to_data_batch([images[i] for i in indices], lang, psm_mode)
+        for index, data in zip(indices, recognized):
+            results[index] = data
+    return results
+
+
+def submit_ocr(
+    image: Image.Image,
+    lang: str = 'eng',
+    psm_mode: str = DEFAULT_PSM_MODE,
+    tier: Optional[str] = None
+) -> Future:
+    """
+    ワーカープールにテキスト抽出を投入します。
+    
+    Args:
+        image: 入力画像
+        lang: 言語コード（この言語のワーカーに振り分けられます）
+        psm_mode: Page Segmentation Mode
+        tier: 学習データの種類（'fast', 'standard', 'best'。省略時はDEFAULT_TESSDATA_TIER）
+    
+    Returns:
+        抽出テキストを返すFuture（結果は前後の空白を除去済み）
+    """
+    future = get_worker_pool().submit(
+        'image_to_string', image, lang, psm_mode, tessdata_dir=resolve_tessdata_dir(tier)
+    )
+    stripped: Future = Future()
+    stripped.set_running_or_notify_cancel()
+    
+    def on_done(inner: Future) -> None:
+        if inner.cancelled():
+            stripped.set_exception(CancelledError())
+            return
+        error = inner.exception()
+        if error is not None:
+            stripped.set_exception(error)
+        else:
+            stripped.set_result(inner.result().strip())
+    
+    future.add_done_callback(on_done)
+    return stripped
+
+
+def submit_ocr_data(
+    image: Image.Image,
+    lang: str = 'eng',
+    psm_mode: str = DEFAULT_PSM_MODE,
+    tier: Optional[str] = None
+) -> Future:
+    """
+    ワーカープールにOCRデータの取得を投入します。
+    
+    Args:
+        image: 入力画像
+        lang: 言語コード（この言語のワーカーに振り分けられます）
+        psm_mode: Page Segmentation Mode
+        tier: 学習データの種類（'fast', 'standard', 'best'。省略時はDEFAULT_TESSDATA_TIER）
+    
+    Returns:
+        OCRデータを返すFuture
+    """
+    return get_worker_pool().submit(
+        'image_to_data', image, lang, psm_mode, tessdata_dir=resolve_tessdata_dir(tier)
+    )
+
+
+def _calibration_image(line_count: int = 12) -> Image.Image:
+    """
+    スレッド配分の計測に使用する文章画像を生成します。
+    """
+    font = ImageFont.load_default(size=28)
+    image = Image.new('L', (1400, 60 + 48 * line_count), 255)
+    draw = ImageDraw.Draw(image)
+    for line in range(line_count):
+        draw.text((40, 30 + 48 * line), "The quick brown fox jumps over the lazy dog 0123456789", font=font, fill=0)
+    return image
+
+
+def calibrate_thread_mode(
+    image: Optional[Image.Image] = None,
+    lang: str = 'eng',
+    psm_mode: str = DEFAULT_PSM_MODE
+) -> str:
+    """
+    スレッド配分のモードを計測して選択します。
+    
+    OMP_MULTI_THREADS枚の画像について、単一スレッドのtesseractを同時に実行した場合と、
+    複数スレッドのtesseractを1つずつ実行した場合の所要時間を比較し、速い方を採用します。
+    並列OCR用のプロセスプールは次回の使用時に新しい配分で作り直されます。
+    
+    Args:
+        image: 計測に使用する画像（省略時は合成した文章画像）
+        lang: 言語コード
+        psm_mode: Page Segmentation Mode
+    
+    Returns:
+        選択されたモード（'single' または 'multi'）
+    """
+    threads = min(OMP_MULTI_THREADS, get_cpu_budget())
+    if threads <= 1:
+        # 1コアでは配分の違いが無い
+        set_thread_mode('single')
+        return get_thread_mode()
+    
+    sample = image if image is not None else _calibration_image()
+    backend = get_backend(SubprocessBackend.name)
+    
+    def recognize(thread_count: int) -> None:
+        with fixed_threads(thread_count):
+            backend.image_to_string(sample, lang, psm_mode)
+    
+    # 学習データの読み込みをファイルキャッシュに載せてから計測
+    recognize(1)
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(recognize, [1] * threads))
+    single_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for _ in range(threads):
+        recognize(threads)
+    multi_seconds = time.perf_counter() - start
+    
+    set_thread_mode('multi' if multi_seconds < single_seconds else 'single')
+    shutdown_executor(wait=False)
+    return get_thread_mode()
+
+
+def ocr_data_to_text(ocr_data: Dict[str, List]) -> str:
+    """
+    OCRデータからプレーンテキストを再構成します。
+    
+    image_to_stringと同じ規則で、単語を空白、行を改行、段落を空行、
+    ページを改ページ文字で区切ります。
+    
+    Args:
+        ocr_data: OCRデータ
+    
+    Returns:
+        再構成されたテキスト
+    """
+    # ページ -> 段落 -> 行 -> 単語 の順に出現順を保ったまま集約
+    pages: Dict[Any, Dict[Tuple, Dict[Any, List[str]]]] = {}
+    
+    for i in range(len(ocr_data.get('text', []))):
+        # 単語レベル（level 5）の行のみを対象とする
+        if int(ocr_data['level'][i]) != 5:
+            continue
+        
+        word = ocr_data['text'][i].strip()
+        if not word:
+            continue
+        
+        page = pages.setdefault(ocr_data['page_num'][i], {})
+        paragraph = page.setdefault(
+            (ocr_data['block_num'][i], ocr_data['par_num'][i]), {}
+        )
+        paragraph.setdefault(ocr_data['line_num'][i], []).append(word)
+    
+    page_texts = [
+        '\n\n'.join(
+            '\n'.join(' '.join(words) for words in paragraph.values())
+            for paragraph in page.values()
+        )
+        for page in pages.values()
+    ]
+    return '\f'.join(page_texts).strip()
+
+
+def stream_ocr(
+    image: Image.Image,
+    lang: str = 'eng',
+    psm_mode: str = DEFAULT_PSM_MODE,
+    tiled: bool = False,
+    line_parallel: bool = True,
+    tier: Optional[str] = None,
+    skip_blank: bool = False
+) -> Iterator[Dict[str, Any]]:
+    """
+    OCR結果を認識できた部分から順に返します（逐次表示用）。
+    
+    複数ページの画像（TIFFなど）はページごと、line_parallelでは行ごと、
+    tiledではタイルの列ごとに結果を返します。line_parallelでレイアウト解析ができない場合
+    （libtesseractが無い環境）は、行の代わりにタイルの列ごとに返します。
+    
+    Args:
+        image: 入力画像
+        lang: 言語コード
+        psm_mode: Page Segmentation Mode
+        tiled: タイル単位で返すか
+        line_parallel: 行単位で返すか（tiledが優先）
+        tier: 学習データの種類（'fast', 'standard', 'best'。省略時はDEFAULT_TESSDATA_TIER）
+        skip_blank: 白紙ページをOCRせずにスキップするか
+    
+    Yields:
+        {'page': ページ番号（1から）, 'text': 部分のテキスト, 'ocr_data': 部分の単語のOCRデータ,
+         'skipped': 白紙ページとしてスキップしたか（スキップしたページは空の結果を1回だけ返す）}
+    """
+    for page_num, page in enumerate(ImageSequence.Iterator(image), start=1):
+        if skip_blank and is_blank_page(page):
+            yield {'page': page_num, 'text': '', 'ocr_data': empty_ocr_data(), 'skipped': True}
+            continue
+        
+        if lang == AUTO_LANGUAGE:
+            chunks = iter([get_ocr_data_auto_language(page, psm_mode, tier=tier)])
+        elif tiled:
+            chunks = iter_ocr_data_tiled(page, lang, psm_mode, tier=tier)
+        elif line_parallel:
+            chunks = iter_ocr_data_by_lines(page, lang, psm_mode, tier=tier)
+        else:
+            chunks = iter([get_ocr_result(page, lang, psm_mode, tier).to_dict()])
+        
+        for ocr_data in chunks:
+            text = ocr_data_to_text(ocr_data)
+            if text:
+                yield {'page': page_num, 'text': text, 'ocr_data': ocr_data, 'skipped': False}
+
+
 def get_bbox_color(confidence: float) -> Tuple[int, int, int]:
     """
     信頼度に基づいてバウンディングボックスの色を決定します。
@@ -88,7 +468,7 @@ def get_bbox_color(confidence: float) -> Tuple[int, int, int]:
 
 def draw_bounding_boxes(
     image: Image.Image,
-    ocr_data: Dict[str, List],
+    ocr_data: Union[OCRResult, Dict[str, List]],
     show_confidence: bool = True
 ) -> Image.Image:
     """
@@ -96,7 +476,7 @@ def draw_bounding_boxes(
     
     Args:
         image: 入力画像
-        ocr_data: OCRデータ
+        ocr_data: OCR結果またはOCRデータ
         show_confidence: 信頼度を表示するか
     
     Returns:
@@ -106,20 +486,16 @@ def draw_bounding_boxes(
     cv2_image = np.array(image.convert('RGB'))
     cv2_image = cv2_image[:, :, ::-1].copy()  # RGBからBGRに変換
     
-    n_boxes = len(ocr_data['text'])
+    # 空のテキストや信頼度が-1のものを除外
+    words = OCRResult.from_data(ocr_data).words()
     
-    for i in range(n_boxes):
-        # 空のテキストや信頼度が-1のものはスキップ
-        if not ocr_data['text'][i].strip() or int(ocr_data['conf'][i]) == -1:
-            continue
-        
-        # バウンディングボックスの座標を取得
-        x = ocr_data['left'][i]
-        y = ocr_data['top'][i]
-        w = ocr_data['width'][i]
-        h = ocr_data['height'][i]
-        conf = float(ocr_data['conf'][i])
-        
+    for x, y, w, h, conf in zip(
+        words['left'].tolist(),
+        words['top'].tolist(),
+        words['width'].tolist(),
+        words['height'].tolist(),
+        words['conf'].tolist()
+    ):
         # 信頼度に基づいて色を決定
         color = get_bbox_color(conf)
         
@@ -167,38 +543,346 @@ def draw_bounding_boxes(
     return result_image
 
 
+def _lookup_cached_result(cache_key: str) -> Optional[Tuple[str, Dict[str, List], float]]:
+    """
+    メモリキャッシュ、永続ストアの順にOCR結果を検索します。
+    """
+    cached = get_result_cache().get(cache_key)
+    store = get_result_store()
+    if cached is None and store is not None:
+        # 再起動前や他のプロセスが保存した結果を参照
+        cached = store.get(cache_key)
+        if cached is not None:
+            get_result_cache().put(cache_key, cached)
+    return cached
+
+
+def _save_cached_result(cache_key: str, cached: Tuple[str, Dict[str, List], float]) -> None:
+    """
+    OCR結果をメモリキャッシュと永続ストアに保存します。
+    """
+    get_result_cache().put(cache_key, cached)
+    store = get_result_store()
+    if store is not None:
+        store.put(cache_key, cached)
+
+
+def _result_cache_params(
+    cache_params: Optional[Dict[str, Any]],
+    single_pass: bool = True,
+    tiled: bool = False,
+    line_parallel: bool = False,
+    normalize_scale: bool = False,
+    tier: Optional[str] = None,
+    refine: bool = False,
+    text_regions: bool = False
+) -> Dict[str, Any]:
+    """
+    キャッシュキーに含める、結果に影響するパラメータをまとめます。
+    """
+    return dict(
+        single_pass=single_pass, tiled=tiled, line_parallel=line_parallel,
+        normalize_scale=normalize_scale, tier=tier or DEFAULT_TESSDATA_TIER, refine=refine,
+        text_regions=text_regions, **(cache_params or {})
+    )
+
+
+def _with_status(result: Tuple, skipped: bool, tier: Optional[str], return_status: bool) -> Tuple:
+    """
+    return_status指定時に、OCR結果の末尾へ処理の状態を加えます。
+    
+    状態は {'skipped': 白紙ページとしてスキップしたか, 'tier': 使用した学習データの種類} です。
+    """
+    if not return_status:
+        return result
+    return (*result, {'skipped': skipped, 'tier': tier or DEFAULT_TESSDATA_TIER})
+
+
 def process_image_with_ocr(
     image: Image.Image,
     lang: str = 'eng',
     psm_mode: str = DEFAULT_PSM_MODE,
-    show_confidence: bool = True
-) -> Tuple[Image.Image, str, Dict[str, List], float]:
+    show_confidence: bool = True,
+    single_pass: bool = True,
+    tiled: bool = False,
+    line_parallel: bool = False,
+    use_cache: bool = True,
+    cache_params: Optional[Dict[str, Any]] = None,
+    near_duplicate: bool = False,
+    normalize_scale: bool = False,
+    auto_rotate: bool = False,
+    document_id: Optional[str] = None,
+    tier: Optional[str] = None,
+    refine: bool = False,
+    skip_blank: bool = False,
+    text_regions: bool = False,
+    return_status: bool = False
+) -> Union[Tuple[Image.Image, str, Dict[str, List], float], Tuple[Image.Image, str, Dict[str, List], float, Dict[str, Any]]]:
     """
     画像に対してOCR処理を実行し、バウンディングボックス付きの画像を生成します。
     
     Args:
         image: 入力画像
-        lang: 言語コード
+        lang: 言語コード（'auto' で文字種に応じて英語・日本語を振り分け）
         psm_mode: Page Segmentation Mode
         show_confidence: 信頼度を表示するか
+        single_pass: OCRデータからテキストを再構成し、Tesseractの実行を1回にするか
+        tiled: 大きな画像をタイルに分割して並列にOCRするか（テキストは常に再構成）
+        line_parallel: レイアウト解析後に行単位で並列にOCRするか（テキストは常に再構成）
+        use_cache: OCR結果キャッシュ（メモリ・永続ストア）を使用するか
+        cache_params: キャッシュキーに含めるその他のパラメータ（前処理の設定など）
+        near_duplicate: 知覚ハッシュで近似重複画像を検索し、その結果を再利用するか（use_cache時のみ）
+        normalize_scale: 文字の高さが目標値になるよう拡縮してからOCRするか（座標は元画像に戻します）
+        auto_rotate: OSDでページの向きを検出し、正立させてからOCRするか
+            （バウンディングボックス付き画像・座標は正立後の画像が基準）
+        document_id: 文書（スキャンジョブ）の識別子。同じ文書の2ページ目以降は向きの検出を省略
+        tier: 学習データの種類（'fast': 高速, 'standard': 標準, 'best': 高精度）
+        refine: 信頼度の低い単語だけを別の前処理で再認識し、信頼度の高い読みを採用するか
+            （テキストは常に再構成）
+        skip_blank: 白紙ページ（区切り用紙や裏面など）はOCRせずに空の結果を返すか
+        text_regions: 文字領域を検出し、その範囲だけをOCRするか（写真など文字が一部にある画像向け。
+            テキストは常に再構成）
+        return_status: 処理の状態（スキップしたか・使用した学習データの種類）を戻り値の末尾に加えるか
     
     Returns:
         (バウンディングボックス付き画像, 抽出テキスト, OCRデータ, 平均信頼度)
+        return_status=Trueの場合は末尾に状態 {'skipped': bool, 'tier': str} を加えた5要素
     """
+    # 白紙ページはTesseractを実行しない
+    if skip_blank and is_blank_page(image):
+        skipped = (draw_bounding_boxes(image, empty_ocr_data(), show_confidence), '', empty_ocr_data(), 0.0)
+        return _with_status(skipped, True, tier, return_status)
+    
+    # 向きを補正した画像を以降の処理の基準にする
+    if auto_rotate:
+        image, _ = auto_orient(image, document_id)
+    
+    cache_key = None
+    image_dhash = None
+    if use_cache:
+        params = _result_cache_params(
+            cache_params, single_pass, tiled, line_parallel, normalize_scale, tier, refine, text_regions
+        )
+        cache_key = make_cache_key(compute_image_hash(image), lang, psm_mode, DEFAULT_OEM_MODE, **params)
+        params_key = make_cache_key('', lang, psm_mode, DEFAULT_OEM_MODE, **params)
+        cached = _lookup_cached_result(cache_key)
+        if cached is None and near_duplicate:
+            # 再スキャン・再圧縮された同じ文書の結果を再利用
+            image_dhash = compute_dhash(image)
+            image_thumbnail = compute_thumbnail(image)
+            found = get_near_duplicate_index().find(params_key, image_dhash, image_thumbnail, image.size)
+            if found is not None:
+                duplicate_key, duplicate_size = found
+                cached = _lookup_cached_result(duplicate_key)
+                if cached is None:
+                    # 結果がキャッシュ・ストアから削除されていれば、インデックスからも削除
+                    get_near_duplicate_index().remove(params_key, duplicate_key)
+                else:
+                    text, ocr_data, avg_confidence = cached
+                    cached = (text, scale_ocr_data(ocr_data, duplicate_size, image.size), avg_confidence)
+        if cached is not None:
+            text, ocr_data, avg_confidence = cached
+            bbox_image = draw_bounding_boxes(image, ocr_data, show_confidence)
+            return _with_status((bbox_image, text, ocr_data, avg_confidence), False, tier, return_status)
+    
+    # 文字の大きさに合わせて拡縮した画像でOCRする
+    ocr_image = image
+    if normalize_scale:
+        ocr_image, _ = normalize_resolution(image)
+    
     # OCRデータを取得
-    ocr_data = get_ocr_data(image, lang, psm_mode)
+    result = None
+    auto_language = lang == AUTO_LANGUAGE
+    if auto_language:
+        # 文字種で振り分けるため、テキストは常に再構成
+        ocr_data = get_ocr_data_auto_language(ocr_image, psm_mode, tier=tier)
+    elif tiled:
+        ocr_data = get_ocr_data_tiled(ocr_image, lang, psm_mode, tier=tier)
+    elif line_parallel:
+        ocr_data = get_ocr_data_by_lines(ocr_image, lang, psm_mode, tier=tier)
+    elif text_regions:
+        ocr_data = get_ocr_data_by_regions(ocr_image, lang, psm_mode, tier=tier)
+    else:
+        result = get_ocr_result(ocr_image, lang, psm_mode, tier)
+        ocr_data = result.to_dict()
+    
+    # 信頼度の低い単語だけを切り出して再認識
+    if refine:
+        # 自動判定時は振り分け先の全言語で認識
+        refine_lang = '+'.join(sorted(set(SCRIPT_LANGUAGES.values()))) if auto_language else lang
+        ocr_data, replaced = refine_low_confidence_words(ocr_image, ocr_data, refine_lang, tier=tier)
+        if replaced:
+            result = None
     
     # テキストを抽出
-    text = perform_ocr(image, lang, psm_mode)
+    if single_pass or tiled or line_parallel or auto_language or refine or text_regions:
+        # 取得済みのOCRデータから再構成（2回目の認識を省略）
+        text = ocr_data_to_text(ocr_data)
+    else:
+        text = perform_ocr(ocr_image, lang, psm_mode, tier)
+    
+    # 座標を元画像に戻す
+    if ocr_image.size != image.size:
+        ocr_data = scale_ocr_data(ocr_data, ocr_image.size, image.size)
+        result = None
+    
+    # 列指向に変換し、描画と信頼度の集計で共有する
+    if result is None:
+        result = OCRResult.from_dict(ocr_data)
     
     # バウンディングボックスを描画
-    bbox_image = draw_bounding_boxes(image, ocr_data, show_confidence)
+    bbox_image = draw_bounding_boxes(image, result, show_confidence)
     
     # 平均信頼度を計算
-    confidences = [
-        float(conf) for conf, txt in zip(ocr_data['conf'], ocr_data['text'])
-        if txt.strip() and int(conf) != -1
-    ]
-    avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+    avg_confidence = result.average_confidence()
+    
+    if cache_key is not None:
+        _save_cached_result(cache_key, (text, ocr_data, avg_confidence))
+        if image_dhash is not None:
+            get_near_duplicate_index().add(params_key, image_dhash, cache_key, image.size, image_thumbnail)
+    
+    return _with_status((bbox_image, text, ocr_data, avg_confidence), False, tier, return_status)
+
+
+def _async_command(image: Image.Image, lang: str, psm_mode: str, output_format: str, tier: Optional[str]) -> List[str]:
+    """
+    非同期APIで実行するtesseractコマンドを作成します（画像は標準入力から渡します）。
+    """
+    if lang == AUTO_LANGUAGE:
+        raise ValueError("非同期APIは言語の自動判定に対応していません")
+    return build_tesseract_command(
+        'stdin', 'stdout', lang, psm_mode, DEFAULT_OEM_MODE, (output_format,), get_image_dpi(image),
+        tessdata_dir=resolve_tessdata_dir(tier)
+    )
+
+
+async def async_perform_ocr(
+    image: Image.Image,
+    lang: str = 'eng',
+    psm_mode: str = DEFAULT_PSM_MODE,
+    tier: Optional[str] = None
+) -> str:
+    """
+    画像からテキストを抽出します（非同期版）。
+    
+    設定されたバックエンドに関係なく、tesseractコマンドを非同期サブプロセスとして実行します。
+    画像のエンコードなどのCPU処理はイベントループの外で実行し、
+    タスクがキャンセルされた場合はtesseractのプロセスも終了させます。
+    
+    Args:
+        image: 入力画像
+        lang: 言語コード（例: 'eng', 'jpn', 'eng+jpn'）
+        psm_mode: Page Segmentation Mode
+        tier: 学習データの種類（'fast', 'standard', 'best'。省略時はDEFAULT_TESSDATA_TIER）
+    
+    Returns:
+        抽出されたテキスト
+    """
+    command = _async_command(image, lang, psm_mode, 'txt', tier)
+    output = await run_tesseract_async(command, await run_in_cpu_executor(encode_pnm, image))
+    return output.decode('utf-8').strip()
+
+
+async def async_get_ocr_result(
+    image: Image.Image,
+    lang: str = 'eng',
+    psm_mode: str = DEFAULT_PSM_MODE,
+    tier: Optional[str] = None
+) -> OCRResult:
+    """
+    画像から列指向のOCR結果を取得します（非同期版）。
+    
+    Args:
+        image: 入力画像
+        lang: 言語コード
+        psm_mode: Page Segmentation Mode
+        tier: 学習データの種類（'fast', 'standard', 'best'。省略時はDEFAULT_TESSDATA_TIER）
+    
+    Returns:
+        OCR結果
+    """
+    command = _async_command(image, lang, psm_mode, 'tsv', tier)
+    output = await run_tesseract_async(command, await run_in_cpu_executor(encode_pnm, image))
+    return await run_in_cpu_executor(parse_tsv, output.decode('utf-8'))
+
+
+async def async_get_ocr_data(
+    image: Image.Image,
+    lang: str = 'eng',
+    psm_mode: str = DEFAULT_PSM_MODE,
+    tier: Optional[str] = None
+) -> Dict[str, List]:
+    """
+    画像からOCRの詳細データを取得します（非同期版）。
+    
+    Args:
+        image: 入力画像
+        lang: 言語コード
+        psm_mode: Page Segmentation Mode
+        tier: 学習データの種類（'fast', 'standard', 'best'。省略時はDEFAULT_TESSDATA_TIER）
+    
+    Returns:
+        OCRデータ（単語、座標、信頼度など）
+    """
+    result = await async_get_ocr_result(image, lang, psm_mode, tier)
+    return result.to_dict()
+
+
+async def async_process_image_with_ocr(
+    image: Image.Image,
+    lang: str = 'eng',
+    psm_mode: str = DEFAULT_PSM_MODE,
+    show_confidence: bool = True,
+    use_cache: bool = True,
+    cache_params: Optional[Dict[str, Any]] = None,
+    tier: Optional[str] = None,
+    skip_blank: bool = False,
+    return_status: bool = False
+) -> Union[Tuple[Image.Image, str, Dict[str, List], float], Tuple[Image.Image, str, Dict[str, List], float, Dict[str, Any]]]:
+    """
+    画像に対してOCR処理を実行し、バウンディングボックス付きの画像を生成します（非同期版）。
+    
+    1回のtesseract実行で得たOCRデータからテキストを再構成します（process_image_with_ocrの既定の処理）。
+    OCR結果キャッシュはprocess_image_with_ocrと共有します。白紙判定・画像のハッシュ・
+    キャッシュの参照・描画などのCPU処理やI/Oはイベントループの外で実行します。
+    
+    Args:
+        image: 入力画像
+        lang: 言語コード
+        psm_mode: Page Segmentation Mode
+        show_confidence: 信頼度を表示するか
+        use_cache: OCR結果キャッシュ（メモリ・永続ストア）を使用するか
+        cache_params: キャッシュキーに含めるその他のパラメータ（前処理の設定など）
+        tier: 学習データの種類（'fast': 高速, 'standard': 標準, 'best': 高精度）
+        skip_blank: 白紙ページはOCRせずに空の結果を返すか
+        return_status: 処理の状態（スキップしたか・使用した学習データの種類）を戻り値の末尾に加えるか
+    
+    Returns:
+        (バウンディングボックス付き画像, 抽出テキスト, OCRデータ, 平均信頼度)
+        return_status=Trueの場合は末尾に状態 {'skipped': bool, 'tier': str} を加えた5要素
+    """
+    if skip_blank and await run_in_cpu_executor(is_blank_page, image):
+        bbox_image = await run_in_cpu_executor(draw_bounding_boxes, image, empty_ocr_data(), show_confidence)
+        return _with_status((bbox_image, '', empty_ocr_data(), 0.0), True, tier, return_status)
+    
+    cache_key = None
+    if use_cache:
+        params = _result_cache_params(cache_params, tier=tier)
+        image_hash = await run_in_cpu_executor(compute_image_hash, image)
+        cache_key = make_cache_key(image_hash, lang, psm_mode, DEFAULT_OEM_MODE, **params)
+        cached = await run_in_cpu_executor(_lookup_cached_result, cache_key)
+        if cached is not None:
+            text, ocr_data, avg_confidence = cached
+            bbox_image = await run_in_cpu_executor(draw_bounding_boxes, image, ocr_data, show_confidence)
+            return _with_status((bbox_image, text, ocr_data, avg_confidence), False, tier, return_status)
+    
+    result = await async_get_ocr_result(image, lang, psm_mode, tier)
+    ocr_data = result.to_dict()
+    text = ocr_data_to_text(ocr_data)
+    bbox_image = await run_in_cpu_executor(draw_bounding_boxes, image, result, show_confidence)
+    avg_confidence = result.average_confidence()
+    
+    if cache_key is not None:
+        await run_in_cpu_executor(_save_cached_result, cache_key, (text, ocr_data, avg_confidence))
     
-    return bbox_image, text, ocr_data, avg_confidence
+    return _with_status((bbox_image, text, ocr_data, avg_confidence), False, tier, return_status)
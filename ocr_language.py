@@ -0,0 +1,105 @@
+"""
+言語振り分けモジュール
+ページやテキストブロックの文字種を判定し、英語・日本語の単一言語モデルで認識します。
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from config import (
+    DEFAULT_PSM_MODE,
+    AUTO_LANGUAGE_DEFAULT,
+    SCRIPT_LANGUAGES,
+    AUTO_LANGUAGE_BLOCK_PSM_MODE,
+    AUTO_LANGUAGE_MIN_OSD_LINES,
+    OSD_MIN_CONFIDENCE,
+)
+from ocr_backend import get_backend
+from ocr_orientation import detect_orientation
+from ocr_parallel import analyse_layout, merge_offset_results
+
+
+def detect_language(image: Image.Image, default: Optional[str] = None) -> Optional[str]:
+    """
+    OSDの文字種判定から認識に使用する言語を決定します。
+    
+    Args:
+        image: 入力画像
+        default: 判定できない場合の言語
+    
+    Returns:
+        言語コード（判定できない場合はdefault）
+    """
+    try:
+        osd = detect_orientation(image)
+    except (RuntimeError, OSError, ValueError):
+        return default
+    if osd['script_conf'] < OSD_MIN_CONFIDENCE:
+        return default
+    return SCRIPT_LANGUAGES.get(osd['script'], default)
+
+
+def _group_blocks(lines: List[Dict[str, int]]) -> List[Tuple[int, Tuple[int, int, int, int], int]]:
+    """
+    行の情報をブロックごとにまとめます。
+    
+    Returns:
+        (ブロック番号, 矩形 (left, top, right, bottom), 行数) のリスト（出現順）
+    """
+    blocks: Dict[int, List[int]] = {}
+    counts: Dict[int, int] = {}
+    for line in lines:
+        box = [line['left'], line['top'], line['left'] + line['width'], line['top'] + line['height']]
+        block = blocks.setdefault(line['block_num'], box)
+        block[:] = [min(block[0], box[0]), min(block[1], box[1]), max(block[2], box[2]), max(block[3], box[3])]
+        counts[line['block_num']] = counts.get(line['block_num'], 0) + 1
+    return [(block_num, tuple(box), counts[block_num]) for block_num, box in blocks.items()]
+
+
+def get_ocr_data_auto_language(
+    image: Image.Image,
+    psm_mode: str = DEFAULT_PSM_MODE,
+    block_psm_mode: str = AUTO_LANGUAGE_BLOCK_PSM_MODE,
+    tier: Optional[str] = None
+) -> Dict[str, List]:
+    """
+    文字種に応じて英語・日本語を振り分けてOCRデータを取得します。
+    
+    レイアウト解析が使える場合はテキストブロックごとに文字種を判定し、
+    同じ言語のブロックをまとめて1回のバッチで認識します。
+    使えない場合はページ全体の文字種で言語を決めます。
+    
+    Args:
+        image: 入力画像
+        psm_mode: レイアウト解析（またはページ全体の認識）に使用するPSMモード
+        block_psm_mode: ブロック画像の認識に使用するPSMモード
+        tier: 学習データの種類
+    
+    Returns:
+        OCRデータ（ブロック番号はブロックの出現順）
+    """
+    page_language = detect_language(image, AUTO_LANGUAGE_DEFAULT)
+    backend = get_backend(tier=tier)
+    lines = analyse_layout(image, page_language, psm_mode, tier)
+    if not lines:
+        return backend.image_to_data(image, page_language, psm_mode)
+    
+    blocks = _group_blocks(lines)
+    
+    # ブロックごとに言語を決め、言語ごとにまとめる
+    groups: Dict[str, List[int]] = {}
+    for index, (_, box, line_count) in enumerate(blocks):
+        language = page_language
+        if line_count >= AUTO_LANGUAGE_MIN_OSD_LINES:
+            language = detect_language(image.crop(box), page_language)
+        groups.setdefault(language, []).append(index)
+    
+    block_results: List[Optional[Dict[str, List]]] = [None] * len(blocks)
+    for language, indices in groups.items():
+        crops = [image.crop(blocks[index][1]) for index in indices]
+        for index, data in zip(indices, backend.image_to_data_batch(crops, language, block_psm_mode)):
+            block_results[index] = data
+    
+    # ページ座標に変換し、ブロックの出現順に結合
+    return merge_offset_results([box for _, box, _ in blocks], block_results, image.size)
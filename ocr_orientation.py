@@ -0,0 +1,152 @@
+"""
+向き検出モジュール
+TesseractのOSD（PSM 0）でページの向きを検出し、認識前に正立させます。
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from PIL import Image
+
+from config import OSD_IMAGE_SIZE, OSD_MIN_CONFIDENCE, OSD_CACHE_SIZE
+from ocr_backend import SubprocessBackend, get_backend
+
+
+def detect_orientation(image: Image.Image, max_size: int = OSD_IMAGE_SIZE) -> Dict[str, Any]:
+    """
+    縮小した画像でページの向きと文字種を検出します。
+    
+    デフォルトのバックエンドが対応していない場合はtesseractコマンドで検出します。
+    
+    Args:
+        image: 入力画像
+        max_size: 検出に使用する画像の長辺の上限（ピクセル）
+    
+    Returns:
+        検出結果（orientation, rotate, orientation_conf, script, script_conf）
+    """
+    scale = min(1.0, max_size / max(image.size))
+    if scale < 1.0:
+        small = image.resize(
+            (max(int(image.width * scale), 1), max(int(image.height * scale), 1)),
+            Image.Resampling.LANCZOS
+        )
+    else:
+        small = image
+    
+    try:
+        return get_backend().detect_orientation(small)
+    except NotImplementedError:
+        return get_backend(SubprocessBackend.name).detect_orientation(small)
+
+
+def rotate_upright(image: Image.Image, rotate: int) -> Image.Image:
+    """
+    OSDの検出結果に従って画像を正立させます。
+    
+    Args:
+        image: 入力画像
+        rotate: 時計回りに回転する角度（度, 0 / 90 / 180 / 270）
+    
+    Returns:
+        回転後の画像
+    """
+    rotate %= 360
+    if rotate == 0:
+        return image
+    # PILのrotateは反時計回り
+    return image.rotate(-rotate, expand=True)
+
+
+class OrientationCache:
+    """
+    文書（スキャンジョブ）ごとに検出した向きを保持するキャッシュ
+    
+    同じ文書の2ページ目以降は検出を省略し、1ページ目の向きを使用します。
+    """
+    
+    def __init__(self, max_entries: int = OSD_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, document_id: str) -> Optional[int]:
+        """
+        文書の回転角度を取得します（未登録の場合はNone）。
+        """
+        with self._lock:
+            rotate = self._entries.get(document_id)
+            if rotate is not None:
+                self._entries.move_to_end(document_id)
+            return rotate
+    
+    def put(self, document_id: str, rotate: int) -> None:
+        """
+        文書の回転角度を登録します。
+        """
+        with self._lock:
+            self._entries[document_id] = rotate
+            self._entries.move_to_end(document_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """
+        登録済みの回転角度を全て削除します。
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+# プロセス内で共有するキャッシュ
+_orientation_cache = OrientationCache()
+
+
+def get_orientation_cache() -> OrientationCache:
+    """
+    共有の向きキャッシュを取得します。
+    
+    Returns:
+        向きキャッシュ
+    """
+    return _orientation_cache
+
+
+def auto_orient(
+    image: Image.Image,
+    document_id: Optional[str] = None,
+    min_confidence: float = OSD_MIN_CONFIDENCE
+) -> Tuple[Image.Image, int]:
+    """
+    ページの向きを検出し、正立させた画像を返します。
+    
+    document_idを指定すると、同じ文書で検出済みの向きを再利用します。
+    信頼度がmin_confidence未満の場合や検出に失敗した場合は回転しません。
+    
+    Args:
+        image: 入力画像
+        document_id: 文書（スキャンジョブ）の識別子
+        min_confidence: 回転を適用する向きの信頼度の下限
+    
+    Returns:
+        (正立させた画像, 時計回りに回転した角度)
+    """
+    if document_id is not None:
+        rotate = _orientation_cache.get(document_id)
+        if rotate is not None:
+            return rotate_upright(image, rotate), rotate
+    
+    try:
+        osd = detect_orientation(image)
+    except (RuntimeError, OSError, ValueError):
+        # 文字が少ない画像などOSDが失敗する場合はそのまま認識する
+        return image, 0
+    
+    if osd['orientation_conf'] < min_confidence:
+        return image, 0
+    
+    rotate = osd['rotate']
+    if document_id is not None:
+        _orientation_cache.put(document_id, rotate)
+    return rotate_upright(image, rotate), rotate
@@ -0,0 +1,944 @@
+"""
+並列OCRモジュール
+大きな画像をタイルや行に分割し、複数プロセスで並列にOCRを行う機能を提供します。
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from PIL import Image
+
+from config import (
+    DEFAULT_PSM_MODE,
+    TILE_SIZE,
+    TILE_OVERLAP,
+    PARALLEL_OCR_WORKERS,
+    LINE_PSM_MODE,
+    LINE_CROP_PADDING,
+    LINE_STREAM_CHUNK_SIZE,
+    LINE_STREAM_FALLBACK_TILE_SIZE,
+    WORKER_BACKEND,
+)
+from ocr_backend import (
+    TSV_HEADER,
+    OCRBackend,
+    SubprocessBackend,
+    LibTesseractBackend,
+    get_backend,
+    get_default_backend_name,
+)
+from ocr_threads import set_process_threads, worker_layout
+
+
+# OCRデータの列名
+OCR_DATA_COLUMNS = TSV_HEADER.split('\t')
+
+# タイル端からこの距離以内に接する単語は切れている可能性があるため除外（ピクセル）
+TILE_EDGE_MARGIN = 2
+
+# 単語を同じ行とみなす縦方向の重なり（低い方の高さに対する割合）
+LINE_OVERLAP_RATIO = 0.5
+
+# 行間がこの値（行の高さの中央値に対する割合）を超えたら別のブロックとする
+BLOCK_GAP_RATIO = 1.0
+
+# 並列OCR用のプロセスプール（プロセス内で共有）
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """
+    並列OCR用のプロセスプールを取得します（初回呼び出し時に生成）。
+    
+    プロセス数と各プロセスのOpenMPスレッド数はスレッド配分のモードに従います。
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers, threads = worker_layout(PARALLEL_OCR_WORKERS)
+            _executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=set_process_threads,
+                initargs=(threads,),
+            )
+        return _executor
+
+
+def shutdown_executor(wait: bool = True) -> None:
+    """
+    並列OCR用のプロセスプールを終了します。
+    
+    Args:
+        wait: 実行中のタスクの完了を待つか
+    """
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+def _worker_backend_name() -> str:
+    """
+    ワーカープロセスで使用するバックエンド名を決定します。
+    """
+    name = get_default_backend_name()
+    # プールバックエンドをワーカー内から呼ぶと入れ子になるため直接実行する
+    return WORKER_BACKEND if name == 'pool' else name
+
+
+def _resolve_worker_backend(backend_name: str, tier: Optional[str] = None) -> OCRBackend:
+    """
+    ワーカープロセス内で使用するバックエンドを取得します。
+    """
+    try:
+        return get_backend(backend_name, tier)
+    except OSError:
+        # libtesseractが無い環境ではtesseractコマンドで代替
+        return get_backend(SubprocessBackend.name, tier)
+
+
+def _ocr_image_data(
+    image: Image.Image,
+    lang: str,
+    psm_mode: str,
+    backend_name: str,
+    tier: Optional[str] = None
+) -> Dict[str, List]:
+    """
+    ワーカープロセス内で画像のOCRデータを取得します。
+    """
+    try:
+        return _resolve_worker_backend(backend_name, tier).image_to_data(image, lang, psm_mode)
+    except Exception as e:
+        # pytesseractの例外はpickleで復元できないため変換して返す
+        raise RuntimeError(str(e)) from None
+
+
+def _ocr_images_data(
+    images: Sequence[Image.Image],
+    lang: str,
+    psm_mode: str,
+    backend_name: str,
+    tier: Optional[str] = None
+) -> List[Dict[str, List]]:
+    """
+    ワーカープロセス内で複数画像のOCRデータをまとめて取得します。
+    """
+    try:
+        return _resolve_worker_backend(backend_name, tier).image_to_data_batch(images, lang, psm_mode)
+    except Exception as e:
+        raise RuntimeError(str(e)) from None
+
+
+def empty_ocr_data() -> Dict[str, List]:
+    """
+    空のOCRデータを作成します。
+    
+    Returns:
+        全列が空リストのOCRデータ
+    """
+    return {column: [] for column in OCR_DATA_COLUMNS}
+
+
+def append_ocr_row(ocr_data: Dict[str, List], source: Dict[str, List], index: int, **overrides) -> None:
+    """
+    OCRデータに別のOCRデータの1行を追加します。
+    
+    Args:
+        ocr_data: 追加先のOCRデータ
+        source: 追加元のOCRデータ
+        index: 追加元の行番号
+        **overrides: 上書きする列の値
+    """
+    for column in OCR_DATA_COLUMNS:
+        ocr_data[column].append(overrides.get(column, source[column][index]))
+
+
+def split_into_tiles(
+    width: int,
+    height: int,
+    tile_size: int = TILE_SIZE,
+    overlap: int = TILE_OVERLAP
+) -> List[Tuple[int, int, int, int]]:
+    """
+    画像を重なり付きのタイルに分割する座標を計算します。
+    
+    Args:
+        width: 画像の幅
+        height: 画像の高さ
+        tile_size: タイルの一辺の長さ
+        overlap: 隣接タイルとの重なり幅
+    
+    Returns:
+        タイルの座標 (left, top, right, bottom) のリスト（行優先順）
+    """
+    step = max(tile_size - overlap, 1)
+    
+    def starts(length: int) -> List[int]:
+        if length <= tile_size:
+            return [0]
+        positions = list(range(0, length - tile_size, step))
+        positions.append(length - tile_size)
+        return positions
+    
+    return [
+        (left, top, min(left + tile_size, width), min(top + tile_size, height))
+        for top in starts(height)
+        for left in starts(width)
+    ]
+
+
+def _core_ranges(starts_and_ends: List[Tuple[int, int]], length: int) -> Dict[int, Tuple[float, float]]:
+    """
+    1方向に並んだタイルの担当範囲（隣接タイルとの重なりの中央で区切った範囲）を計算します。
+    """
+    spans = sorted(set(starts_and_ends))
+    boundaries = [0.0]
+    for (_, previous_end), (start, _) in zip(spans, spans[1:]):
+        boundaries.append((start + previous_end) / 2)
+    boundaries.append(float(length))
+    return {
+        start: (boundaries[k], boundaries[k + 1])
+        for k, (start, _) in enumerate(spans)
+    }
+
+
+def _touches_inner_edge(
+    tile: Tuple[int, int, int, int],
+    box: Tuple[int, int, int, int],
+    image_size: Tuple[int, int]
+) -> bool:
+    """
+    単語（ページ座標の (x, y, w, h)）がタイル内部の端（画像の端ではない辺）に接するかを判定します。
+    
+    接する単語はタイルの境界で切れている可能性があります。
+    """
+    left, top, right, bottom = tile
+    x, y, w, h = box
+    width, height = image_size
+    return (
+        (left > 0 and x <= left + TILE_EDGE_MARGIN)
+        or (top > 0 and y <= top + TILE_EDGE_MARGIN)
+        or (right < width and x + w >= right - TILE_EDGE_MARGIN)
+        or (bottom < height and y + h >= bottom - TILE_EDGE_MARGIN)
+    )
+
+
+def _tile_owned_words(
+    tiles: Sequence[Tuple[int, int, int, int]],
+    tile_results: Dict[int, Dict[str, List]],
+    image_size: Tuple[int, int],
+    indices: Sequence[int]
+) -> Dict[int, List[int]]:
+    """
+    各タイルのOCRデータのうち、そのタイルが担当する単語の行番号を求めます。
+    
+    単語は中心点が担当範囲（隣接タイルとの重なりの中央で区切った範囲）にあるタイルが担当します。
+    タイル内部の端に接する（切れている可能性がある）単語は、他のタイルがその単語を
+    端に接せずに認識している場合だけ除外します。重なり幅より長い単語は
+    どのタイルでも端に接するため、各タイルの切れた読みのうち最も幅の広いものを残します。
+    
+    Args:
+        tiles: 全タイルの座標 (left, top, right, bottom) のリスト
+        tile_results: タイルの番号 -> OCRデータ（認識済みのタイル）
+        image_size: 元画像のサイズ (width, height)
+        indices: 担当する単語を求めるタイルの番号
+    
+    Returns:
+        タイルの番号 -> 担当する単語の行番号（昇順）
+    """
+    width, height = image_size
+    x_cores = _core_ranges([(tile[0], tile[2]) for tile in tiles], width)
+    y_cores = _core_ranges([(tile[1], tile[3]) for tile in tiles], height)
+    
+    # (タイルの番号, 行番号, ページ座標の矩形, 端に接するか)
+    observations = []
+    for index, data in tile_results.items():
+        tile = tiles[index]
+        for i in range(len(data.get('text', []))):
+            if int(data['level'][i]) != 5 or not data['text'][i].strip():
+                continue
+            box = (data['left'][i] + tile[0], data['top'][i] + tile[1], data['width'][i], data['height'][i])
+            observations.append((index, i, box, _touches_inner_edge(tile, box, image_size)))
+    
+    def contains_center(outer: Tuple[int, int, int, int], box: Tuple[int, int, int, int]) -> bool:
+        center_x, center_y = box[0] + box[2] / 2, box[1] + box[3] / 2
+        return outer[0] <= center_x <= outer[0] + outer[2] and outer[1] <= center_y <= outer[1] + outer[3]
+    
+    def same_word(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> bool:
+        return contains_center(a, b) or contains_center(b, a)
+    
+    owned: Dict[int, List[int]] = {index: [] for index in indices}
+    for index, i, box, clipped in observations:
+        if index not in owned:
+            continue
+        if clipped:
+            others = [
+                (other, other_box, other_clipped)
+                for other, _, other_box, other_clipped in observations if other != index
+            ]
+            if any(not other_clipped and contains_center(other_box, box) for _, other_box, other_clipped in others):
+                continue
+            # 他のタイルでも切れている同じ単語とは、幅の広い（同じ幅なら番号の小さいタイルの）読みを残す
+            rivals = [
+                (other, other_box)
+                for other, other_box, other_clipped in others if other_clipped and same_word(other_box, box)
+            ]
+            if rivals:
+                if all((box[2], -index) > (other_box[2], -other) for other, other_box in rivals):
+                    owned[index].append(i)
+                continue
+        tile = tiles[index]
+        core_left, core_right = x_cores[tile[0]]
+        core_top, core_bottom = y_cores[tile[1]]
+        center_x, center_y = box[0] + box[2] / 2, box[1] + box[3] / 2
+        if core_left <= center_x <= core_right and core_top <= center_y <= core_bottom:
+            owned[index].append(i)
+    return owned
+
+
+def _box_iou(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> float:
+    """
+    2つの矩形 (x, y, w, h) のIoUを計算します。
+    """
+    ix = max(0, min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0]))
+    iy = max(0, min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1]))
+    intersection = ix * iy
+    union = a[2] * a[3] + b[2] * b[3] - intersection
+    return intersection / union if union > 0 else 0.0
+
+
+def remove_duplicate_words(ocr_data: Dict[str, List], iou_threshold: float = 0.5) -> Dict[str, List]:
+    """
+    同じ文字列でほぼ同じ位置にある単語の重複を除去します（信頼度の高い方を残します）。
+    
+    Args:
+        ocr_data: OCRデータ
+        iou_threshold: 重複とみなす矩形の重なり率
+    
+    Returns:
+        重複を除去したOCRデータ
+    """
+    words = [
+        i for i in range(len(ocr_data['text']))
+        if int(ocr_data['level'][i]) == 5 and ocr_data['text'][i].strip()
+    ]
+    # 信頼度の高い順に採用し、既に採用した単語と重なるものを捨てる
+    words.sort(key=lambda i: float(ocr_data['conf'][i]), reverse=True)
+    
+    # 文字列ごとに採用済みの矩形を保持し、同じ文字列同士だけを比較する
+    kept_boxes: Dict[str, List[Tuple[int, int, int, int]]] = {}
+    dropped: Set[int] = set()
+    for i in words:
+        text = ocr_data['text'][i].strip()
+        box = (ocr_data['left'][i], ocr_data['top'][i], ocr_data['width'][i], ocr_data['height'][i])
+        same_text_boxes = kept_boxes.setdefault(text, [])
+        if any(_box_iou(box, other) >= iou_threshold for other in same_text_boxes):
+            dropped.add(i)
+        else:
+            same_text_boxes.append(box)
+    
+    result = empty_ocr_data()
+    for i in range(len(ocr_data['text'])):
+        if i not in dropped:
+            append_ocr_row(result, ocr_data, i)
+    return result
+
+
+def append_offset_rows(
+    merged: Dict[str, List],
+    data: Dict[str, List],
+    dx: int,
+    dy: int,
+    block_offset: int = 0,
+    rows: Optional[Sequence[int]] = None
+) -> int:
+    """
+    切り出した範囲のOCRデータの行を、ページ座標に変換して追加します。
+    
+    ページを表す行（level 1）は追加せず、ブロック番号にはblock_offsetを加えます。
+    
+    Args:
+        merged: 追加先のOCRデータ
+        data: 切り出した範囲のOCRデータ
+        dx: 範囲の左端（ページ座標）
+        dy: 範囲の上端（ページ座標）
+        block_offset: ブロック番号に加える値
+        rows: 追加する行番号（省略時は全ての行）
+    
+    Returns:
+        追加した行のブロック番号の最大値（次の範囲のblock_offsetの計算用）
+    """
+    max_block = 0
+    for i in (range(len(data.get('text', []))) if rows is None else rows):
+        if int(data['level'][i]) == 1:
+            continue
+        max_block = max(max_block, int(data['block_num'][i]))
+        append_ocr_row(
+            merged, data, i,
+            page_num=1,
+            block_num=int(data['block_num'][i]) + block_offset,
+            left=data['left'][i] + dx,
+            top=data['top'][i] + dy,
+        )
+    return max_block
+
+
+def merge_offset_results(
+    boxes: Sequence[Tuple[int, int, int, int]],
+    results: Sequence[Dict[str, List]],
+    image_size: Tuple[int, int]
+) -> Dict[str, List]:
+    """
+    切り出した範囲ごとのOCRデータをページ座標に変換し、範囲の順に結合します。
+    
+    ブロック番号は範囲をまたいで一意になるよう振り直します。
+    
+    Args:
+        boxes: 範囲の座標 (left, top, right, bottom) のリスト
+        results: 範囲ごとのOCRデータ
+        image_size: 元画像のサイズ (width, height)
+    
+    Returns:
+        ページ全体のOCRデータ
+    """
+    merged = empty_ocr_data()
+    _append_structure_row(merged, 1, (0, 0, *image_size))
+    block_offset = 0
+    for box, data in zip(boxes, results):
+        block_offset += append_offset_rows(merged, data, box[0], box[1], block_offset)
+    return merged
+
+
+def merge_tile_results(
+    tiles: List[Tuple[int, int, int, int]],
+    tile_results: List[Dict[str, List]],
+    image_size: Tuple[int, int]
+) -> Dict[str, List]:
+    """
+    タイルごとのOCRデータをページ座標に変換して1つに結合します。
+    
+    タイルの境界で分かれた行をつなげるため、各タイルが担当する単語を
+    ページ座標での縦方向の重なりで行にまとめ直し、読み順にブロック・段落・行の番号を振り直します。
+    
+    Args:
+        tiles: タイルの座標 (left, top, right, bottom) のリスト
+        tile_results: タイルごとのOCRデータ
+        image_size: 元画像のサイズ (width, height)
+    
+    Returns:
+        ページ全体のOCRデータ
+    """
+    words = _tile_words(tiles, dict(enumerate(tile_results)), image_size)
+    merged = empty_ocr_data()
+    _append_structure_row(merged, 1, (0, 0, *image_size))
+    for column, values in regroup_words_into_lines(remove_duplicate_words(words)).items():
+        merged[column].extend(values)
+    return merged
+
+
+def _tile_words(
+    tiles: Sequence[Tuple[int, int, int, int]],
+    tile_results: Dict[int, Dict[str, List]],
+    image_size: Tuple[int, int],
+    indices: Optional[Sequence[int]] = None
+) -> Dict[str, List]:
+    """
+    タイルが担当する単語の行だけをページ座標に変換して集めます。
+    
+    Args:
+        tiles: 全タイルの座標 (left, top, right, bottom) のリスト（担当範囲の計算に使用）
+        tile_results: タイルの番号 -> OCRデータ（認識済みのタイル。隣接タイルの結果は切れた単語の判定に使用）
+        image_size: 元画像のサイズ (width, height)
+        indices: 単語を集めるタイルの番号（省略時はtile_resultsの全タイル）
+    """
+    indices = sorted(tile_results) if indices is None else indices
+    owned = _tile_owned_words(tiles, tile_results, image_size, indices)
+    words = empty_ocr_data()
+    for index in indices:
+        tile = tiles[index]
+        append_offset_rows(words, tile_results[index], tile[0], tile[1], rows=owned[index])
+    return words
+
+
+def regroup_words_into_lines(words: Dict[str, List], block_offset: int = 0) -> Dict[str, List]:
+    """
+    ページ座標の単語を縦方向の重なりで行にまとめ直し、読み順に番号を振り直します。
+    
+    行は上から順、行内の単語は左から順に並べ、行間が大きく空いた箇所や
+    横方向に重ならない行の境目で新しいブロック（1ブロック1段落）にします。
+    
+    Args:
+        words: 単語の行を含むOCRデータ（ページ座標）
+        block_offset: ブロック番号に加える値
+    
+    Returns:
+        ブロック・段落・行・単語の行からなるOCRデータ（ページを表す行は含まない）
+    """
+    rows = [
+        i for i in range(len(words.get('text', [])))
+        if int(words['level'][i]) == 5 and str(words['text'][i]).strip()
+    ]
+    rows.sort(key=lambda i: (int(words['top'][i]), int(words['left'][i])))
+    
+    # 行ごとの [上端, 下端, 単語の行番号]（上端・下端は単語の平均）
+    lines: List[List] = []
+    for i in rows:
+        top = int(words['top'][i])
+        bottom = top + int(words['height'][i])
+        best_line, best_ratio = None, LINE_OVERLAP_RATIO
+        for line in lines:
+            overlap = min(bottom, line[1]) - max(top, line[0])
+            smaller = min(bottom - top, line[1] - line[0])
+            ratio = overlap / smaller if smaller > 0 else 0.0
+            if ratio >= best_ratio:
+                best_line, best_ratio = line, ratio
+        if best_line is None:
+            lines.append([top, bottom, [i]])
+        else:
+            count = len(best_line[2])
+            best_line[0] = (best_line[0] * count + top) / (count + 1)
+            best_line[1] = (best_line[1] * count + bottom) / (count + 1)
+            best_line[2].append(i)
+    
+    def word_box(i: int) -> Tuple[int, int, int, int]:
+        left, top = int(words['left'][i]), int(words['top'][i])
+        return left, top, left + int(words['width'][i]), top + int(words['height'][i])
+    
+    def union(boxes: List[Tuple[int, int, int, int]]) -> Tuple[int, int, int, int]:
+        return (
+            min(box[0] for box in boxes), min(box[1] for box in boxes),
+            max(box[2] for box in boxes), max(box[3] for box in boxes),
+        )
+    
+    line_words = [sorted(line[2], key=lambda i: int(words['left'][i])) for line in lines]
+    line_boxes = [union([word_box(i) for i in members]) for members in line_words]
+    order = sorted(range(len(lines)), key=lambda n: (line_boxes[n][1], line_boxes[n][0]))
+    
+    # 行間・横方向の重なりでブロックに分ける
+    heights = sorted(box[3] - box[1] for box in line_boxes)
+    median_height = heights[len(heights) // 2] if heights else 0
+    blocks: List[List[int]] = []
+    for n in order:
+        if blocks:
+            previous = line_boxes[blocks[-1][-1]]
+            box = line_boxes[n]
+            gap = box[1] - previous[3]
+            overlaps = box[0] < previous[2] and previous[0] < box[2]
+            if overlaps and gap <= BLOCK_GAP_RATIO * median_height:
+                blocks[-1].append(n)
+                continue
+        blocks.append([n])
+    
+    result = empty_ocr_data()
+    for block_index, block in enumerate(blocks):
+        block_num = block_offset + block_index + 1
+        block_box = union([line_boxes[n] for n in block])
+        _append_structure_row(result, 2, block_box, block_num)
+        _append_structure_row(result, 3, block_box, block_num, 1)
+        for line_num, n in enumerate(block, start=1):
+            _append_structure_row(result, 4, line_boxes[n], block_num, 1, line_num)
+            for word_num, i in enumerate(line_words[n], start=1):
+                append_ocr_row(
+                    result, words, i,
+                    page_num=1, block_num=block_num, par_num=1, line_num=line_num, word_num=word_num,
+                )
+    return result
+
+
+def get_ocr_data_tiled(
+    image: Image.Image,
+    lang: str = 'eng',
+    psm_mode: str = DEFAULT_PSM_MODE,
+    tile_size: int = TILE_SIZE,
+    overlap: int = TILE_OVERLAP,
+    tier: Optional[str] = None
+) -> Dict[str, List]:
+    """
+    画像をタイルに分割し、複数プロセスで並列にOCRデータを取得します。
+    
+    タイルの重なり幅は最大の文字サイズより大きくしてください。
+    タイルをまたぐ行は、単語をページ座標での縦方向の重なりで行にまとめ直して1行につなげ、
+    読み順にブロック・段落・行の番号を振り直します（merge_tile_results）。
+    
+    Args:
+        image: 入力画像
+        lang: 言語コード
+        psm_mode: Page Segmentation Mode
+        tile_size: タイルの一辺の長さ
+        overlap: 隣接タイルとの重なり幅
+        tier: 学習データの種類
+    
+    Returns:
+        ページ座標に変換・重複除去済みのOCRデータ
+    """
+    tiles = split_into_tiles(image.width, image.height, tile_size, overlap)
+    
+    if len(tiles) == 1:
+        return get_backend(tier=tier).image_to_data(image, lang, psm_mode)
+    
+    backend_name = _worker_backend_name()
+    executor = _get_executor()
+    futures = [
+        executor.submit(_ocr_image_data, image.crop(tile), lang, psm_mode, backend_name, tier)
+        for tile in tiles
+    ]
+    tile_results = [future.result() for future in futures]
+    
+    return merge_tile_results(tiles, tile_results, image.size)
+
+
+def _word_rows(data: Dict[str, List], rows: Sequence[int], dx: int = 0, dy: int = 0, **overrides) -> Dict[str, List]:
+    """
+    OCRデータから指定した単語の行だけを取り出し、座標をずらしたOCRデータを作成します。
+    """
+    words = empty_ocr_data()
+    for i in rows:
+        append_ocr_row(
+            words, data, i,
+            page_num=1,
+            left=data['left'][i] + dx,
+            top=data['top'][i] + dy,
+            **overrides
+        )
+    return words
+
+
+def _page_words(data: Dict[str, List]) -> Dict[str, List]:
+    """
+    OCRデータから認識された単語の行だけを取り出します。
+    """
+    rows = [
+        i for i in range(len(data.get('text', [])))
+        if int(data['level'][i]) == 5 and data['text'][i].strip()
+    ]
+    return _word_rows(data, rows)
+
+
+def iter_ocr_data_tiled(
+    image: Image.Image,
+    lang: str = 'eng',
+    psm_mode: str = DEFAULT_PSM_MODE,
+    tile_size: int = TILE_SIZE,
+    overlap: int = TILE_OVERLAP,
+    tier: Optional[str] = None
+) -> Iterator[Dict[str, List]]:
+    """
+    タイルを並列にOCRし、横一列のタイルの認識が終わるたびにその担当範囲の単語を返します。
+    
+    全タイルを先に投入し、上の列から順に結果を返します。列内の単語はタイルの境界を
+    またいで行にまとめ直します（regroup_words_into_lines）。下の列との境界で切れた単語を判定するため、
+    各列は1つ下の列の認識も終わってから返します。列をまたぐ重複除去は行わないため、
+    ページ全体の結果が必要な場合はget_ocr_data_tiledを使用してください。
+    
+    Args:
+        image: 入力画像
+        lang: 言語コード
+        psm_mode: Page Segmentation Mode
+        tile_size: タイルの一辺の長さ
+        overlap: 隣接タイルとの重なり幅
+        tier: 学習データの種類
+    
+    Yields:
+        タイルの列ごとの単語の行のみを含むOCRデータ（ページ座標、ブロック番号は列をまたいで一意）
+    """
+    tiles = split_into_tiles(image.width, image.height, tile_size, overlap)
+    
+    if len(tiles) == 1:
+        yield _page_words(get_backend(tier=tier).image_to_data(image, lang, psm_mode))
+        return
+    
+    backend_name = _worker_backend_name()
+    executor = _get_executor()
+    futures = [
+        executor.submit(_ocr_image_data, image.crop(tile), lang, psm_mode, backend_name, tier)
+        for tile in tiles
+    ]
+    
+    try:
+        block_offset = 0
+        tile_results: Dict[int, Dict[str, List]] = {}
+        row_tops = sorted({tile[1] for tile in tiles})
+        # 同じ上端を持つタイル（横一列）ごとに結果をまとめる
+        for row, row_top in enumerate(row_tops):
+            row_indices = [index for index, tile in enumerate(tiles) if tile[1] == row_top]
+            # 隣接する列（上・下）の結果も切れた単語の判定に使用する
+            for index, tile in enumerate(tiles):
+                if tile[1] in row_tops[max(row - 1, 0):row + 2] and index not in tile_results:
+                    tile_results[index] = futures[index].result()
+            words = _tile_words(tiles, tile_results, image.size, row_indices)
+            regrouped = regroup_words_into_lines(words, block_offset)
+            block_offset = max((int(value) for value in regrouped['block_num']), default=block_offset)
+            yield _page_words(regrouped)
+    finally:
+        # 途中で打ち切られた場合は未着手のタイルを取り消す
+        for future in futures:
+            future.cancel()
+
+
+def analyse_layout(
+    image: Image.Image,
+    lang: str = 'eng',
+    psm_mode: str = DEFAULT_PSM_MODE,
+    tier: Optional[str] = None
+) -> Optional[List[Dict[str, int]]]:
+    """
+    文字認識を行わずにレイアウト解析のみを実行し、行の矩形を取得します。
+    
+    デフォルトのバックエンドが対応していない場合はlibtesseractで解析します。
+    
+    Args:
+        image: 入力画像
+        lang: 言語コード
+        psm_mode: Page Segmentation Mode
+        tier: 学習データの種類
+    
+    Returns:
+        行ごとの情報のリスト（レイアウト解析に対応するバックエンドが無い場合はNone）
+    """
+    try:
+        return get_backend(tier=tier).analyse_layout(image, lang, psm_mode)
+    except NotImplementedError:
+        pass
+    
+    try:
+        return get_backend(LibTesseractBackend.name, tier).analyse_layout(image, lang, psm_mode)
+    except OSError:
+        return None
+
+
+def _append_structure_row(
+    ocr_data: Dict[str, List],
+    level: int,
+    box: Tuple[int, int, int, int],
+    block_num: int = 0,
+    par_num: int = 0,
+    line_num: int = 0
+) -> None:
+    """
+    ページ・ブロック・段落・行を表す行（テキスト無し、信頼度-1）を追加します。
+    """
+    left, top, right, bottom = box
+    row = {column: [0] for column in OCR_DATA_COLUMNS}
+    row.update({
+        'level': [level], 'page_num': [1], 'block_num': [block_num],
+        'par_num': [par_num], 'line_num': [line_num],
+        'left': [left], 'top': [top], 'width': [right - left], 'height': [bottom - top],
+        'conf': [-1], 'text': [''],
+    })
+    append_ocr_row(ocr_data, row, 0)
+
+
+def merge_line_results(
+    lines: List[Dict[str, int]],
+    crops: List[Tuple[int, int, int, int]],
+    line_results: List[Dict[str, List]],
+    image_size: Tuple[int, int]
+) -> Dict[str, List]:
+    """
+    行ごとのOCRデータを、レイアウト解析の番号付けを保ったまま1つに結合します。
+    
+    Args:
+        lines: レイアウト解析で得た行の情報
+        crops: 各行を切り出した矩形 (left, top, right, bottom)
+        line_results: 行ごとのOCRデータ
+        image_size: 元画像のサイズ (width, height)
+    
+    Returns:
+        ページ全体のOCRデータ
+    """
+    def union(boxes: List[Tuple[int, int, int, int]]) -> Tuple[int, int, int, int]:
+        return (
+            min(box[0] for box in boxes), min(box[1] for box in boxes),
+            max(box[2] for box in boxes), max(box[3] for box in boxes),
+        )
+    
+    line_boxes = [
+        (line['left'], line['top'], line['left'] + line['width'], line['top'] + line['height'])
+        for line in lines
+    ]
+    block_boxes: Dict[int, List[Tuple[int, int, int, int]]] = {}
+    par_boxes: Dict[Tuple[int, int], List[Tuple[int, int, int, int]]] = {}
+    for line, box in zip(lines, line_boxes):
+        block_boxes.setdefault(line['block_num'], []).append(box)
+        par_boxes.setdefault((line['block_num'], line['par_num']), []).append(box)
+    
+    merged = empty_ocr_data()
+    _append_structure_row(merged, 1, (0, 0, *image_size))
+    
+    current_block = current_par = None
+    for line, line_box, crop, data in zip(lines, line_boxes, crops, line_results):
+        block_num, par_num, line_num = line['block_num'], line['par_num'], line['line_num']
+        if block_num != current_block:
+            _append_structure_row(merged, 2, union(block_boxes[block_num]), block_num)
+            current_block, current_par = block_num, None
+        if par_num != current_par:
+            _append_structure_row(merged, 3, union(par_boxes[(block_num, par_num)]), block_num, par_num)
+            current_par = par_num
+        _append_structure_row(merged, 4, line_box, block_num, par_num, line_num)
+        
+        # 行画像の単語を元画像の座標に戻して追加
+        word_num = 0
+        for i in range(len(data.get('text', []))):
+            if int(data['level'][i]) != 5:
+                continue
+            word_num += 1
+            append_ocr_row(
+                merged, data, i,
+                page_num=1,
+                block_num=block_num,
+                par_num=par_num,
+                line_num=line_num,
+                word_num=word_num,
+                left=data['left'][i] + crop[0],
+                top=data['top'][i] + crop[1],
+            )
+    
+    return merged
+
+
+def _line_crops(
+    lines: List[Dict[str, int]],
+    image_size: Tuple[int, int],
+    padding: int
+) -> List[Tuple[int, int, int, int]]:
+    """
+    各行を余白付きで切り出す矩形 (left, top, right, bottom) を計算します。
+    """
+    width, height = image_size
+    return [
+        (
+            max(line['left'] - padding, 0),
+            max(line['top'] - padding, 0),
+            min(line['left'] + line['width'] + padding, width),
+            min(line['top'] + line['height'] + padding, height),
+        )
+        for line in lines
+    ]
+
+
+def _submit_line_chunks(
+    image: Image.Image,
+    crops: List[Tuple[int, int, int, int]],
+    lang: str,
+    line_psm_mode: str,
+    chunk_size: int,
+    tier: Optional[str] = None
+) -> List[Future]:
+    """
+    行画像をchunk_size行ずつまとめてワーカーへ投入します。
+    """
+    backend_name = _worker_backend_name()
+    executor = _get_executor()
+    return [
+        executor.submit(
+            _ocr_images_data,
+            [image.crop(crop) for crop in crops[start:start + chunk_size]],
+            lang, line_psm_mode, backend_name, tier
+        )
+        for start in range(0, len(crops), chunk_size)
+    ]
+
+
+def get_ocr_data_by_lines(
+    image: Image.Image,
+    lang: str = 'eng',
+    psm_mode: str = DEFAULT_PSM_MODE,
+    line_psm_mode: str = LINE_PSM_MODE,
+    padding: int = LINE_CROP_PADDING,
+    tier: Optional[str] = None
+) -> Dict[str, List]:
+    """
+    レイアウト解析を1回だけ行い、各行を複数プロセスで並列に認識します。
+    
+    レイアウト解析に対応するバックエンドが無い場合は通常の1回のOCRを行います。
+    
+    Args:
+        image: 入力画像
+        lang: 言語コード
+        psm_mode: レイアウト解析に使用するPage Segmentation Mode
+        line_psm_mode: 行画像の認識に使用するPage Segmentation Mode
+        padding: 行画像を切り出す際の余白
+        tier: 学習データの種類
+    
+    Returns:
+        OCRデータ（ブロック・段落・行・単語の番号はレイアウト解析の結果に従う）
+    """
+    lines = analyse_layout(image, lang, psm_mode, tier)
+    if lines is None:
+        return get_backend(tier=tier).image_to_data(image, lang, psm_mode)
+    
+    crops = _line_crops(lines, image.size, padding)
+    
+    # ワーカー数に分けてまとめて投入し、タスクごとのオーバーヘッドを抑える
+    worker_count, _ = worker_layout(PARALLEL_OCR_WORKERS)
+    chunk_size = max(-(-len(crops) // worker_count), 1)
+    futures = _submit_line_chunks(image, crops, lang, line_psm_mode, chunk_size, tier)
+    line_results = [data for future in futures for data in future.result()]
+    
+    return merge_line_results(lines, crops, line_results, image.size)
+
+
+def iter_ocr_data_by_lines(
+    image: Image.Image,
+    lang: str = 'eng',
+    psm_mode: str = DEFAULT_PSM_MODE,
+    line_psm_mode: str = LINE_PSM_MODE,
+    padding: int = LINE_CROP_PADDING,
+    chunk_size: int = LINE_STREAM_CHUNK_SIZE,
+    tier: Optional[str] = None
+) -> Iterator[Dict[str, List]]:
+    """
+    レイアウト解析後に各行を並列に認識し、読み順に1行ずつ結果を返します。
+    
+    最初の行をすぐに返せるよう、行は少数ずつまとめてワーカーへ投入します。
+    レイアウト解析に対応するバックエンドが無い場合（libtesseractが無くsubprocessのみの環境など）は、
+    LINE_STREAM_FALLBACK_TILE_SIZEのタイルに分割してタイルの列ごとに返します（iter_ocr_data_tiled）。
+    画像がタイル1枚に収まる場合はページ全体を1回で返します。
+    
+    Args:
+        image: 入力画像
+        lang: 言語コード
+        psm_mode: レイアウト解析に使用するPage Segmentation Mode
+        line_psm_mode: 行画像の認識に使用するPage Segmentation Mode
+        padding: 行画像を切り出す際の余白
+        chunk_size: 1タスクにまとめる行数
+        tier: 学習データの種類
+    
+    Yields:
+        行ごとの単語の行のみを含むOCRデータ（ページ座標、番号はレイアウト解析の結果に従う。
+        タイルで代替した場合はタイルの列ごと）
+    """
+    lines = analyse_layout(image, lang, psm_mode, tier)
+    if lines is None:
+        yield from iter_ocr_data_tiled(image, lang, psm_mode, LINE_STREAM_FALLBACK_TILE_SIZE, tier=tier)
+        return
+    
+    crops = _line_crops(lines, image.size, padding)
+    futures = _submit_line_chunks(image, crops, lang, line_psm_mode, chunk_size, tier)
+    
+    try:
+        index = 0
+        for future in futures:
+            for data in future.result():
+                line, crop = lines[index], crops[index]
+                index += 1
+                rows = [
+                    i for i in range(len(data.get('text', [])))
+                    if int(data['level'][i]) == 5 and data['text'][i].strip()
+                ]
+                yield _word_rows(
+                    data, rows, crop[0], crop[1],
+                    block_num=line['block_num'],
+                    par_num=line['par_num'],
+                    line_num=line['line_num'],
+                )
+    finally:
+        # 途中で打ち切られた場合は未着手の行を取り消す
+        for future in futures:
+            future.cancel()
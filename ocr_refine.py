@@ -0,0 +1,145 @@
+"""
+再認識モジュール
+信頼度の低い単語だけを切り出し、別の前処理・PSMモードで認識し直して結果を改善します。
+"""
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from PIL import Image
+
+from config import (
+    CONFIDENCE_THRESHOLD_MEDIUM,
+    REFINE_CROP_PADDING,
+    REFINE_UPSCALE,
+    REFINE_VARIANTS,
+)
+from image_preprocessor import binarize_image, enhance_contrast
+from ocr_backend import get_backend
+
+
+# 単語を表す行のレベル
+WORD_LEVEL = 5
+
+
+def _upscale(image: Image.Image) -> Image.Image:
+    """
+    単語画像をグレースケールにして拡大します。
+    """
+    gray = image.convert('L')
+    size = (max(round(gray.width * REFINE_UPSCALE), 1), max(round(gray.height * REFINE_UPSCALE), 1))
+    return gray.resize(size, Image.LANCZOS)
+
+
+# 再認識に使用する前処理（REFINE_VARIANTSの名前 -> 前処理関数）
+REFINE_PREPROCESSORS: Dict[str, Callable[[Image.Image], Image.Image]] = {
+    "contrast": lambda image: enhance_contrast(_upscale(image)),
+    "binarize": lambda image: binarize_image(_upscale(image)),
+}
+
+
+def find_low_confidence_words(ocr_data: Dict[str, List], threshold: float = CONFIDENCE_THRESHOLD_MEDIUM) -> List[int]:
+    """
+    信頼度がしきい値未満の単語の行番号を取得します。
+    
+    Args:
+        ocr_data: OCRデータ
+        threshold: 信頼度のしきい値
+    
+    Returns:
+        行番号のリスト
+    """
+    return [
+        i for i in range(len(ocr_data.get('text', [])))
+        if int(ocr_data['level'][i]) == WORD_LEVEL
+        and str(ocr_data['text'][i]).strip()
+        and 0 <= float(ocr_data['conf'][i]) < threshold
+    ]
+
+
+def _crop_box(ocr_data: Dict[str, List], row: int, image_size: Tuple[int, int], padding: int) -> Tuple[int, int, int, int]:
+    """
+    単語の矩形を余白付きで画像の範囲内に切り出す座標 (left, top, right, bottom) を返します。
+    """
+    left = int(ocr_data['left'][row])
+    top = int(ocr_data['top'][row])
+    right = left + int(ocr_data['width'][row])
+    bottom = top + int(ocr_data['height'][row])
+    return (
+        max(left - padding, 0),
+        max(top - padding, 0),
+        min(right + padding, image_size[0]),
+        min(bottom + padding, image_size[1]),
+    )
+
+
+def _reading(data: Dict[str, List]) -> Tuple[str, float]:
+    """
+    単語画像の認識結果からテキストと信頼度（単語の平均）を取り出します。
+    """
+    words = [
+        (str(data['text'][i]).strip(), float(data['conf'][i]))
+        for i in range(len(data.get('text', [])))
+        if str(data['text'][i]).strip() and float(data['conf'][i]) >= 0
+    ]
+    if not words:
+        return '', -1.0
+    return ' '.join(text for text, _ in words), sum(conf for _, conf in words) / len(words)
+
+
+def refine_low_confidence_words(
+    image: Image.Image,
+    ocr_data: Dict[str, List],
+    lang: str = 'eng',
+    threshold: float = CONFIDENCE_THRESHOLD_MEDIUM,
+    padding: int = REFINE_CROP_PADDING,
+    variants: Sequence[Tuple[str, str]] = REFINE_VARIANTS,
+    tier: Optional[str] = None
+) -> Tuple[Dict[str, List], int]:
+    """
+    信頼度の低い単語を切り出して再認識し、信頼度の高い方の読みを採用します。
+    
+    前処理とPSMモードの組ごとに、全ての単語画像を1回のバッチで認識します。
+    座標や番号は元のOCRデータのまま、テキストと信頼度のみを置き換えます。
+    
+    Args:
+        image: OCRデータの座標の基準となる画像
+        ocr_data: OCRデータ
+        lang: 言語コード
+        threshold: 再認識する単語の信頼度のしきい値
+        padding: 単語画像を切り出す際の余白
+        variants: 前処理の名前（REFINE_PREPROCESSORS）とPSMモードの組のリスト
+        tier: 学習データの種類
+    
+    Returns:
+        (再認識後のOCRデータ, 読みを置き換えた単語の数)
+    """
+    boxes = {
+        row: _crop_box(ocr_data, row, image.size, padding)
+        for row in find_low_confidence_words(ocr_data, threshold)
+    }
+    rows = [row for row, box in boxes.items() if box[2] > box[0] and box[3] > box[1]]
+    if not rows:
+        return ocr_data, 0
+    
+    crops = [image.crop(boxes[row]) for row in rows]
+    best = {row: (float(ocr_data['conf'][row]), None) for row in rows}
+    backend = get_backend(tier=tier)
+    
+    for name, psm_mode in variants:
+        prepared = [REFINE_PREPROCESSORS[name](crop) for crop in crops]
+        for row, data in zip(rows, backend.image_to_data_batch(prepared, lang, psm_mode)):
+            text, conf = _reading(data)
+            if text and conf > best[row][0]:
+                best[row] = (conf, text)
+    
+    refined = {column: list(values) for column, values in ocr_data.items()}
+    replaced = 0
+    for row, (conf, text) in best.items():
+        if text is None:
+            continue
+        # Tesseractの信頼度と同じく整数で格納する
+        refined['conf'][row] = int(round(conf))
+        refined['text'][row] = text
+        replaced += 1
+    
+    return refined, replaced
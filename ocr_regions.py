@@ -0,0 +1,214 @@
+"""
+文字領域検出モジュール
+OpenCVで文字のある領域を検出し、その範囲だけをOCRして座標を元画像に戻します。
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from config import (
+    DEFAULT_PSM_MODE,
+    REGION_DETECT_SIZE,
+    REGION_CLOSE_KERNEL,
+    REGION_CLOSE_SCALE,
+    REGION_MIN_SIZE,
+    REGION_MIN_FILL,
+    REGION_PADDING,
+    REGION_MAX_AREA_RATIO,
+    REGION_MAX_COUNT,
+)
+from ocr_backend import get_backend
+from ocr_parallel import merge_offset_results
+
+
+# 矩形 (left, top, right, bottom)
+Box = Tuple[int, int, int, int]
+
+
+def _boxes_touch(a: Box, b: Box) -> bool:
+    """
+    2つの矩形が重なる（または接する）かを判定します。
+    """
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def _union(boxes: Sequence[Box]) -> Box:
+    """
+    矩形の外接矩形を求めます。
+    """
+    return (
+        min(box[0] for box in boxes),
+        min(box[1] for box in boxes),
+        max(box[2] for box in boxes),
+        max(box[3] for box in boxes),
+    )
+
+
+def merge_overlapping_boxes(boxes: Sequence[Box]) -> List[Box]:
+    """
+    重なる矩形を外接矩形にまとめます（まとめた結果が新たに重なる場合も繰り返しまとめます）。
+    
+    Args:
+        boxes: 矩形のリスト
+    
+    Returns:
+        互いに重ならない矩形のリスト（上から順）
+    """
+    merged = list(boxes)
+    changed = True
+    while changed:
+        changed = False
+        result: List[Box] = []
+        for box in merged:
+            for i, other in enumerate(result):
+                if _boxes_touch(box, other):
+                    result[i] = _union([box, other])
+                    changed = True
+                    break
+            else:
+                result.append(box)
+        merged = result
+    return sorted(merged, key=lambda box: (box[1], box[0]))
+
+
+def _close_kernel(binary: np.ndarray, factor: float) -> Tuple[int, int]:
+    """
+    文字を行にまとめるクロージングのカーネルの大きさ（幅, 高さ）を決定します。
+    
+    縮小画像上の文字の高さ（前景の連結成分の高さの中央値）に比例させ、
+    最小値（REGION_CLOSE_KERNEL）は縮小率に合わせて縮めます。
+    """
+    min_width = max(int(round(REGION_CLOSE_KERNEL[0] * factor)), 3)
+    min_height = max(int(round(REGION_CLOSE_KERNEL[1] * factor)), 1)
+    _, _, stats, _ = cv2.connectedComponentsWithStats(binary)
+    # 1画素程度のノイズは文字の高さの推定から除く
+    heights = stats[1:, cv2.CC_STAT_HEIGHT]
+    heights = heights[heights >= 3]
+    if not len(heights):
+        return min_width, min_height
+    char_height = float(np.median(heights))
+    return (
+        max(int(round(char_height * REGION_CLOSE_SCALE[0])), min_width),
+        max(int(round(char_height * REGION_CLOSE_SCALE[1])), min_height),
+    )
+
+
+def _detect_boxes(image: Image.Image) -> Tuple[List[Box], List[Box]]:
+    """
+    文字領域の候補の輪郭を検出します。
+    
+    Returns:
+        (文字領域と判定した輪郭の矩形のリスト, 全ての輪郭の矩形のリスト)（元画像の座標、余白付き）
+    """
+    gray = np.array(image.convert('L'))
+    height, width = gray.shape
+    factor = min(1.0, REGION_DETECT_SIZE / max(height, width, 1))
+    if factor < 1.0:
+        gray = cv2.resize(gray, None, fx=factor, fy=factor, interpolation=cv2.INTER_AREA)
+    
+    # 文字の輪郭（明暗の変化が大きい画素）を前景にする
+    gradient = cv2.morphologyEx(gray, cv2.MORPH_GRADIENT, cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3)))
+    _, binary = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    connected = cv2.morphologyEx(
+        binary, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, _close_kernel(binary, factor))
+    )
+    contours, _ = cv2.findContours(connected, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    
+    # 縮小画像の1画素分の丸め誤差も余白に含める
+    padding = REGION_PADDING + int(np.ceil(1 / factor))
+    min_width, min_height = REGION_MIN_SIZE
+    text_boxes: List[Box] = []
+    all_boxes: List[Box] = []
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        box = (
+            max(int(x / factor) - padding, 0),
+            max(int(y / factor) - padding, 0),
+            min(int(np.ceil((x + w) / factor)) + padding, width),
+            min(int(np.ceil((y + h) / factor)) + padding, height),
+        )
+        all_boxes.append(box)
+        if w < min_width or h < min_height:
+            continue
+        if cv2.countNonZero(connected[y:y + h, x:x + w]) < REGION_MIN_FILL * w * h:
+            continue
+        text_boxes.append(box)
+    return text_boxes, all_boxes
+
+
+def detect_text_regions(image: Image.Image) -> List[Box]:
+    """
+    画像内の文字のある領域を検出します。
+    
+    縮小したグレースケール画像のモルフォロジー勾配を2値化し、文字の高さに合わせた
+    横方向のクロージングで文字を行にまとめた輪郭のうち、前景の密度が高いものを文字領域とします。
+    
+    Args:
+        image: 入力画像
+    
+    Returns:
+        元画像の座標での文字領域 (left, top, right, bottom) のリスト（余白付き、重なりはまとめ済み）
+    """
+    text_boxes, _ = _detect_boxes(image)
+    return merge_overlapping_boxes(text_boxes)
+
+
+def _grow_to_contours(box: Box, contours: Sequence[Box]) -> Box:
+    """
+    矩形の境界にかかる輪郭を含むまで矩形を広げます（切り出しで文字を切らないため）。
+    """
+    grown = box
+    changed = True
+    while changed:
+        changed = False
+        for contour in contours:
+            if _boxes_touch(grown, contour) and _union([grown, contour]) != grown:
+                grown = _union([grown, contour])
+                changed = True
+    return grown
+
+
+def get_ocr_data_by_regions(
+    image: Image.Image,
+    lang: str = 'eng',
+    psm_mode: str = DEFAULT_PSM_MODE,
+    separate: bool = False,
+    tier: Optional[str] = None
+) -> Dict[str, List]:
+    """
+    文字領域だけを切り出してOCRし、座標を元画像に戻します。
+    
+    文字領域が検出できない場合や、ページの大部分を占める場合は画像全体をOCRします。
+    
+    Args:
+        image: 入力画像
+        lang: 言語コード
+        psm_mode: Page Segmentation Mode
+        separate: 領域ごとに認識するか（Falseでは全領域の外接矩形を1回で認識）
+        tier: 学習データの種類
+    
+    Returns:
+        OCRデータ（元画像の座標）
+    """
+    backend = get_backend(tier=tier)
+    text_boxes, contours = _detect_boxes(image)
+    regions = merge_overlapping_boxes(text_boxes)
+    if not regions:
+        return backend.image_to_data(image, lang, psm_mode)
+    
+    if not separate or len(regions) > REGION_MAX_COUNT:
+        regions = [_union(regions)]
+    regions = merge_overlapping_boxes([_grow_to_contours(box, contours) for box in regions])
+    area = sum((box[2] - box[0]) * (box[3] - box[1]) for box in regions)
+    if area >= REGION_MAX_AREA_RATIO * image.width * image.height:
+        return backend.image_to_data(image, lang, psm_mode)
+    
+    crops = [image.crop(box) for box in regions]
+    if len(crops) == 1:
+        region_results = [backend.image_to_data(crops[0], lang, psm_mode)]
+    else:
+        region_results = backend.image_to_data_batch(crops, lang, psm_mode)
+    return merge_offset_results(regions, region_results, image.size)
@@ -0,0 +1,250 @@
+"""
+OCR結果モジュール
+OCRデータを列ごとの連続したnumpy配列として保持し、ベクトル化した集計・絞り込みを提供します。
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from ocr_backend import TSV_HEADER
+
+
+# 整数（int32）で保持する列
+INT_COLUMNS = (
+    'level', 'page_num', 'block_num', 'par_num', 'line_num', 'word_num',
+    'left', 'top', 'width', 'height',
+)
+
+# 単語レベル（TSVのlevel列）
+WORD_LEVEL = 5
+
+# TSVの列数
+TSV_COLUMN_COUNT = len(TSV_HEADER.split('\t'))
+
+
+def _split_tsv_rows(rows: List[str]) -> List[str]:
+    """
+    TSVの行を列に分割し、1次元のセルのリストにします。
+    
+    全行が同じ列数であれば一括で分割し、そうでない場合（末尾の空テキストが
+    欠けている行など）は行ごとに列数を揃えます。
+    """
+    cells = '\t'.join(rows).split('\t')
+    if len(cells) == len(rows) * TSV_COLUMN_COUNT:
+        return cells
+    
+    cells = []
+    for row in rows:
+        row_cells = row.split('\t', TSV_COLUMN_COUNT - 1)
+        row_cells += [''] * (TSV_COLUMN_COUNT - len(row_cells))
+        cells.extend(row_cells)
+    return cells
+
+
+def parse_tsv(tsv: Union[str, bytes]) -> "OCRResult":
+    """
+    tesseractのTSV出力を型付き配列のOCR結果に変換します。
+    
+    セルごとにPythonで型変換する代わりに、全セルを一括で分割し、
+    数値列はnumpyでまとめて変換します。
+    
+    Args:
+        tsv: TSV文字列またはバイト列（ヘッダー行の有無は問いません）
+    
+    Returns:
+        OCR結果
+    """
+    if isinstance(tsv, bytes):
+        tsv = tsv.decode('utf-8')
+    
+    rows = tsv.strip('\r\n').split('\n')
+    if rows and rows[0].startswith('level\t'):
+        rows = rows[1:]
+    rows = [row.rstrip('\r') for row in rows if row]
+    if not rows:
+        return OCRResult.from_dict({})
+    
+    cells = _split_tsv_rows(rows)
+    text = cells[TSV_COLUMN_COUNT - 1::TSV_COLUMN_COUNT]
+    del cells[TSV_COLUMN_COUNT - 1::TSV_COLUMN_COUNT]
+    
+    # 数値列（text以外の11列）を一括で変換
+    numbers = np.array(cells, dtype=np.float64).reshape(len(rows), TSV_COLUMN_COUNT - 1)
+    header = TSV_HEADER.split('\t')
+    columns = {
+        column: numbers[:, header.index(column)].astype(np.int32)
+        for column in INT_COLUMNS
+    }
+    conf = numbers[:, header.index('conf')].astype(np.float32)
+    return OCRResult(columns, conf, text)
+
+
+class OCRResult:
+    """
+    列指向のOCR結果
+    
+    - 座標・構造の列はint32、confはfloat32の連続した配列で保持します。
+    - textは単語の文字列のリストで保持します。
+    - result['conf'] のように列名で参照でき、dict形式のOCRデータと同じように読み出せます。
+    - スライスによる絞り込みはコピーせず元の配列のビューを返します。
+    """
+    
+    def __init__(
+        self,
+        columns: Dict[str, np.ndarray],
+        conf: np.ndarray,
+        text: List[str]
+    ):
+        self.columns = columns
+        self.conf = conf
+        self.text = text
+        self._text_mask: Optional[np.ndarray] = None
+    
+    @classmethod
+    def from_dict(cls, ocr_data: Dict[str, List]) -> "OCRResult":
+        """
+        dict形式（pytesseractのOutput.DICT形式）のOCRデータから作成します。
+        
+        Args:
+            ocr_data: OCRデータ
+        
+        Returns:
+            OCR結果
+        """
+        text = list(ocr_data.get('text', []))
+        row_count = len(text)
+        columns = {
+            column: np.asarray(ocr_data.get(column, np.zeros(row_count)), dtype=np.int32)
+            for column in INT_COLUMNS
+        }
+        conf = np.asarray(ocr_data.get('conf', np.full(row_count, -1)), dtype=np.float32)
+        return cls(columns, conf, text)
+    
+    @classmethod
+    def from_data(cls, ocr_data: Union["OCRResult", Dict[str, List]]) -> "OCRResult":
+        """
+        OCR結果またはdict形式のOCRデータからOCR結果を取得します（OCR結果はそのまま返します）。
+        
+        Args:
+            ocr_data: OCR結果またはOCRデータ
+        
+        Returns:
+            OCR結果
+        """
+        if isinstance(ocr_data, cls):
+            return ocr_data
+        return cls.from_dict(ocr_data)
+    
+    def __len__(self) -> int:
+        return len(self.text)
+    
+    def __getitem__(self, column: str) -> Union[np.ndarray, List[str]]:
+        if column == 'text':
+            return self.text
+        if column == 'conf':
+            return self.conf
+        return self.columns[column]
+    
+    def keys(self) -> List[str]:
+        """
+        列名の一覧を返します（TSVと同じ順序）。
+        """
+        return TSV_HEADER.split('\t')
+    
+    def text_mask(self) -> np.ndarray:
+        """
+        テキストが空でない行を示す真偽値配列を返します。
+        """
+        if self._text_mask is None:
+            self._text_mask = np.fromiter(
+                (bool(word.strip()) for word in self.text), dtype=bool, count=len(self.text)
+            )
+        return self._text_mask
+    
+    def valid_mask(self) -> np.ndarray:
+        """
+        テキストが空でなく、信頼度が-1でない行（認識された単語）を示す真偽値配列を返します。
+        """
+        return self.text_mask() & (self.conf != -1)
+    
+    def select(self, rows: Union[slice, np.ndarray, Sequence[int]]) -> "OCRResult":
+        """
+        指定した行のみを含むOCR結果を返します。
+        
+        スライスの場合は配列のビュー（コピーなし）、真偽値配列や行番号の場合はコピーになります。
+        
+        Args:
+            rows: スライス、真偽値配列、または行番号の配列
+        
+        Returns:
+            絞り込んだOCR結果
+        """
+        if isinstance(rows, slice):
+            return OCRResult(
+                {column: values[rows] for column, values in self.columns.items()},
+                self.conf[rows],
+                self.text[rows]
+            )
+        
+        indices = np.asarray(rows)
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+        return OCRResult(
+            {column: values[indices] for column, values in self.columns.items()},
+            self.conf[indices],
+            [self.text[i] for i in indices]
+        )
+    
+    def words(self) -> "OCRResult":
+        """
+        認識された単語（valid_maskに該当する行）のみを含むOCR結果を返します。
+        """
+        return self.select(self.valid_mask())
+    
+    def average_confidence(self) -> float:
+        """
+        認識された単語の平均信頼度を計算します。
+        
+        Returns:
+            平均信頼度（0〜100、単語が無い場合は0.0）
+        """
+        confidences = self.conf[self.valid_mask()]
+        if confidences.size == 0:
+            return 0.0
+        return float(confidences.mean(dtype=np.float64))
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        認識された単語の統計情報を計算します。
+        
+        Returns:
+            単語数、平均・最小・最大信頼度
+        """
+        confidences = self.conf[self.valid_mask()]
+        if confidences.size == 0:
+            return {'words': 0, 'mean_conf': 0.0, 'min_conf': 0.0, 'max_conf': 0.0}
+        return {
+            'words': int(confidences.size),
+            'mean_conf': float(confidences.mean(dtype=np.float64)),
+            'min_conf': float(confidences.min()),
+            'max_conf': float(confidences.max()),
+        }
+    
+    def to_dict(self) -> Dict[str, List]:
+        """
+        dict形式（pytesseractのOutput.DICT形式）のOCRデータに変換します。
+        
+        Returns:
+            OCRデータ
+        """
+        ocr_data: Dict[str, List] = {}
+        for column in self.keys():
+            if column == 'text':
+                ocr_data[column] = list(self.text)
+            elif column == 'conf':
+                # pytesseractと同様に整数へ変換
+                ocr_data[column] = self.conf.astype(np.int64).tolist()
+            else:
+                ocr_data[column] = self.columns[column].tolist()
+        return ocr_data
@@ -0,0 +1,323 @@
+"""
+OCR結果ストアモジュール
+OCR結果をSQLite（WALモード）に永続化し、再起動後や複数プロセス間で共有します。
+"""
+
+import numbers
+import os
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+from array import array
+from typing import Dict, List, Optional
+
+from config import OCR_STORE_PATH, OCR_STORE_MAX_BYTES
+from ocr_cache import CachedResult
+
+
+# OCRデータのエンコード形式のバージョン
+OCR_DATA_FORMAT_VERSION = 2
+
+# 読み込みに対応する形式のバージョン（1は整数の列と文字列の列のみ）
+SUPPORTED_FORMAT_VERSIONS = (1, 2)
+
+# 32ビット整数の範囲
+INT32_MIN, INT32_MAX = -2 ** 31, 2 ** 31 - 1
+
+# 参照日時の更新間隔（秒）。読み込みのたびに書き込みが発生しないよう間引く
+ACCESS_TOUCH_INTERVAL = 60.0
+
+# 上限超過時に削除後の合計サイズを上限のこの割合まで減らす
+EVICTION_TARGET_RATIO = 0.9
+
+# SQLiteのロック待ち時間（秒）
+SQLITE_TIMEOUT = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    ocr_data BLOB NOT NULL,
+    avg_confidence REAL NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (name, value) VALUES ('total_bytes', 0);
+"""
+
+
+def encode_ocr_data(ocr_data: Dict[str, List]) -> bytes:
+    """
+    OCRデータを圧縮したバイナリ形式にエンコードします。
+    
+    列の値の種類ごとに、整数のみの列は整数の配列、整数と小数のみの列は倍精度小数の配列、
+    それ以外の列は改行区切りの文字列として格納します（TSV由来のテキストは改行を含まないため）。
+    numpyの整数・小数もPythonの数値と同様に扱います。
+    
+    Args:
+        ocr_data: OCRデータ
+    
+    Returns:
+        エンコードされたバイト列
+    """
+    parts = [struct.pack('<BH', OCR_DATA_FORMAT_VERSION, len(ocr_data))]
+    for column, values in ocr_data.items():
+        name = column.encode('utf-8')
+        kind = _column_kind(values)
+        if kind == b'i':
+            payload = array('i', [int(value) for value in values]).tobytes()
+        elif kind == b'q':
+            payload = array('q', [int(value) for value in values]).tobytes()
+        elif kind == b'd':
+            payload = array('d', [float(value) for value in values]).tobytes()
+        else:
+            kind, payload = b's', '\n'.join(str(value) for value in values).encode('utf-8')
+        parts.append(struct.pack('<H', len(name)) + name + kind)
+        parts.append(struct.pack('<II', len(values), len(payload)) + payload)
+    return zlib.compress(b''.join(parts))
+
+
+def _column_kind(values: List) -> bytes:
+    """
+    列の格納形式を決定します。
+    
+    Returns:
+        b'i'（32ビット整数）、b'q'（64ビット整数）、b'd'（倍精度小数）、b's'（文字列）のいずれか
+    """
+    if not all(isinstance(value, numbers.Real) and not isinstance(value, bool) for value in values):
+        return b's'
+    if not all(isinstance(value, numbers.Integral) for value in values):
+        return b'd'
+    if all(INT32_MIN <= value <= INT32_MAX for value in values):
+        return b'i'
+    return b'q'
+
+
+def decode_ocr_data(blob: bytes) -> Dict[str, List]:
+    """
+    encode_ocr_dataでエンコードしたバイト列をOCRデータに戻します。
+    
+    Args:
+        blob: エンコードされたバイト列
+    
+    Returns:
+        OCRデータ
+    """
+    data = zlib.decompress(blob)
+    version, column_count = struct.unpack_from('<BH', data, 0)
+    if version not in SUPPORTED_FORMAT_VERSIONS:
+        raise ValueError(f"未対応のOCRデータ形式です: {version}")
+    
+    offset = 3
+    ocr_data: Dict[str, List] = {}
+    for _ in range(column_count):
+        (name_length,) = struct.unpack_from('<H', data, offset)
+        offset += 2
+        column = data[offset:offset + name_length].decode('utf-8')
+        kind = data[offset + name_length:offset + name_length + 1]
+        offset += name_length + 1
+        count, payload_length = struct.unpack_from('<II', data, offset)
+        offset += 8
+        payload = data[offset:offset + payload_length]
+        offset += payload_length
+        
+        if kind in (b'i', b'q', b'd'):
+            values: List = array(kind.decode('ascii'), payload).tolist()
+        else:
+            values = payload.decode('utf-8').split('\n') if count else []
+        ocr_data[column] = values
+    return ocr_data
+
+
+class OCRResultStore:
+    """
+    SQLite（WALモード）を使用した永続的なOCR結果ストア
+    
+    - キーはOCRResultCacheと同じ形式（画像ハッシュ + OCRパラメータ）です。
+    - 合計サイズがmax_bytesを超えた場合、参照日時の古い結果から削除します。
+    - 接続はスレッドごとに作成し、複数プロセスからの同時読み書きはWALとロック待ちで扱います。
+    """
+    
+    def __init__(self, path: str, max_bytes: int = OCR_STORE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        
+        connection = self._connect()
+        with connection:
+            connection.executescript(_SCHEMA)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """
+        現在のスレッド用の接続を取得します（未作成なら作成）。
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=SQLITE_TIMEOUT, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+    
+    def get(self, key: str) -> Optional[CachedResult]:
+        """
+        ストアから結果を取得します。
+        
+        Args:
+            key: キャッシュキー
+        
+        Returns:
+            (テキスト, OCRデータ, 平均信頼度)、存在しない場合はNone
+        """
+        connection = self._connect()
+        row = connection.execute(
+            'SELECT text, ocr_data, avg_confidence, accessed FROM results WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        
+        text, blob, avg_confidence, accessed = row
+        now = time.time()
+        if now - accessed > ACCESS_TOUCH_INTERVAL:
+            connection.execute('UPDATE results SET accessed = ? WHERE key = ?', (now, key))
+        return text, decode_ocr_data(blob), avg_confidence
+    
+    def put(self, key: str, result: CachedResult) -> None:
+        """
+        結果をストアに保存し、上限を超えた場合は古い結果を削除します。
+        
+        Args:
+            key: キャッシュキー
+            result: (テキスト, OCRデータ, 平均信頼度)
+        """
+        text, ocr_data, avg_confidence = result
+        blob = encode_ocr_data(ocr_data)
+        size = len(blob) + len(text.encode('utf-8'))
+        
+        connection = self._connect()
+        # 合計サイズの更新と削除を他の書き込みと直列化する
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            old = connection.execute('SELECT size FROM results WHERE key = ?', (key,)).fetchone()
+            connection.execute(
+                'INSERT OR REPLACE INTO results (key, text, ocr_data, avg_confidence, size, accessed) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (key, text, blob, float(avg_confidence), size, time.time())
+            )
+            delta = size - (old[0] if old else 0)
+            connection.execute(
+                "UPDATE meta SET value = value + ? WHERE name = 'total_bytes'", (delta,)
+            )
+            self._evict(connection)
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+    
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        """
+        合計サイズが上限を超えている場合、参照日時の古い結果から削除します。
+        （呼び出し側のトランザクション内で実行）
+        """
+        (total,) = connection.execute("SELECT value FROM meta WHERE name = 'total_bytes'").fetchone()
+        if total <= self.max_bytes:
+            return
+        
+        target = self.max_bytes * EVICTION_TARGET_RATIO
+        removed = 0
+        for key, size in connection.execute(
+            'SELECT key, size FROM results ORDER BY accessed'
+        ).fetchall():
+            if total - removed <= target:
+                break
+            connection.execute('DELETE FROM results WHERE key = ?', (key,))
+            removed += size
+        connection.execute(
+            "UPDATE meta SET value = value - ? WHERE name = 'total_bytes'", (removed,)
+        )
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        ストアの統計情報を取得します。
+        
+        Returns:
+            件数、使用バイト数
+        """
+        connection = self._connect()
+        (entries,) = connection.execute('SELECT COUNT(*) FROM results').fetchone()
+        (total,) = connection.execute("SELECT value FROM meta WHERE name = 'total_bytes'").fetchone()
+        return {'entries': entries, 'bytes': total}
+    
+    def clear(self) -> None:
+        """
+        保存されている全ての結果を削除します。
+        """
+        connection = self._connect()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            connection.execute('DELETE FROM results')
+            connection.execute("UPDATE meta SET value = 0 WHERE name = 'total_bytes'")
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+    
+    def close(self) -> None:
+        """
+        現在のスレッドの接続を閉じます。
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+# プロセス内で共有するストア（未設定の場合は永続化しない）
+_default_store: Optional[OCRResultStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_result_store() -> Optional[OCRResultStore]:
+    """
+    共有のOCR結果ストアを取得します。
+    
+    OCR_STORE_PATHが設定されていれば初回呼び出し時に開きます。
+    
+    Returns:
+        OCR結果ストア（永続化しない場合はNone）
+    """
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None and OCR_STORE_PATH:
+            _default_store = OCRResultStore(OCR_STORE_PATH)
+        return _default_store
+
+
+def open_result_store(path: str, max_bytes: int = OCR_STORE_MAX_BYTES) -> OCRResultStore:
+    """
+    共有のOCR結果ストアを指定したパスで開きます。
+    
+    Args:
+        path: SQLiteデータベースのパス
+        max_bytes: 保存する結果の合計サイズの上限（バイト）
+    
+    Returns:
+        OCR結果ストア
+    """
+    global _default_store
+    store = OCRResultStore(path, max_bytes)
+    with _default_store_lock:
+        old_store, _default_store = _default_store, store
+    if old_store is not None:
+        old_store.close()
+    return store
@@ -0,0 +1,154 @@
+"""
+OCRスレッド配分モジュール
+TesseractのOpenMPスレッド数（OMP_THREAD_LIMIT）をCPUコア数とプロセス数から配分します。
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+from config import OCR_CPU_BUDGET, OMP_THREAD_MODE, OMP_MULTI_THREADS
+
+
+# スレッド配分のモード
+THREAD_MODES = ("single", "multi")
+
+# 計測で選択されたモード（None = 未計測）
+_calibrated_mode: Optional[str] = None
+
+# このプロセスに割り当てられたスレッド数（None = ワーカープロセスではない）
+_process_threads: Optional[int] = None
+
+# スレッドごとに固定したスレッド数（計測用）
+_local = threading.local()
+
+
+def get_cpu_budget() -> int:
+    """
+    OCRに使用できるCPUコア数を取得します。
+    
+    Returns:
+        CPUコア数（OCR_CPU_BUDGET、またはこのプロセスが使用できるコア数）
+    """
+    if OCR_CPU_BUDGET:
+        return OCR_CPU_BUDGET
+    if hasattr(os, 'sched_getaffinity'):
+        # コンテナやtasksetで制限されたコア数を優先
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def get_thread_mode() -> str:
+    """
+    現在のスレッド配分のモードを取得します。
+    
+    OMP_THREAD_MODEが"auto"で未計測の場合は"single"を返します。
+    
+    Returns:
+        "single"（単一スレッドのプロセスを多数）または "multi"（複数スレッドのプロセスを少数）
+    """
+    if OMP_THREAD_MODE != "auto":
+        return OMP_THREAD_MODE
+    return _calibrated_mode or "single"
+
+
+def set_thread_mode(mode: str) -> None:
+    """
+    スレッド配分のモードを設定します（計測結果の反映用）。
+    
+    Args:
+        mode: "single" または "multi"
+    """
+    global _calibrated_mode
+    if mode not in THREAD_MODES:
+        raise ValueError(f"未知のスレッド配分のモードです: {mode}")
+    _calibrated_mode = mode
+
+
+def worker_layout(workers: Optional[int] = None) -> Tuple[int, int]:
+    """
+    プロセス数と1プロセスあたりのスレッド数を決定します。
+    
+    Args:
+        workers: プロセス数（省略時はスレッド配分のモードから決定）
+    
+    Returns:
+        (プロセス数, 1プロセスあたりのスレッド数)
+    """
+    budget = get_cpu_budget()
+    if not workers:
+        threads = 1 if get_thread_mode() == "single" else min(OMP_MULTI_THREADS, budget)
+        workers = max(budget // threads, 1)
+    return workers, max(budget // workers, 1)
+
+
+def set_process_threads(threads: int) -> None:
+    """
+    このプロセスに割り当てるスレッド数を設定します（ワーカープロセスの初期化用）。
+    
+    libtesseractはOpenMPの初期化時に環境変数を読むため、読み込み前に呼び出します。
+    
+    Args:
+        threads: スレッド数
+    """
+    global _process_threads
+    _process_threads = max(int(threads), 1)
+    os.environ['OMP_THREAD_LIMIT'] = str(_process_threads)
+
+
+def invocation_threads(concurrency: Optional[int] = None) -> Optional[int]:
+    """
+    tesseractの1回の実行に割り当てるスレッド数を返します。
+    
+    実際に並行して実行される場合（ワーカープロセス、または同時実行数を指定した非同期実行）は、
+    先に始まった実行がCPUコアを使い切らないよう一定の持ち分に制限します。
+    単独の実行は制限しません。
+    
+    Args:
+        concurrency: 同時に実行するtesseractの数（省略時は単独の実行）
+    
+    Returns:
+        スレッド数（None = 制限しない）
+    """
+    fixed = getattr(_local, 'threads', None)
+    if fixed is not None:
+        return fixed
+    if _process_threads is not None:
+        return _process_threads
+    if concurrency:
+        return worker_layout(concurrency)[1]
+    return None
+
+
+@contextmanager
+def fixed_threads(threads: int) -> Iterator[None]:
+    """
+    このスレッドから実行するtesseractのスレッド数を固定します（計測用）。
+    
+    Args:
+        threads: スレッド数
+    """
+    previous = getattr(_local, 'threads', None)
+    _local.threads = threads
+    try:
+        yield
+    finally:
+        _local.threads = previous
+
+
+def thread_limit_env(threads: Optional[int]) -> Optional[Dict[str, str]]:
+    """
+    OMP_THREAD_LIMITを設定した子プロセス用の環境変数を作成します。
+    
+    Args:
+        threads: スレッド数（None = 制限しない）
+    
+    Returns:
+        環境変数（制限しない場合はNone = 親プロセスの環境をそのまま継承）
+    """
+    if threads is None:
+        return None
+    env = dict(os.environ)
+    env['OMP_THREAD_LIMIT'] = str(threads)
+    return env
@@ -0,0 +1,403 @@
+"""
+OCRワーカープールモジュール
+言語ごとにエンジンを常駐させたTesseractワーカープロセスのプールを提供します。
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pytesseract
+from PIL import Image
+
+from config import (
+    LANGUAGES,
+    AUTO_LANGUAGE,
+    DEFAULT_OEM_MODE,
+    WORKER_POOL_SIZE,
+    WORKER_MAX_TASKS,
+    WORKER_BACKEND,
+)
+from ocr_backend import OCRBackend, SubprocessBackend, get_backend, register_backend
+from ocr_threads import set_process_threads, worker_layout
+
+
+# ワーカープロセス内で使用するバックエンド
+_worker_backend: Optional[OCRBackend] = None
+
+
+def _init_worker(
+    lang: str,
+    backend_name: str,
+    oem_mode: str,
+    tessdata_dir: Optional[str] = None,
+    threads: int = 1
+) -> None:
+    """
+    ワーカープロセスの初期化処理。バックエンドを生成し、言語モデルを読み込みます。
+    """
+    global _worker_backend
+    # libtesseractの読み込み前にOpenMPのスレッド数を制限
+    set_process_threads(threads)
+    try:
+        _worker_backend = get_backend(backend_name, tessdata_dir=tessdata_dir)
+    except OSError:
+        # libtesseractが無い環境ではtesseractコマンドで代替
+        _worker_backend = get_backend(SubprocessBackend.name, tessdata_dir=tessdata_dir)
+    _worker_backend.warm_up(lang, oem_mode)
+
+
+def _warm_task() -> None:
+    """
+    ワーカープロセスを起動させるための空タスク。
+    """
+
+
+def _run_task(
+    method: str,
+    image: Image.Image,
+    lang: str,
+    psm_mode: str,
+    oem_mode: str,
+    *extra_args: Any
+) -> Any:
+    """
+    ワーカープロセス内でOCRを実行します。
+    """
+    try:
+        return getattr(_worker_backend, method)(image, lang, psm_mode, oem_mode, *extra_args)
+    except (pytesseract.TesseractError, pytesseract.TesseractNotFoundError) as e:
+        # pytesseractの例外は独自の__init__を持ちpickleで復元できず、
+        # 親プロセス側でプールが壊れたと判定されるため変換して返す
+        raise RuntimeError(str(e)) from None
+
+
+class OCRWorkerPool:
+    """
+    言語セットごとに常駐ワーカープロセスを持つOCRプール
+    
+    - 言語コード（"eng", "jpn", "eng+jpn" など）と学習データのディレクトリの組ごとに
+      専用のプロセスプールへ振り分けます。
+    - ワーカーは平均max_tasks_per_worker件処理するごとにプール単位で再起動されます。
+    - ワーカーがクラッシュした場合はプールを作り直し、タスクを1回だけ再投入します。
+    - 各ワーカーのOpenMPスレッド数は、全言語のワーカー数でCPUコア数を等分した値に制限します。
+    """
+    
+    def __init__(
+        self,
+        languages: Optional[Iterable[str]] = None,
+        workers_per_language: int = WORKER_POOL_SIZE,
+        max_tasks_per_worker: int = WORKER_MAX_TASKS,
+        backend_name: str = WORKER_BACKEND,
+        oem_mode: str = DEFAULT_OEM_MODE
+    ):
+        self.languages: List[str] = [
+            lang for lang in (languages or LANGUAGES.values()) if lang != AUTO_LANGUAGE
+        ]
+        self.workers_per_language = workers_per_language
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.backend_name = backend_name
+        self.oem_mode = oem_mode
+        self._executors: Dict[Tuple[str, Optional[str]], ProcessPoolExecutor] = {}
+        self._task_counts: Dict[Tuple[str, Optional[str]], int] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+    
+    def start(self) -> None:
+        """
+        設定された全言語のワーカーを起動し、エンジンを読み込ませます。
+        """
+        for lang in self.languages:
+            executor = self._get_executor((lang, None), count_task=False)
+            # 空タスクを投入してワーカープロセスを起動させる
+            for _ in range(self.workers_per_language):
+                executor.submit(_warm_task)
+    
+    def _create_executor(self, key: Tuple[str, Optional[str]]) -> ProcessPoolExecutor:
+        lang, tessdata_dir = key
+        _, threads = worker_layout(self.workers_per_language * max(len(self.languages), 1))
+        # 親プロセスのlibtesseractハンドルやスレッドを引き継がないようspawnを使用
+        return ProcessPoolExecutor(
+            max_workers=self.workers_per_language,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(lang, self.backend_name, self.oem_mode, tessdata_dir, threads),
+        )
+    
+    def _get_executor(self, key: Tuple[str, Optional[str]], count_task: bool = True) -> ProcessPoolExecutor:
+        """
+        (言語, 学習データのディレクトリ) に対応するプールを取得します（未作成なら作成）。
+        
+        プールがworkers_per_language * max_tasks_per_worker件を処理したら
+        新しいプールに入れ替え、古いプールは実行中のタスクの完了後に終了させます。
+        （ProcessPoolExecutorのmax_tasks_per_childはPython 3.12初期版でハングするため使用しない）
+        """
+        retired = None
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("ワーカープールは既に終了しています")
+            if key not in self._executors:
+                self._executors[key] = self._create_executor(key)
+                self._task_counts[key] = 0
+            elif self._task_counts[key] >= self.workers_per_language * self.max_tasks_per_worker:
+                retired = self._executors[key]
+                self._executors[key] = self._create_executor(key)
+                self._task_counts[key] = 0
+            if count_task:
+                self._task_counts[key] += 1
+            executor = self._executors[key]
+        if retired is not None:
+            retired.shutdown(wait=False)
+        return executor
+    
+    def _restart_executor(self, key: Tuple[str, Optional[str]], broken: ProcessPoolExecutor) -> None:
+        """
+        クラッシュしたプールを新しいプールに置き換えます。
+        
+        壊れたプールのワーカーはconcurrent.futures側で終了済みのため、
+        参照を差し替えるだけにします（コールバック内からのshutdownはデッドロックする）。
+        """
+        with self._lock:
+            if self._closed or self._executors.get(key) is not broken:
+                # 既に別のタスクが再起動済み
+                return
+            self._executors[key] = self._create_executor(key)
+            self._task_counts[key] = 0
+    
+    def submit(
+        self,
+        method: str,
+        image: Image.Image,
+        lang: str,
+        psm_mode: str,
+        oem_mode: Optional[str] = None,
+        extra_args: Tuple = (),
+        retries: int = 1,
+        tessdata_dir: Optional[str] = None
+    ) -> Future:
+        """
+        OCRタスクを言語に対応するワーカーへ投入します。
+        
+        Args:
+            method: バックエンドのメソッド名（'image_to_string' / 'image_to_data'）
+            image: 入力画像
+            lang: 言語コード
+            psm_mode: Page Segmentation Mode
+            oem_mode: OCR Engine Mode（省略時はプールの設定値）
+            extra_args: メソッドに追加で渡す引数
+            retries: ワーカーがクラッシュした場合の再投入回数
+            tessdata_dir: 学習データのディレクトリ（省略時はtesseractの既定）
+        
+        Returns:
+            結果を受け取るFuture
+        """
+        result: Future = Future()
+        args = (method, image, lang, psm_mode, oem_mode or self.oem_mode, *extra_args)
+        key = (lang, tessdata_dir)
+        
+        def attempt(remaining: int) -> None:
+            executor = self._get_executor(key)
+            try:
+                inner = executor.submit(_run_task, *args)
+            except BrokenProcessPool:
+                self._restart_executor(key, executor)
+                if remaining > 0:
+                    attempt(remaining - 1)
+                else:
+                    raise
+                return
+            
+            def on_done(inner_future: Future) -> None:
+                if inner_future.cancelled():
+                    result.set_exception(CancelledError())
+                    return
+                error = inner_future.exception()
+                if isinstance(error, BrokenProcessPool):
+                    self._restart_executor(key, executor)
+                    if remaining > 0:
+                        try:
+                            attempt(remaining - 1)
+                        except Exception as e:
+                            result.set_exception(e)
+                        return
+                if error is not None:
+                    result.set_exception(error)
+                else:
+                    result.set_result(inner_future.result())
+            
+            inner.add_done_callback(on_done)
+        
+        result.set_running_or_notify_cancel()
+        attempt(retries)
+        return result
+    
+    def image_to_string(self, image: Image.Image, lang: str, psm_mode: str, oem_mode: Optional[str] = None) -> str:
+        """
+        ワーカーでテキストを抽出し、結果を待ちます。
+        """
+        return self.submit('image_to_string', image, lang, psm_mode, oem_mode).result()
+    
+    def image_to_data(
+        self,
+        image: Image.Image,
+        lang: str,
+        psm_mode: str,
+        oem_mode: Optional[str] = None,
+        variables: Optional[Dict[str, str]] = None
+    ) -> Dict[str, List]:
+        """
+        ワーカーでOCRデータを取得し、結果を待ちます。
+        """
+        return self.submit('image_to_data', image, lang, psm_mode, oem_mode, extra_args=(variables,)).result()
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        全てのワーカーを終了します。
+        
+        Args:
+            wait: 実行中のタスクの完了を待つか
+        """
+        with self._lock:
+            self._closed = True
+            executors = list(self._executors.values())
+            self._executors.clear()
+        for executor in executors:
+            executor.shutdown(wait=wait)
+    
+    def __enter__(self) -> "OCRWorkerPool":
+        self.start()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
+
+# プロセス内で共有するデフォルトのプール
+_default_pool: Optional[OCRWorkerPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_worker_pool() -> OCRWorkerPool:
+    """
+    共有のワーカープールを取得します（初回呼び出し時に生成）。
+    
+    Returns:
+        OCRワーカープール
+    """
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = OCRWorkerPool()
+        return _default_pool
+
+
+def shutdown_worker_pool(wait: bool = True) -> None:
+    """
+    共有のワーカープールを終了します。
+    
+    Args:
+        wait: 実行中のタスクの完了を待つか
+    """
+    global _default_pool
+    with _default_pool_lock:
+        pool, _default_pool = _default_pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait)
+
+
+class PooledBackend(OCRBackend):
+    """
+    共有ワーカープールへ処理を委譲するバックエンド
+    """
+    
+    name = "pool"
+    
+    def __init__(self, tessdata_dir: Optional[str] = None):
+        self.tessdata_dir = tessdata_dir
+    
+    def _submit(
+        self,
+        method: str,
+        image: Image.Image,
+        lang: str,
+        psm_mode: str,
+        oem_mode: str,
+        extra_args: Tuple = ()
+    ) -> Future:
+        return get_worker_pool().submit(
+            method, image, lang, psm_mode, oem_mode, extra_args=extra_args, tessdata_dir=self.tessdata_dir
+        )
+    
+    def image_to_string(
+        self,
+        image: Image.Image,
+        lang: str,
+        psm_mode: str,
+        oem_mode: str = DEFAULT_OEM_MODE
+    ) -> str:
+        return self._submit('image_to_string', image, lang, psm_mode, oem_mode).result()
+    
+    def image_to_data(
+        self,
+        image: Image.Image,
+        lang: str,
+        psm_mode: str,
+        oem_mode: str = DEFAULT_OEM_MODE,
+        variables: Optional[Dict[str, str]] = None
+    ) -> Dict[str, List]:
+        return self._submit('image_to_data', image, lang, psm_mode, oem_mode, (variables,)).result()
+    
+    def image_to_tsv(
+        self,
+        image: Image.Image,
+        lang: str,
+        psm_mode: str,
+        oem_mode: str = DEFAULT_OEM_MODE
+    ) -> str:
+        return self._submit('image_to_tsv', image, lang, psm_mode, oem_mode).result()
+    
+    def image_to_string_batch(
+        self,
+        images: Sequence[Image.Image],
+        lang: str,
+        psm_mode: str,
+        oem_mode: str = DEFAULT_OEM_MODE
+    ) -> List[str]:
+        # 全画像を先に投入し、ワーカー間で並列に処理させる
+        futures = [self._submit('image_to_string', image, lang, psm_mode, oem_mode) for image in images]
+        return [future.result() for future in futures]
+    
+    def image_to_data_batch(
+        self,
+        images: Sequence[Image.Image],
+        lang: str,
+        psm_mode: str,
+        oem_mode: str = DEFAULT_OEM_MODE,
+        variables: Optional[Dict[str, str]] = None
+    ) -> List[Dict[str, List]]:
+        futures = [
+            self._submit('image_to_data', image, lang, psm_mode, oem_mode, (variables,))
+            for image in images
+        ]
+        return [future.result() for future in futures]
+    
+    def image_to_outputs(
+        self,
+        image: Image.Image,
+        lang: str,
+        psm_mode: str,
+        oem_mode: str = DEFAULT_OEM_MODE,
+        output_formats: Sequence[str] = ("txt", "tsv")
+    ) -> Dict[str, Any]:
+        future = self._submit(
+            'image_to_outputs', image, lang, psm_mode, oem_mode, (tuple(output_formats),)
+        )
+        return future.result()
+    
+    def close(self) -> None:
+        shutdown_worker_pool()
+
+
+register_backend(PooledBackend.name, PooledBackend)
@@ -0,0 +1,9 @@
+"""
+テスト共通設定
+リポジトリ直下のモジュールをimportできるようにします。
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,107 @@
+"""
+ocr_backend のテスト
+"""
+
+import asyncio
+import io
+import sys
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import ocr_backend
+from ocr_backend import encode_pnm, prepare_image, run_tesseract_async
+
+
+def _sixteen_bit_scan() -> Image.Image:
+    """
+    白地（60000）に黒い文字の代わりの矩形（4000）がある16ビットのグレースケール画像を作成します。
+    """
+    pixels = np.full((40, 60), 60000, dtype=np.uint16)
+    pixels[10:30, 10:50] = 4000
+    return Image.fromarray(pixels)
+
+
+def test_sixteen_bit_scan_keeps_contrast():
+    image = _sixteen_bit_scan()
+    assert image.mode == 'I;16'
+    
+    prepared = np.asarray(prepare_image(image))
+    
+    assert prepared.dtype == np.uint8
+    assert prepared[0, 0] == 60000 >> 8
+    assert prepared[20, 20] == 4000 >> 8
+
+
+@pytest.mark.parametrize('mode', ['I', 'F'])
+def test_wide_grayscale_is_scaled_to_full_range(mode):
+    image = _sixteen_bit_scan().convert(mode)
+    
+    prepared = np.asarray(prepare_image(image))
+    
+    assert prepared[0, 0] == 255
+    assert prepared[20, 20] == 0
+
+
+def test_pnm_of_sixteen_bit_scan_is_not_blank():
+    encoded = Image.open(io.BytesIO(encode_pnm(_sixteen_bit_scan())))
+    
+    assert encoded.mode == 'L'
+    assert np.asarray(encoded).min() < 128
+
+
+# 終了しない子プロセス（tesseractの代わり）
+SLEEPING_COMMAND = [sys.executable, '-c', 'import time; time.sleep(60)']
+
+
+def test_cancelled_run_kills_the_child(monkeypatch):
+    procs = []
+    spawn = asyncio.create_subprocess_exec
+    
+    async def tracking_spawn(*args, **kwargs):
+        proc = await spawn(*args, **kwargs)
+        procs.append(proc)
+        return proc
+    
+    monkeypatch.setattr(ocr_backend.asyncio, 'create_subprocess_exec', tracking_spawn)
+    
+    async def scenario():
+        task = asyncio.ensure_future(run_tesseract_async(SLEEPING_COMMAND))
+        while not procs:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    
+    asyncio.run(scenario())
+    
+    assert procs[0].returncode is not None
+
+
+def test_cancel_during_spawn_kills_the_child(monkeypatch):
+    procs = []
+    started = []
+    spawn = asyncio.create_subprocess_exec
+    
+    async def slow_spawn(*args, **kwargs):
+        # 子プロセスの起動後、呼び出し元に返る前にキャンセルされる状況を再現
+        proc = await spawn(*args, **kwargs)
+        procs.append(proc)
+        started.append(True)
+        await asyncio.sleep(0.2)
+        return proc
+    
+    monkeypatch.setattr(ocr_backend.asyncio, 'create_subprocess_exec', slow_spawn)
+    
+    async def scenario():
+        task = asyncio.ensure_future(run_tesseract_async(SLEEPING_COMMAND))
+        while not started:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    
+    asyncio.run(scenario())
+    
+    assert procs[0].returncode is not None
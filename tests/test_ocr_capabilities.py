@@ -0,0 +1,16 @@
+"""
+ocr_capabilities のテスト
+"""
+
+from ocr_capabilities import get_available_languages
+
+
+def test_languages_are_read_from_the_given_tessdata_dir(tmp_path):
+    for name in ('eng.traineddata', 'jpn.traineddata', 'eng.user-words', 'README'):
+        (tmp_path / name).write_bytes(b'')
+    
+    assert get_available_languages(str(tmp_path)) == ['eng', 'jpn']
+
+
+def test_missing_tessdata_dir_has_no_languages(tmp_path):
+    assert get_available_languages(str(tmp_path / 'missing')) == []
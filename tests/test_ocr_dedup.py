@@ -0,0 +1,88 @@
+"""
+ocr_dedup のテスト
+"""
+
+import io
+
+from PIL import Image, ImageDraw, ImageFont
+
+from ocr_dedup import NearDuplicateIndex, compute_dhash, compute_thumbnail
+
+
+def _invoice(total: str) -> Image.Image:
+    """
+    明細行が同じで合計金額だけが異なる請求書風のページを作成します。
+    """
+    font = ImageFont.load_default(28)
+    image = Image.new('L', (1240, 1754), 255)
+    draw = ImageDraw.Draw(image)
+    draw.text((100, 80), "INVOICE", font=font, fill=0)
+    for row in range(30):
+        draw.text((100, 200 + row * 48), f"item line {row} amount {row * 37 % 100}", font=font, fill=0)
+    draw.text((800, 1660), f"TOTAL {total}", font=font, fill=0)
+    return image
+
+
+def _recompressed(image: Image.Image) -> Image.Image:
+    """
+    縮小してJPEGで再圧縮した画像を作成します（再スキャン相当）。
+    """
+    buffer = io.BytesIO()
+    image.resize((image.width * 9 // 10, image.height * 9 // 10)).save(buffer, 'JPEG', quality=40)
+    return Image.open(buffer).convert('L')
+
+
+def _index_with(image: Image.Image) -> NearDuplicateIndex:
+    index = NearDuplicateIndex()
+    index.add('params', compute_dhash(image), 'original', image.size, compute_thumbnail(image))
+    return index
+
+
+def test_same_layout_with_different_content_is_not_reused():
+    original = _invoice("1234.00")
+    other = _invoice("9876.50")
+    
+    found = _index_with(original).find('params', compute_dhash(other), compute_thumbnail(other), other.size)
+    
+    assert found is None
+
+
+def test_recompressed_copy_is_found():
+    original = _invoice("1234.00")
+    copy = _recompressed(original)
+    
+    found = _index_with(original).find('params', compute_dhash(copy), compute_thumbnail(copy), copy.size)
+    
+    assert found == ('original', original.size)
+
+
+def test_different_aspect_ratio_is_not_reused():
+    original = _invoice("1234.00")
+    cropped = original.crop((0, 0, 1240, 1600))
+    
+    found = _index_with(original).find('params', compute_dhash(cropped), compute_thumbnail(cropped), cropped.size)
+    
+    assert found is None
+
+
+def test_index_evicts_least_recently_used_thumbnails():
+    pages = [_invoice(f"{total}.00") for total in (1, 2, 3)]
+    thumbnails = [compute_thumbnail(page) for page in pages]
+    index = NearDuplicateIndex(max_bytes=2 * thumbnails[0].nbytes)
+    
+    for number, (page, thumbnail) in enumerate(zip(pages, thumbnails)):
+        index.add('params', compute_dhash(page), f'page{number}', page.size, thumbnail)
+    
+    assert len(index) == 2
+    assert index.find('params', compute_dhash(pages[0]), thumbnails[0], pages[0].size) is None
+    assert index.find('params', compute_dhash(pages[2]), thumbnails[2], pages[2].size) == ('page2', pages[2].size)
+
+
+def test_removed_entry_is_no_longer_found():
+    original = _invoice("1234.00")
+    index = _index_with(original)
+    
+    index.remove('params', 'original')
+    
+    assert len(index) == 0
+    assert index.find('params', compute_dhash(original), compute_thumbnail(original), original.size) is None
@@ -0,0 +1,35 @@
+"""
+ocr_engine のテスト
+"""
+
+from PIL import Image
+
+from config import DEFAULT_TESSDATA_TIER
+from ocr_engine import process_image_with_ocr
+
+
+def test_skipped_blank_page_is_flagged():
+    blank = Image.new('L', (800, 1000), 255)
+    
+    bbox_image, text, ocr_data, avg_confidence, status = process_image_with_ocr(
+        blank, skip_blank=True, use_cache=False, return_status=True, tier='standard'
+    )
+    
+    assert status == {'skipped': True, 'tier': 'standard'}
+    assert text == ''
+    assert avg_confidence == 0.0
+    assert bbox_image.size == blank.size
+
+
+def test_status_is_omitted_by_default():
+    blank = Image.new('L', (800, 1000), 255)
+    
+    assert len(process_image_with_ocr(blank, skip_blank=True, use_cache=False)) == 4
+
+
+def test_status_reports_default_tier():
+    blank = Image.new('L', (800, 1000), 255)
+    
+    *_, status = process_image_with_ocr(blank, skip_blank=True, use_cache=False, return_status=True)
+    
+    assert status['tier'] == DEFAULT_TESSDATA_TIER
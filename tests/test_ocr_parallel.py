@@ -0,0 +1,93 @@
+"""
+ocr_parallel のテスト
+"""
+
+from PIL import Image
+
+import ocr_parallel
+from config import LINE_STREAM_FALLBACK_TILE_SIZE
+from ocr_engine import ocr_data_to_text
+from ocr_parallel import OCR_DATA_COLUMNS, empty_ocr_data, merge_tile_results
+
+
+def _tile_data(words):
+    """
+    (テキスト, left, top, width, height, block, line) のリストからタイルのOCRデータを作成します。
+    """
+    data = empty_ocr_data()
+    for word_num, (text, left, top, width, height, block, line) in enumerate(words, start=1):
+        row = {
+            'level': 5, 'page_num': 1, 'block_num': block, 'par_num': 1, 'line_num': line,
+            'word_num': word_num, 'left': left, 'top': top, 'width': width, 'height': height,
+            'conf': 90, 'text': text,
+        }
+        for column in OCR_DATA_COLUMNS:
+            data[column].append(row[column])
+    return data
+
+
+def test_merge_tile_results_keeps_reading_order_across_tile_seam():
+    # 横に並んだ2タイル（重なり100px）に "The quick brown fox / jumps over the dog" が分かれている
+    tiles = [(0, 0, 600, 200), (500, 0, 1100, 200)]
+    left_tile = _tile_data([
+        ('The', 10, 20, 80, 30, 1, 1), ('quick', 110, 20, 120, 30, 1, 1),
+        ('jumps', 10, 80, 120, 30, 1, 2), ('over', 150, 80, 90, 30, 1, 2),
+    ])
+    right_tile = _tile_data([
+        ('brown', 50, 22, 120, 30, 1, 1), ('fox', 190, 22, 70, 30, 1, 1),
+        ('the', 50, 81, 70, 30, 1, 2), ('dog', 140, 81, 70, 30, 1, 2),
+    ])
+    
+    merged = merge_tile_results(tiles, [left_tile, right_tile], (1100, 200))
+    
+    assert ocr_data_to_text(merged) == 'The quick brown fox\njumps over the dog'
+    lines = {
+        merged['line_num'][i] for i in range(len(merged['text']))
+        if merged['level'][i] == 5
+    }
+    assert lines == {1, 2}
+
+
+def test_word_wider_than_tile_overlap_is_kept():
+    # 重なり200pxより長い単語（ページ座標 x 1790〜2010）はどちらのタイルでも端に接する
+    tiles = [(0, 0, 2000, 300), (1800, 0, 3800, 300)]
+    left_tile = _tile_data([
+        ('hello', 100, 50, 200, 60, 1, 1), ('extraordinar', 1790, 50, 210, 60, 1, 1),
+    ])
+    right_tile = _tile_data([
+        ('ordinarily', 0, 50, 210, 60, 1, 1), ('world', 1000, 50, 200, 60, 1, 1),
+    ])
+    
+    merged = merge_tile_results(tiles, [left_tile, right_tile], (3800, 300))
+    
+    # 中心（x 1900）を担当する左のタイルの読みが残る
+    assert ocr_data_to_text(merged) == 'hello extraordinar world'
+
+
+def test_clipped_word_is_dropped_when_another_tile_sees_it_whole():
+    tiles = [(0, 0, 2000, 300), (1800, 0, 3800, 300)]
+    # 左のタイルでは右端で切れているが、中心は左のタイルの担当範囲（x 1900未満）にある
+    left_tile = _tile_data([('hello', 100, 50, 200, 60, 1, 1), ('bound', 1830, 50, 170, 60, 1, 1)])
+    # 右のタイルでは端に接せずに全体が見えている
+    right_tile = _tile_data([('boundary', 30, 50, 150, 60, 1, 1), ('world', 1000, 50, 200, 60, 1, 1)])
+    
+    merged = merge_tile_results(tiles, [left_tile, right_tile], (3800, 300))
+    
+    assert ocr_data_to_text(merged) == 'hello boundary world'
+
+
+def test_line_streaming_falls_back_to_tiles_without_layout_analysis(monkeypatch):
+    calls = []
+    
+    def fake_tiled(image, lang, psm_mode, tile_size, tier=None):
+        calls.append(tile_size)
+        yield empty_ocr_data()
+        yield empty_ocr_data()
+    
+    monkeypatch.setattr(ocr_parallel, 'analyse_layout', lambda *args, **kwargs: None)
+    monkeypatch.setattr(ocr_parallel, 'iter_ocr_data_tiled', fake_tiled)
+    
+    chunks = list(ocr_parallel.iter_ocr_data_by_lines(Image.new('L', (2400, 3200), 255)))
+    
+    assert len(chunks) == 2
+    assert calls == [LINE_STREAM_FALLBACK_TILE_SIZE]
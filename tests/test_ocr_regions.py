@@ -0,0 +1,92 @@
+"""
+ocr_regions のテスト
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+
+import ocr_regions
+from ocr_parallel import empty_ocr_data
+
+
+TEST_IMAGE = Path(__file__).resolve().parent.parent / 'test_image.png'
+
+
+class _RecordingBackend:
+    """
+    OCRせずに空の結果を返すバックエンド
+    """
+    
+    def image_to_data(self, image, *args, **kwargs):
+        return empty_ocr_data()
+    
+    def image_to_data_batch(self, images, *args, **kwargs):
+        return [empty_ocr_data() for _ in images]
+
+
+def _draw_lines(size, lines, font_size, background=None):
+    """
+    (left, top, テキスト) の行を描画し、画像と各行の矩形を返します。
+    """
+    image = Image.new('RGB', size, 'white') if background is None else background.copy()
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default(font_size)
+    boxes = []
+    for left, top, text in lines:
+        boxes.append(draw.textbbox((left, top), text, font=font))
+        draw.text((left, top), text, font=font, fill='black')
+    return image, boxes
+
+
+def _photo(size):
+    """
+    なめらかに明るさが変化する写真風の背景を作成します。
+    """
+    noise = np.random.default_rng(0).normal(128, 40, (size[1] // 20, size[0] // 20, 3))
+    small = Image.fromarray(noise.clip(0, 255).astype('uint8'))
+    return small.resize(size, Image.Resampling.BICUBIC).filter(ImageFilter.GaussianBlur(20))
+
+
+def _cases():
+    yield 'photo_100px', _draw_lines((3000, 2000), [(700, 900, "Hello photo caption text")], 100, _photo((3000, 2000)))
+    yield 'page_80px', _draw_lines(
+        (2480, 3508),
+        [(200, 200, "First heading line"), (200, 500, "second line of body text here"), (200, 700, "third line of body text")],
+        80,
+    )
+    for font_size in (14, 24):
+        yield f'page_{font_size}px', _draw_lines(
+            (1240, 1754),
+            [(100, 100 + row * 3 * font_size, "the quick brown fox jumps over the lazy dog") for row in range(5)],
+            font_size,
+        )
+
+
+@pytest.mark.parametrize('name, image, boxes', [(name, *case) for name, case in _cases()])
+def test_crop_contains_every_text_line(monkeypatch, name, image, boxes):
+    captured = {}
+    
+    def capture(regions, results, image_size):
+        captured['regions'] = list(regions)
+        return empty_ocr_data()
+    
+    monkeypatch.setattr(ocr_regions, 'get_backend', lambda tier=None: _RecordingBackend())
+    monkeypatch.setattr(ocr_regions, 'merge_offset_results', capture)
+    
+    ocr_regions.get_ocr_data_by_regions(image)
+    
+    assert 'regions' in captured, f"{name}: 文字領域が検出されず画像全体をOCRしました"
+    for box in boxes:
+        assert any(
+            region[0] <= box[0] and region[1] <= box[1] and region[2] >= box[2] and region[3] >= box[3]
+            for region in captured['regions']
+        ), f"{name}: {box} が切り出し範囲 {captured['regions']} に含まれません"
+
+
+def test_detects_large_text_in_test_image():
+    regions = ocr_regions.detect_text_regions(Image.open(TEST_IMAGE))
+    
+    assert len(regions) == 3
@@ -0,0 +1,32 @@
+"""
+ocr_store のテスト
+"""
+
+import numpy as np
+
+from ocr_store import decode_ocr_data, encode_ocr_data
+
+
+def test_round_trip_keeps_numeric_types():
+    ocr_data = {
+        'level': [1, 5, 5],
+        'left': [np.int64(0), np.int32(12), np.int64(40)],
+        'conf': [-1, 91, 63.5],
+        'text': ['', 'hello', 'world'],
+    }
+    
+    decoded = decode_ocr_data(encode_ocr_data(ocr_data))
+    
+    assert decoded == {
+        'level': [1, 5, 5],
+        'left': [0, 12, 40],
+        'conf': [-1.0, 91.0, 63.5],
+        'text': ['', 'hello', 'world'],
+    }
+    assert all(type(value) is int for value in decoded['left'])
+    assert all(type(value) is float for value in decoded['conf'])
+
+
+def test_round_trip_empty_columns():
+    ocr_data = {'level': [], 'text': []}
+    assert decode_ocr_data(encode_ocr_data(ocr_data)) == ocr_data
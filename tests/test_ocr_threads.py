@@ -0,0 +1,68 @@
+"""
+ocr_threads のテスト（tesseractに渡すOMP_THREAD_LIMIT）
+"""
+
+import asyncio
+import subprocess
+
+import ocr_backend
+import ocr_threads
+
+
+def _capture_run(monkeypatch):
+    calls = []
+    
+    def fake_run(command, **kwargs):
+        calls.append(kwargs.get('env'))
+        return subprocess.CompletedProcess(command, 0, stdout=b'', stderr=b'')
+    
+    monkeypatch.setattr(ocr_backend.subprocess, 'run', fake_run)
+    return calls
+
+
+def test_lone_call_is_not_limited(monkeypatch):
+    monkeypatch.setattr(ocr_threads, '_process_threads', None)
+    monkeypatch.delenv('OMP_THREAD_LIMIT', raising=False)
+    calls = _capture_run(monkeypatch)
+    
+    ocr_backend.run_tesseract(['tesseract', '-', 'stdout'])
+    
+    env = calls[0]
+    assert env is None or 'OMP_THREAD_LIMIT' not in env
+
+
+def test_worker_process_passes_its_assigned_threads(monkeypatch):
+    monkeypatch.setattr(ocr_threads, '_process_threads', 3)
+    calls = _capture_run(monkeypatch)
+    
+    ocr_backend.run_tesseract(['tesseract', '-', 'stdout'])
+    
+    assert calls[0]['OMP_THREAD_LIMIT'] == '3'
+
+
+def test_async_calls_get_a_fixed_share(monkeypatch):
+    monkeypatch.setattr(ocr_threads, 'get_cpu_budget', lambda: 32)
+    monkeypatch.setattr(ocr_threads, '_process_threads', None)
+    monkeypatch.setattr(ocr_backend, 'ASYNC_MAX_PROCESSES', 8)
+    envs = []
+    
+    class FakeProcess:
+        returncode = 0
+        
+        async def communicate(self, input_bytes=None):
+            await asyncio.sleep(0)
+            return b'', b''
+    
+    async def fake_exec(*command, **kwargs):
+        envs.append(kwargs.get('env'))
+        return FakeProcess()
+    
+    monkeypatch.setattr(ocr_backend.asyncio, 'create_subprocess_exec', fake_exec)
+    
+    async def run_all():
+        await asyncio.gather(*(ocr_backend.run_tesseract_async(['tesseract']) for _ in range(8)))
+    
+    asyncio.run(run_all())
+    
+    # 先に始まった実行もコアを使い切らず、合計が予算を超えない
+    assert [env['OMP_THREAD_LIMIT'] for env in envs] == ['4'] * 8
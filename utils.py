@@ -5,9 +5,11 @@
 
 import os
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Union
 import pandas as pd
 
+from ocr_result import OCRResult
+
 
 def ensure_directory_exists(directory_path: str) -> None:
     """
@@ -34,54 +36,43 @@ def format_confidence(confidence: float) -> str:
     return f"{confidence:.1f}%"
 
 
-def create_results_dataframe(ocr_data: Dict[str, List]) -> pd.DataFrame:
+def create_results_dataframe(ocr_data: Union[OCRResult, Dict[str, List]]) -> pd.DataFrame:
     """
     OCR結果から詳細データのDataFrameを作成します。
     
     Args:
-        ocr_data: pytesseractから取得したOCRデータ
+        ocr_data: OCR結果、またはpytesseractから取得したOCRデータ
     
     Returns:
         整形されたDataFrame
     """
-    results = []
-    
-    for i in range(len(ocr_data['text'])):
-        word = ocr_data['text'][i].strip()
-        if not word:  # 空文字列はスキップ
-            continue
-            
-        results.append({
-            '単語': word,
-            '信頼度': format_confidence(ocr_data['conf'][i]),
-            'X座標': ocr_data['left'][i],
-            'Y座標': ocr_data['top'][i],
-            '幅': ocr_data['width'][i],
-            '高さ': ocr_data['height'][i],
-        })
-    
-    return pd.DataFrame(results)
+    # 空文字列はスキップ
+    words = OCRResult.from_data(ocr_data)
+    words = words.select(words.text_mask())
+    if len(words) == 0:
+        return pd.DataFrame()
+    
+    return pd.DataFrame({
+        '単語': [word.strip() for word in words.text],
+        '信頼度': [format_confidence(conf) for conf in words.conf.tolist()],
+        'X座標': words['left'],
+        'Y座標': words['top'],
+        '幅': words['width'],
+        '高さ': words['height'],
+    })
 
 
-def calculate_average_confidence(ocr_data: Dict[str, List]) -> float:
+def calculate_average_confidence(ocr_data: Union[OCRResult, Dict[str, List]]) -> float:
     """
     平均信頼度を計算します。
     
     Args:
-        ocr_data: pytesseractから取得したOCRデータ
+        ocr_data: OCR結果、またはpytesseractから取得したOCRデータ
     
     Returns:
         平均信頼度（0〜100）
     """
-    confidences = [
-        conf for conf, text in zip(ocr_data['conf'], ocr_data['text'])
-        if text.strip() and conf != -1
-    ]
-    
-    if not confidences:
-        return 0.0
-    
-    return sum(confidences) / len(confidences)
+    return OCRResult.from_data(ocr_data).average_confidence()
 
 
 def save_output(image, text: str, output_dir: str = "outputs") -> Dict[str, str]: